@@ -1,6 +1,7 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query
+from fastapi.responses import JSONResponse, StreamingResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import List, Optional
 from uuid import uuid4
@@ -10,15 +11,17 @@ import sys
 import uuid
 import tempfile
 import json
+import asyncio
+import threading
 
 # Ensure correct root path for module imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 from backend.pipelines.analyze_resume import (
-    is_pdf_text_based,
-    process_resume,
-    process_resume_ocr,
+    summarize_result,
+    build_ranked_summary,
 )
+from backend.pipelines.staged_pipeline import PipelineItem, staged_pipeline
 
 # Import LLM automation
 from backend.modules.llm.llm_automation import llm_automation
@@ -27,10 +30,33 @@ from backend.modules.llm.handlers.openrouter_handler import OpenRouterProvider
 # Import Analytics module
 from backend.modules.analytics.api import router as analytics_router
 
+# Import background batch processing
+from backend.modules.processing.batch_jobs import batch_job_manager
+from backend.modules.processing.models import BatchStatus, Priority
+from backend.modules.processing.executors import executors
+from backend.modules.processing.warmup import warmup_manager
+from backend.modules.processing.streaming import STREAM_MEDIA_TYPES, format_event
+from backend.modules.processing.uploads import read_upload, UploadedPdf
+from backend.modules.processing.admission import admission_controller, AdmissionRejected, AdmissionSlot
+from backend.modules.cache.result_cache import result_cache
+from backend.modules.cache.text_cache import text_cache
+from backend.modules.job_descriptions.store import job_description_store, DEFAULT_JOB_DESCRIPTION
+from backend.modules.metrics.registry import metrics_registry
+from backend.modules.metrics.resume_metrics import (
+    QUEUE_DEPTH, ADMITTED_RESUMES, ADMITTED_BYTES, PROCESS_RSS, WORKER_RSS
+)
+from backend.modules.metrics.process_memory import resident_memory_bytes, children_resident_memory_bytes
+
 # Pydantic model for job description request
 class JobDescriptionRequest(BaseModel):
     job_description: str
 
+# Pydantic model for re-scoring stored resumes
+class RescoreRequest(BaseModel):
+    resume_ids: Optional[List[str]] = None  # None re-scores every stored result
+    job_description: Optional[str] = None  # Defaults to the saved job description
+    job_description_id: Optional[str] = None  # Or a previously saved version
+
 # Pydantic model for processing configuration
 class ProcessingModeRequest(BaseModel):
     job_description: Optional[str] = None
@@ -60,96 +86,127 @@ app.add_middleware(
 # Include analytics router
 app.include_router(analytics_router)
 
+
+@app.on_event("startup")
+def purge_stale_caches():
+    """Drop cached analyses from an older resume prompt and text from older extractors"""
+    result_cache.purge_stale_prompts()
+    text_cache.purge_stale_extractors()
+
+
+@app.on_event("startup")
+def start_warm_up():
+    """
+    Preload OCR models and warm up OCR/LLM in the background when configured (see /api/ready).
+    Runs before batch recovery, which may create the CPU pool, so the worker initializer is in place.
+    """
+    warmup_manager.start()
+
+
+@app.on_event("startup")
+def resume_batch_jobs():
+    """Pick up background batches interrupted by a restart"""
+    batch_job_manager.recover()
+
+
+@app.on_event("shutdown")
+def shutdown_executors():
+    """Stop the pipeline stage workers, the extraction process pool and LLM thread pool"""
+    warmup_manager.stop()
+    staged_pipeline.shutdown()
+    executors.shutdown(wait=False)
+
+
 # Helper function to get job description
 def get_job_description_from_file(custom_job_description: Optional[str] = None) -> str:
     """Get job description from parameter or file"""
     if custom_job_description:
         return custom_job_description
     
-    job_file_path = os.path.join(os.path.dirname(__file__), "..", "..", "jd_jsons/job_description.json")
-    job_description = "No specific job description provided."
+    job_description = DEFAULT_JOB_DESCRIPTION
     
-    if os.path.exists(job_file_path):
-        try:
-            with open(job_file_path, 'r', encoding='utf-8') as f:
-                job_data = json.load(f)
-                job_description = job_data.get("job_description", job_description)
-        except Exception as e:
-            print(f"[WARNING] Failed to read job description file: {e}")
+    try:
+        job_data = job_description_store.load_current()
+        if job_data:
+            job_description = job_data.get("job_description", job_description)
+    except Exception as e:
+        print(f"[WARNING] Failed to read job description file: {e}")
     
     return job_description
 
-# Unified processing function
-def process_single_resume(file_path: str, job_description: str, resume_id: str, filename: str = None):
-    """Process a single resume and return standardized result"""
-    try:
-        if is_pdf_text_based(file_path):
-            result = process_resume(file_path, job_description, resume_id)
+def split_pdf_uploads(files: List[UploadFile]):
+    """Separate PDF uploads from the rest, which are reported as failed files"""
+    pdf_files = []
+    failed_files = []
+    for file in files:
+        if file.filename.lower().endswith(".pdf"):
+            pdf_files.append(file)
         else:
-            result = process_resume_ocr(file_path, job_description, resume_id)
+            failed_files.append({
+                "filename": file.filename,
+                "error": "Only PDF files are accepted",
+                "resume_id": None
+            })
+    return pdf_files, failed_files
 
-        if not result:
-            return {
-                "success": False,
-                "error": "AI analysis failed",
-                "resume_id": resume_id,
-                "filename": filename,
-                "job_description": job_description,
-                "fit_score": 1,
-                "fit_score_reason": "AI analysis failed - cannot assess job requirements match using enhanced reasoning",
-                "eligibility_status": "Not Eligible",
-                "eligibility_reason": "Resume analysis could not be completed - unable to verify job relevance using intelligent matching",
-                "work_experience_raw": "Could not extract work experience"
-            }
-
-        # Ensure all results have required fields for consistency
-        if "resume_id" not in result:
-            result["resume_id"] = resume_id
-        if "filename" not in result and filename:
-            result["filename"] = filename
-        if "job_description" not in result:
-            result["job_description"] = job_description
-        if "fit_score" not in result:
-            result["fit_score"] = 1  # Default to lowest score if not provided
-        if "fit_score_reason" not in result:
-            result["fit_score_reason"] = "Resume analysis incomplete - cannot assess job requirements match"
-        if "eligibility_status" not in result:
-            # Determine eligibility based on fit_score using enhanced scoring system
-            fit_score = result.get("fit_score", 1)
-            result["eligibility_status"] = "Eligible" if fit_score >= 5 else "Not Eligible"
-        if "eligibility_reason" not in result:
-            fit_score = result.get("fit_score", 1)
-            if fit_score >= 8:
-                result["eligibility_reason"] = "Strong fit - candidate has highly relevant technical background and experience that aligns well with job requirements"
-            elif fit_score >= 5:
-                result["eligibility_reason"] = "Moderate fit - candidate has relevant experience with transferable skills for this role"
-            else:
-                result["eligibility_reason"] = f"Poor fit - candidate's background is not logically relevant to this job role (fit score: {fit_score}/10). Experience appears to be in a different field."
-        if "work_experience_raw" not in result:
-            result["work_experience_raw"] = "Work experience information not available"
 
-        result["success"] = True
-        return result
+def admit_uploads(files: List[UploadFile], background: bool = False) -> List[AdmissionSlot]:
+    """Reserve admission capacity for uploaded resumes; raises AdmissionRejected when the backend is full"""
+    return admission_controller.admit([file.size or 0 for file in files], background=background)
+
+
+async def read_admitted_uploads(files: List[UploadFile], slots: List[AdmissionSlot]) -> List[UploadedPdf]:
+    """
+    Read admitted uploads on a worker thread (the reads block). Small uploads stay in memory; only large
+    ones are spooled to a temp file. When a read fails the slots are released before the error propagates.
+    """
+    uploads = []
+    try:
+        for file in files:
+            uploads.append(await run_in_threadpool(read_upload, file.filename, file.file))
+    except Exception:
+        for upload in uploads:
+            upload.cleanup()
+        for slot in slots:
+            admission_controller.release(slot)
+        raise
+    return uploads
+
+
+def admission_rejected_response(e: AdmissionRejected) -> JSONResponse:
+    """429 (or 413) response for a refused upload, with Retry-After when the backend is just busy"""
+    return JSONResponse(
+        content={"error": e.message, "retry_after_seconds": e.retry_after},
+        status_code=e.status_code,
+        headers={"Retry-After": str(e.retry_after)} if e.retry_after else None
+    )
+
+
+def release_when_processed(items: List[PipelineItem], slot: AdmissionSlot):
+    """
+    Release the admission slot of one resume once the pipeline is done with all of its items.
+    Tied to the pipeline rather than to the futures: a caller that stops waiting (closed stream)
+    cancels the futures while the items still hold pipeline capacity.
+    """
+    remaining = [len(items)]
+    lock = threading.Lock()
+
+    def on_done(_item: PipelineItem):
+        with lock:
+            remaining[0] -= 1
+            if remaining[0]:
+                return
+        admission_controller.release(slot)
+
+    for item in items:
+        item.on_done = on_done
+
+
+def submit_admitted(item: PipelineItem, slot: AdmissionSlot):
+    """Queue an item on the pipeline and release its admission slot once the pipeline has finished it"""
+    release_when_processed([item], slot)
+    return staged_pipeline.submit(item)
 
-    except Exception as e:
-        import traceback
-        error_message = str(e)
-        tb = traceback.format_exc()
-        print(f"[ERROR] Exception in process_single_resume: {error_message}\n{tb}")
-        
-        return {
-            "success": False,
-            "error": error_message,
-            "trace": tb,
-            "resume_id": resume_id,
-            "filename": filename,
-            "job_description": job_description,
-            "fit_score": 1,
-            "fit_score_reason": "Processing failed - cannot assess job relevance using intelligent matching criteria",
-            "eligibility_status": "Not Eligible",
-            "eligibility_reason": "Resume could not be processed - unable to verify job relevance using smart reasoning",
-            "work_experience_raw": "Could not extract work experience"
-        }
 
 @app.post("/api/upload-resume/")
 async def upload_resume(file: UploadFile = File(...)):
@@ -157,18 +214,29 @@ async def upload_resume(file: UploadFile = File(...)):
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are accepted.")
 
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-        shutil.copyfileobj(file.file, temp_file)
-        temp_file_path = temp_file.name
+    try:
+        slot, = admit_uploads([file])
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+
+    upload, = await read_admitted_uploads([file], [slot])
 
     try:
         job_description = get_job_description_from_file()
         resume_id = str(uuid4())
         
-        result = process_single_resume(temp_file_path, job_description, resume_id, file.filename)
+        # Interactive priority: served ahead of queued batch work at every pipeline stage
+        item = PipelineItem(
+            resume_id=resume_id,
+            filename=file.filename,
+            job_description=job_description,
+            pdf_bytes=upload.data,
+            pdf_path=upload.path,
+            priority=Priority.INTERACTIVE
+        )
+        result = await asyncio.wrap_future(submit_admitted(item, slot))
         
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+        upload.cleanup()
 
         if not result.get("success", False):
             return JSONResponse(
@@ -188,8 +256,8 @@ async def upload_resume(file: UploadFile = File(...)):
         tb = traceback.format_exc()
         print(f"[ERROR] Exception in upload_resume: {error_message}\n{tb}")
         
-        if os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+        upload.cleanup()
+        admission_controller.release(slot)
         
         return JSONResponse(
             content={
@@ -203,25 +271,16 @@ async def upload_resume(file: UploadFile = File(...)):
 
 @app.post("/api/save-job-description/")
 async def save_job_description(request: JobDescriptionRequest):
-    """Save job description to a single JSON file"""
+    """Save job description to a single JSON file, recording it as a new version"""
     try:
-        # Path to the job description file
-        job_file_path = os.path.join(os.path.dirname(__file__), "..", "..", "jd_jsons/job_description.json")
-        
-        # Create directory if it doesn't exist
-        os.makedirs(os.path.dirname(job_file_path), exist_ok=True)
-        
-        # Create the JSON data
-        job_data = {
-            "job_description": request.job_description
-        }
-        
-        # Save to JSON file (overwrite existing)
-        with open(job_file_path, 'w', encoding='utf-8') as f:
-            json.dump(job_data, f, indent=2, ensure_ascii=False)
+        # Overwrites jd_jsons/job_description.json and keeps the version under jd_jsons/versions/
+        job_data = job_description_store.save_current(request.job_description)
         
         return JSONResponse(
-            content={"message": "Job description saved successfully"},
+            content={
+                "message": "Job description saved successfully",
+                "job_description_id": job_data["job_description_id"]
+            },
             status_code=200
         )
     
@@ -231,15 +290,67 @@ async def save_job_description(request: JobDescriptionRequest):
             status_code=500
         )
 
+@app.get("/api/job-descriptions/")
+async def list_named_job_descriptions():
+    """List the named job descriptions (one per open role)"""
+    return JSONResponse(
+        content={"job_descriptions": job_description_store.list_named()},
+        status_code=200
+    )
+
+
+@app.put("/api/job-descriptions/{name}")
+async def save_named_job_description(name: str, request: JobDescriptionRequest):
+    """Create or update a named job description"""
+    try:
+        job_data = job_description_store.save_named(name, request.job_description)
+        return JSONResponse(
+            content={"message": "Job description saved successfully", **job_data},
+            status_code=200
+        )
+    except ValueError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+    except Exception as e:
+        return JSONResponse(
+            content={"error": f"Failed to save job description: {str(e)}"},
+            status_code=500
+        )
+
+
+@app.get("/api/job-descriptions/{name}")
+async def get_named_job_description(name: str):
+    """Get a named job description"""
+    try:
+        job_data = job_description_store.get_named(name)
+    except ValueError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+
+    if job_data is None:
+        return JSONResponse(content={"error": "Job description not found."}, status_code=404)
+    return JSONResponse(content=job_data, status_code=200)
+
+
+@app.delete("/api/job-descriptions/{name}")
+async def delete_named_job_description(name: str):
+    """Delete a named job description; results already scored against it are kept"""
+    try:
+        deleted = job_description_store.delete_named(name)
+    except ValueError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+
+    if not deleted:
+        return JSONResponse(content={"error": "Job description not found."}, status_code=404)
+    return JSONResponse(content={"success": True, "message": f"Deleted job description '{name}'"}, status_code=200)
+
+
 @app.get("/api/get-job-description/")
 async def get_job_description():
     """Get the current job description from the JSON file"""
     try:
-        # Path to the job description file
-        job_file_path = os.path.join(os.path.dirname(__file__), "..", "..", "jd_jsons/job_description.json")
+        job_data = job_description_store.load_current()
         
         # Check if file exists
-        if not os.path.exists(job_file_path):
+        if job_data is None:
             return JSONResponse(
                 content={
                     "error": "No job description found",
@@ -248,15 +359,12 @@ async def get_job_description():
                 status_code=404
             )
         
-        # Read the job description from file
-        with open(job_file_path, 'r', encoding='utf-8') as f:
-            job_data = json.load(f)
-        
         # Return the job description data
         return JSONResponse(
             content={
                 "success": True,
                 "job_description": job_data.get("job_description", ""),
+                "job_description_id": job_data["job_description_id"],
                 "file_path": "jd_jsons/job_description.json",
                 "message": "Job description retrieved successfully"
             },
@@ -284,58 +392,39 @@ async def upload_resume_batch(files: List[UploadFile] = File(...)):
     """Upload and process multiple resumes in batch mode"""
     job_description = get_job_description_from_file()
     results = []
-    failed_files = []
+    pdf_files, failed_files = split_pdf_uploads(files)
+    pending = []
+    request_flow = str(uuid4())
 
-    for file in files:
-        if not file.filename.lower().endswith(".pdf"):
-            failed_files.append({
-                "filename": file.filename,
-                "error": "Only PDF files are accepted",
-                "resume_id": None
-            })
-            continue
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-            shutil.copyfileobj(file.file, temp_file)
-            temp_path = temp_file.name
-
-        try:
-            resume_id = str(uuid4())
-            result = process_single_resume(temp_path, job_description, resume_id, file.filename)
+    try:
+        slots = admit_uploads(pdf_files)
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
 
-            if result.get("success", False):
-                results.append(result)
-            else:
-                failed_files.append({
-                    "filename": file.filename,
-                    "error": result.get("error", "Processing failed"),
-                    "resume_id": resume_id
-                })
+    for upload, slot in zip(await read_admitted_uploads(pdf_files, slots), slots):
+        # Extraction of one file overlaps with LLM scoring of another on the staged pipeline
+        item = PipelineItem(
+            resume_id=str(uuid4()),
+            filename=upload.filename,
+            job_description=job_description,
+            pdf_bytes=upload.data,
+            pdf_path=upload.path,
+            flow=request_flow
+        )
+        pending.append(asyncio.wrap_future(submit_admitted(item, slot)))
 
-        except Exception as e:
+    for result in await asyncio.gather(*pending):
+        if result.get("success", False):
+            results.append(result)
+        else:
             failed_files.append({
-                "filename": file.filename,
-                "error": str(e),
-                "resume_id": str(uuid4())
+                "filename": result.get("filename"),
+                "error": result.get("error", "Processing failed"),
+                "resume_id": result.get("resume_id")
             })
-        finally:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
 
-    # Sort successful results by fit_score (highest first)
-    ranked_results = sorted(results, key=lambda x: x.get("fit_score", 0), reverse=True)
-    
-    # Create summary for batch response
-    summary_list = [
-        {
-            "resume_id": r["resume_id"], 
-            "filename": r.get("filename", "Unknown"), 
-            "fit_score": r.get("fit_score", 0),
-            "fit_score_reason": r.get("fit_score_reason", "No reason provided"),
-            "candidate_name": r.get("full_name", "Unknown")
-        }
-        for r in ranked_results
-    ]
+    # Sort successful results by fit_score (highest first) and create summary for batch response
+    summary_list = build_ranked_summary(results)
     
     response_data = {
         "success": True,
@@ -349,6 +438,325 @@ async def upload_resume_batch(files: List[UploadFile] = File(...)):
     return JSONResponse(content=response_data, status_code=200)
 
 
+@app.post("/api/upload-resume-batch/multi-jd/")
+async def upload_resume_batch_multi_jd(
+    files: List[UploadFile] = File(...),
+    job_names: Optional[List[str]] = Query(None, description="Named job descriptions to score against; all when omitted")
+):
+    """Score each uploaded resume against several named job descriptions and rank candidates per role"""
+    try:
+        if job_names:
+            roles = [job_description_store.get_named(name) for name in dict.fromkeys(job_names)]
+            missing = [name for name, role in zip(dict.fromkeys(job_names), roles) if role is None]
+            if missing:
+                return JSONResponse(
+                    content={"error": f"Job descriptions not found: {', '.join(missing)}"},
+                    status_code=404
+                )
+        else:
+            roles = job_description_store.list_named()
+    except ValueError as e:
+        return JSONResponse(content={"error": str(e)}, status_code=400)
+
+    if not roles:
+        return JSONResponse(
+            content={"error": "No named job descriptions. Save some with PUT /api/job-descriptions/{name} first."},
+            status_code=400
+        )
+
+    pdf_files, rejected_files = split_pdf_uploads(files)
+    pending = []
+    request_flow = str(uuid4())
+
+    try:
+        slots = admit_uploads(pdf_files)
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+
+    for upload, slot in zip(await read_admitted_uploads(pdf_files, slots), slots):
+        # One item per role; the PDF is extracted once and the per-role LLM calls run concurrently
+        items = [
+            PipelineItem(
+                resume_id=str(uuid4()),
+                filename=upload.filename,
+                job_description=role["job_description"],
+                pdf_bytes=upload.data if index == 0 else None,
+                pdf_path=upload.path if index == 0 else None,
+                flow=request_flow
+            )
+            for index, role in enumerate(roles)
+        ]
+        # The upload is held until every role has been scored
+        release_when_processed(items, slot)
+        futures = staged_pipeline.submit_multi(items)
+        pending.append([asyncio.wrap_future(future) for future in futures])
+
+    file_results = await asyncio.gather(*(asyncio.gather(*futures) for futures in pending))
+
+    role_summaries = []
+    for index, role in enumerate(roles):
+        results = []
+        failed_files = list(rejected_files)
+        for role_results in file_results:
+            result = role_results[index]
+            if result.get("success", False):
+                results.append(result)
+            else:
+                failed_files.append({
+                    "filename": result.get("filename"),
+                    "error": result.get("error", "Processing failed"),
+                    "resume_id": result.get("resume_id")
+                })
+
+        role_summaries.append({
+            "job_name": role["name"],
+            "job_description_id": role["job_description_id"],
+            "successful_analyses": len(results),
+            "failed_analyses": len(failed_files),
+            "ranked_resumes": build_ranked_summary(results),
+            "failed_files": failed_files
+        })
+
+    return JSONResponse(
+        content={
+            "success": True,
+            "total_processed": len(files),
+            "roles": role_summaries
+        },
+        status_code=200
+    )
+
+
+@app.post("/api/upload-resume-batch/stream/")
+async def upload_resume_batch_stream(
+    files: List[UploadFile] = File(...),
+    stream_format: str = Query("ndjson", alias="format", description="Stream format: ndjson or sse")
+):
+    """Upload multiple resumes and stream one event per resume as its analysis finishes, then the ranking"""
+    if stream_format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'.")
+
+    job_description = get_job_description_from_file()
+    pdf_files, failed_files = split_pdf_uploads(files)
+
+    try:
+        slots = admit_uploads(pdf_files)
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+
+    # Queued before streaming starts, so admitted capacity is released even if the stream never runs
+    concurrent_futures = []
+    request_flow = str(uuid4())
+    for upload, slot in zip(await read_admitted_uploads(pdf_files, slots), slots):
+        concurrent_futures.append(submit_admitted(PipelineItem(
+            resume_id=str(uuid4()),
+            filename=upload.filename,
+            job_description=job_description,
+            pdf_bytes=upload.data,
+            pdf_path=upload.path,
+            flow=request_flow
+        ), slot))
+
+    async def event_stream():
+        futures = [asyncio.wrap_future(future) for future in concurrent_futures]
+        summaries = []
+        try:
+            yield format_event("started", {
+                "total_files": len(files),
+                "accepted_files": len(concurrent_futures),
+                "failed_files": failed_files
+            }, stream_format)
+
+            for completed, future in enumerate(asyncio.as_completed(futures), start=1):
+                result = await future
+                if result.get("success", False):
+                    summaries.append(summarize_result(result))
+                    yield format_event("result", {"completed": completed, "result": result}, stream_format)
+                else:
+                    failure = {
+                        "filename": result.get("filename"),
+                        "error": result.get("error", "Processing failed"),
+                        "resume_id": result.get("resume_id")
+                    }
+                    failed_files.append(failure)
+                    yield format_event("error", {"completed": completed, **failure}, stream_format)
+
+            yield format_event("ranking", {
+                "success": True,
+                "total_processed": len(files),
+                "successful_analyses": len(summaries),
+                "failed_analyses": len(failed_files),
+                "ranked_resumes": build_ranked_summary(summaries),
+                "failed_files": failed_files
+            }, stream_format)
+        finally:
+            # Client disconnected early: drop the futures, the pipeline still cleans up the spooled files
+            for future in futures:
+                future.cancel()
+
+    return StreamingResponse(event_stream(), media_type=STREAM_MEDIA_TYPES[stream_format])
+
+
+@app.post("/api/batch-jobs/")
+async def create_batch_job(files: List[UploadFile] = File(...)):
+    """Accept a batch of resumes and process it in the background, returning a batch id right away"""
+    job_description = get_job_description_from_file()
+    pdf_files, rejected_files = split_pdf_uploads(files)
+
+    try:
+        slots = admit_uploads(pdf_files, background=True)
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+
+    uploads = await read_admitted_uploads(pdf_files, slots)
+
+    try:
+        job = batch_job_manager.submit_batch(uploads, job_description, rejected_files, slots)
+    except Exception as e:
+        for upload in uploads:
+            upload.cleanup()
+        for slot in slots:
+            admission_controller.release(slot)
+        return JSONResponse(
+            content={"error": f"Failed to queue batch: {str(e)}"},
+            status_code=500
+        )
+
+    return JSONResponse(
+        content={
+            "success": True,
+            "batch_id": job.batch_id,
+            "status": job.status.value,
+            "total_files": len(job.files),
+            "rejected_files": rejected_files,
+            "status_url": f"/api/batch-jobs/{job.batch_id}",
+            "results_url": f"/api/batch-jobs/{job.batch_id}/results"
+        },
+        status_code=202
+    )
+
+
+@app.post("/api/rescore/")
+async def rescore_resumes(request: RescoreRequest):
+    """Re-score stored resumes against a job description in the background, without re-uploading"""
+    if request.job_description_id:
+        job_description = job_description_store.get_version(request.job_description_id)
+        if job_description is None:
+            return JSONResponse(content={"error": "Job description version not found."}, status_code=404)
+    else:
+        job_description = get_job_description_from_file(request.job_description)
+        job_description_store.save_version(job_description)
+
+    try:
+        # Reading thousands of stored results is blocking file I/O
+        job = await run_in_threadpool(batch_job_manager.submit_rescore, request.resume_ids, job_description)
+    except Exception as e:
+        return JSONResponse(
+            content={"error": f"Failed to queue re-score: {str(e)}"},
+            status_code=500
+        )
+
+    return JSONResponse(
+        content={
+            "success": True,
+            "batch_id": job.batch_id,
+            "status": job.status.value,
+            "job_description_id": job.job_description_id,
+            "total_files": len(job.files),
+            "rejected_files": job.rejected_files,
+            "status_url": f"/api/batch-jobs/{job.batch_id}",
+            "results_url": f"/api/batch-jobs/{job.batch_id}/results"
+        },
+        status_code=202
+    )
+
+
+@app.get("/api/batch-jobs/")
+async def list_batch_jobs():
+    """List background batch jobs with their progress"""
+    jobs = batch_job_manager.list_jobs()
+    return JSONResponse(
+        content={
+            "batches": [
+                {
+                    "batch_id": job.batch_id,
+                    "kind": job.kind.value,
+                    "status": job.status.value,
+                    "job_description_id": job.job_description_id,
+                    "created_at": job.created_at.isoformat(),
+                    "progress": job.progress()
+                }
+                for job in jobs
+            ]
+        },
+        status_code=200
+    )
+
+
+@app.get("/api/batch-jobs/{batch_id}")
+async def get_batch_job_status(batch_id: str):
+    """Get per-file progress for a background batch job"""
+    job = batch_job_manager.get_job(batch_id)
+    if not job:
+        return JSONResponse(content={"error": "Batch job not found."}, status_code=404)
+
+    return JSONResponse(
+        content={
+            "batch_id": job.batch_id,
+            "kind": job.kind.value,
+            "status": job.status.value,
+            "job_description_id": job.job_description_id,
+            "created_at": job.created_at.isoformat(),
+            "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+            "progress": job.progress(),
+            "files": [json.loads(f.json()) for f in job.files],
+            "rejected_files": job.rejected_files
+        },
+        status_code=200
+    )
+
+
+@app.get("/api/batch-jobs/{batch_id}/results")
+async def get_batch_job_results(batch_id: str):
+    """Get the final ranked results of a background batch job"""
+    job = batch_job_manager.get_job(batch_id)
+    if not job:
+        return JSONResponse(content={"error": "Batch job not found."}, status_code=404)
+
+    if job.status != BatchStatus.COMPLETED:
+        return JSONResponse(
+            content={
+                "success": False,
+                "batch_id": job.batch_id,
+                "status": job.status.value,
+                "message": "Batch is still processing",
+                "progress": job.progress()
+            },
+            status_code=202
+        )
+
+    failed_files = [
+        {"filename": f.filename, "error": f.error, "resume_id": f.resume_id}
+        for f in job.files if f.error
+    ] + job.rejected_files
+    progress = job.progress()
+
+    return JSONResponse(
+        content={
+            "success": True,
+            "batch_id": job.batch_id,
+            "total_processed": len(job.files) + len(job.rejected_files),
+            "successful_analyses": progress["done"],
+            "failed_analyses": progress["failed"],
+            "job_description": job.job_description,
+            "job_description_id": job.job_description_id,
+            "ranked_resumes": job.ranked_resumes,
+            "failed_files": failed_files
+        },
+        status_code=200
+    )
+
+
 @app.get("/api/get-analysis/{resume_id}")
 async def get_analysis(resume_id: str):
     """Get detailed analysis for a specific resume"""
@@ -371,6 +779,94 @@ async def get_analysis(resume_id: str):
             status_code=404
         )
 
+@app.get("/api/admission/")
+async def get_admission_stats():
+    """Get admitted work against the admission limits"""
+    return JSONResponse(content=admission_controller.stats(), status_code=200)
+
+
+@app.get("/api/ready")
+async def get_readiness():
+    """
+    Readiness probe: 200 once the required warm-up components are warm, 503 before.
+    Also reports worker state, pipeline queue depth and admitted work so load can be routed to hot replicas.
+    """
+    ready = warmup_manager.is_ready()
+    admission = admission_controller.stats()
+    return JSONResponse(content={
+        "ready": ready,
+        "components": warmup_manager.components(),
+        "required": warmup_manager.required,
+        "workers": executors.stats(),
+        "queue_depth": staged_pipeline.queue_depths_by_priority(),
+        "in_flight": {
+            "resumes": admission["in_flight_resumes"],
+            "queued_resumes": admission["queued_resumes"],
+            "upload_bytes": admission["upload_bytes"]
+        }
+    }, status_code=200 if ready else 503)
+
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus scrape endpoint: per-stage latency histograms, outcome counters and queue gauges"""
+    for stage, depths in staged_pipeline.queue_depths_by_priority().items():
+        for priority in Priority:
+            QUEUE_DEPTH.set(depths.get(priority.value, 0), stage=stage, priority=priority.value)
+    admission = admission_controller.stats()
+    ADMITTED_RESUMES.set(admission["in_flight_resumes"], kind="in_flight")
+    ADMITTED_RESUMES.set(admission["queued_resumes"], kind="queued")
+    ADMITTED_BYTES.set(admission["upload_bytes"])
+    PROCESS_RSS.set(resident_memory_bytes() or 0)
+    WORKER_RSS.set(children_resident_memory_bytes())
+    return PlainTextResponse(
+        content=metrics_registry.render(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/api/cache/results")
+async def get_result_cache_stats():
+    """Get size and location of the analysis result cache"""
+    return JSONResponse(content={**result_cache.stats(), "enabled": result_cache.enabled}, status_code=200)
+
+
+@app.delete("/api/cache/results")
+async def clear_result_cache():
+    """Invalidate every cached analysis result"""
+    try:
+        removed = await run_in_threadpool(result_cache.invalidate)
+        return JSONResponse(
+            content={"success": True, "message": f"Removed {removed} cached results"},
+            status_code=200
+        )
+    except Exception as e:
+        return JSONResponse(
+            content={"error": f"Failed to clear result cache: {str(e)}"},
+            status_code=500
+        )
+
+@app.get("/api/cache/text")
+async def get_text_cache_stats():
+    """Get size and location of the extracted text cache"""
+    return JSONResponse(content={**text_cache.stats(), "enabled": text_cache.enabled}, status_code=200)
+
+
+@app.delete("/api/cache/text")
+async def clear_text_cache():
+    """Invalidate all cached resume text, forcing re-extraction"""
+    try:
+        removed = await run_in_threadpool(text_cache.invalidate)
+        return JSONResponse(
+            content={"success": True, "message": f"Removed {removed} cached texts"},
+            status_code=200
+        )
+    except Exception as e:
+        return JSONResponse(
+            content={"error": f"Failed to clear text cache: {str(e)}"},
+            status_code=500
+        )
+
 # ==================== LLM Provider Management Endpoints ====================
 
 @app.get("/api/llm/providers")
@@ -438,7 +934,7 @@ async def update_llm_config(request: LLMConfigRequest):
 async def send_llm_prompt(request: LLMPromptRequest):
     """Send prompt to currently configured LLM provider"""
     try:
-        result = llm_automation.send_prompt_with_current_provider(request.prompt)
+        result = await executors.run_io_async(llm_automation.send_prompt_with_current_provider, request.prompt)
         
         status_code = 200 if result["success"] else 400
         return JSONResponse(content=result, status_code=status_code)
@@ -483,7 +979,8 @@ async def get_url_mapping():
             "ollama": ollama_base_url,
             "openrouter": "https://openrouter.ai/api/v1/chat/completions",
             "openai": "https://api.openai.com/v1/chat/completions",
-            "anthropic": "https://api.anthropic.com/v1/messages"
+            "anthropic": "https://api.anthropic.com/v1/messages",
+            "mock": ""
         }
         
         current_config = llm_automation.current_config
@@ -524,7 +1021,8 @@ async def fix_llm_config():
             "ollama": ollama_base_url,
             "openrouter": "https://openrouter.ai/api/v1/chat/completions",
             "openai": "https://api.openai.com/v1/chat/completions",
-            "anthropic": "https://api.anthropic.com/v1/messages"
+            "anthropic": "https://api.anthropic.com/v1/messages",
+            "mock": ""
         }
         
         expected_url = expected_urls.get(provider, ollama_base_url)
@@ -0,0 +1,2 @@
+# Benchmarks for RULE
+# Synthetic resume corpus, stub LLM server and stage/end-to-end benchmark runner
@@ -0,0 +1,63 @@
+"""
+Benchmark comparison for RULE
+Prints the change of every timing between two result files written by run.py
+
+Usage:
+    python -m backend.benchmarks.compare baseline.json candidate.json [--metric p50] [--threshold 5]
+"""
+
+import argparse
+import json
+from typing import Any, Dict, Iterator, Tuple
+
+
+def flatten(node: Any, prefix: str = "") -> Iterator[Tuple[str, float]]:
+    """Yield (dotted.path, value) for every numeric leaf"""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            yield from flatten(value, f"{prefix}.{key}" if prefix else str(key))
+    elif isinstance(node, (int, float)) and not isinstance(node, bool):
+        yield prefix, float(node)
+
+
+def load_metrics(path: str, metric: str) -> Dict[str, float]:
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    sections = {"stages": report.get("stages", {}), "end_to_end": report.get("end_to_end", {})}
+    return {
+        key: value for key, value in flatten(sections)
+        if key.endswith(f".{metric}") or key.endswith(".wall_seconds") or key.endswith(".throughput_per_second")
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare two RULE benchmark result files")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--metric", default="p50", choices=["mean", "p50", "p95", "min", "max"])
+    parser.add_argument("--threshold", type=float, default=5.0, help="Flag changes above this percentage")
+    args = parser.parse_args(argv)
+
+    baseline = load_metrics(args.baseline, args.metric)
+    candidate = load_metrics(args.candidate, args.metric)
+    regressions = 0
+    print(f"{'metric':<70} {'baseline':>12} {'candidate':>12} {'change':>9}")
+    for key in sorted(set(baseline) | set(candidate)):
+        old, new = baseline.get(key), candidate.get(key)
+        if old is None or new is None:
+            print(f"{key:<70} {old if old is not None else '-':>12} {new if new is not None else '-':>12} {'n/a':>9}")
+            continue
+        change = (new - old) / old * 100 if old else 0.0
+        # Throughput regresses when it drops; every timing regresses when it grows
+        worse = -change if key.endswith("throughput_per_second") else change
+        flag = ""
+        if abs(change) >= args.threshold:
+            flag = " !" if worse > 0 else " +"
+            regressions += worse > 0
+        print(f"{key:<70} {old:>12.6f} {new:>12.6f} {change:>+8.1f}%{flag}")
+    print(f"\n{regressions} metric(s) regressed by more than {args.threshold:.0f}% ('!' worse, '+' better)")
+    return regressions
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Import cost report for RULE
+Imports a backend module (the API app by default) in a fresh interpreter with `python -X importtime`
+and reports the cost of each imported module and top-level package, to keep API startup fast.
+
+Usage:
+    python -m backend.benchmarks.import_times
+    python -m backend.benchmarks.import_times --module backend.pipelines.analyze_resume --top 30
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+
+# "import time:       412 |       1203 |   spacy.tokens"
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S+)\s*$")
+
+
+def measure_imports(module: str) -> Dict[str, Any]:
+    """Import module in a child interpreter and parse its -X importtime output"""
+    started = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if started.returncode != 0:
+        tail = started.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        raise RuntimeError(f"Importing {module} failed: {tail[0]}")
+
+    modules: List[Dict[str, Any]] = []
+    for line in started.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            modules.append({
+                "module": match.group(3),
+                "self_seconds": int(match.group(1)) / 1e6,
+                "cumulative_seconds": int(match.group(2)) / 1e6,
+            })
+
+    packages: Dict[str, float] = {}
+    for entry in modules:
+        package = entry["module"].split(".")[0]
+        packages[package] = packages.get(package, 0.0) + entry["self_seconds"]
+
+    return {
+        "module": module,
+        "python": sys.version.split()[0],
+        "total_seconds": round(sum(entry["self_seconds"] for entry in modules), 6),
+        "packages": dict(sorted(((name, round(seconds, 6)) for name, seconds in packages.items()),
+                                key=lambda item: item[1], reverse=True)),
+        "modules": sorted(modules, key=lambda entry: entry["cumulative_seconds"], reverse=True),
+    }
+
+
+def print_report(report: Dict[str, Any], top: int):
+    print(f"[BENCH] import {report['module']}: {report['total_seconds']:.3f}s "
+          f"({len(report['modules'])} modules, Python {report['python']})")
+    print(f"\n{'package':<32} {'self (s)':>10}")
+    for name, seconds in list(report["packages"].items())[:top]:
+        print(f"{name:<32} {seconds:>10.3f}")
+    print(f"\n{'module':<48} {'cumulative (s)':>15} {'self (s)':>10}")
+    for entry in report["modules"][:top]:
+        print(f"{entry['module']:<48} {entry['cumulative_seconds']:>15.3f} {entry['self_seconds']:>10.3f}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Report the import cost of a RULE backend module")
+    parser.add_argument("--module", default="backend.api.main", help="Module to import")
+    parser.add_argument("--top", type=int, default=20, help="Rows to print per table")
+    parser.add_argument("--output", default=None, help="Also write the full report as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    report = measure_imports(args.module)
+    print_report(report, args.top)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[BENCH] Results written to {args.output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""
+HTTP load test for RULE
+Drives the upload, batch and analytics endpoints of a running backend with a weighted request mix,
+at a fixed concurrency (closed loop) or arrival rate (open loop), and reports latency percentiles,
+throughput, error rates, server memory over time and the latency of a cheap probe request,
+which exposes handlers that block the event loop.
+
+Usage:
+    python -m backend.benchmarks.loadtest --base-url http://localhost:8000 \
+        --mix upload=4,batch=1,analytics=3 --concurrency 8 --duration 60
+    python -m backend.benchmarks.loadtest --rate 5 --poisson --duration 120 --pdf-dir resumes/
+"""
+
+import argparse
+import glob
+import json
+import os
+import random
+import re
+import statistics
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+
+from .pdf_corpus import build_corpus
+from .run import DEFAULT_RESULTS_DIR, git_commit
+
+DEFAULT_ANALYTICS_PATHS = [
+    "/api/analytics/metrics",
+    "/api/analytics/candidates",
+    "/api/analytics/skills/analysis",
+    "/api/analytics/trends",
+    "/api/analytics/dashboard/summary",
+]
+# Cheap request timed alongside the load; it only waits on the event loop
+DEFAULT_PROBE_PATH = "/api/admission/"
+
+_METRIC_LINE = re.compile(r"^([a-zA-Z_:][a-zA-Z0-9_:]*)(\{[^}]*\})?\s+(\S+)$")
+
+
+def percentiles(samples: List[float]) -> Dict[str, Any]:
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def pick(p: float) -> float:
+        return round(ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))], 6)
+
+    return {
+        "count": len(ordered),
+        "mean": round(statistics.fmean(ordered), 6),
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": round(ordered[-1], 6),
+    }
+
+
+def parse_prometheus(text: str) -> Dict[str, float]:
+    """Sum the samples of every metric in a /metrics scrape, keyed by metric name"""
+    totals: Dict[str, float] = {}
+    for line in text.splitlines():
+        match = _METRIC_LINE.match(line.strip())
+        if match:
+            try:
+                totals[match.group(1)] = totals.get(match.group(1), 0.0) + float(match.group(3))
+            except ValueError:
+                continue
+    return totals
+
+
+class LoadTest:
+    """One load test run; record() is called from the worker threads"""
+
+    def __init__(self, args, pdfs: List[Tuple[str, bytes]]):
+        self.args = args
+        self.base_url = args.base_url.rstrip("/")
+        self.pdfs = pdfs
+        self.mix = self._parse_mix(args.mix)
+        self.analytics_paths = [path for path in args.analytics_paths.split(",") if path]
+        self.rng = random.Random(args.seed)
+        self.lock = threading.Lock()
+        self.samples: List[Dict[str, Any]] = []
+        self.timeline: List[Dict[str, Any]] = []
+        self.probe_latencies: List[float] = []
+        self.started_at = 0.0
+        self.stop = threading.Event()
+        self.in_flight = 0
+        self.max_backlog = 0
+
+    @staticmethod
+    def _parse_mix(spec: str) -> List[Tuple[str, float]]:
+        mix = []
+        for part in spec.split(","):
+            name, _, weight = part.partition("=")
+            if name not in ("upload", "batch", "analytics"):
+                raise ValueError(f"Unknown request type in --mix: {name}")
+            mix.append((name, float(weight or 1)))
+        return mix
+
+    def _choose(self) -> str:
+        with self.lock:
+            total = sum(weight for _, weight in self.mix)
+            pick = self.rng.uniform(0, total)
+        for name, weight in self.mix:
+            pick -= weight
+            if pick <= 0:
+                return name
+        return self.mix[-1][0]
+
+    def _pdf(self) -> Tuple[str, bytes]:
+        with self.lock:
+            return self.rng.choice(self.pdfs)
+
+    def send(self, kind: str):
+        """Issue one request of the given kind and record its outcome"""
+        timeout = self.args.timeout
+        start = time.perf_counter()
+        status, error, endpoint = None, None, kind
+        try:
+            if kind == "upload":
+                endpoint = "/api/upload-resume/"
+                name, data = self._pdf()
+                response = requests.post(f"{self.base_url}{endpoint}",
+                                         files={"file": (name, data, "application/pdf")}, timeout=timeout)
+            elif kind == "batch":
+                endpoint = "/api/upload-resume-batch/"
+                files = [("files", (name, data, "application/pdf"))
+                         for name, data in (self._pdf() for _ in range(self.args.batch_size))]
+                response = requests.post(f"{self.base_url}{endpoint}", files=files, timeout=timeout)
+            else:
+                with self.lock:
+                    endpoint = self.rng.choice(self.analytics_paths)
+                response = requests.get(f"{self.base_url}{endpoint}", timeout=timeout)
+            status = response.status_code
+        except requests.RequestException as e:
+            error = type(e).__name__
+        latency = time.perf_counter() - start
+        with self.lock:
+            self.samples.append({
+                "kind": kind, "endpoint": endpoint, "status": status, "error": error,
+                "latency": latency, "finished_at": time.perf_counter() - self.started_at
+            })
+
+    def _tracked_send(self, kind: str):
+        try:
+            self.send(kind)
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def _closed_loop_worker(self):
+        while not self.stop.is_set():
+            with self.lock:
+                self.in_flight += 1
+            self._tracked_send(self._choose())
+
+    def _open_loop(self, pool: ThreadPoolExecutor):
+        """Submit requests at the target rate regardless of how fast the server answers"""
+        interval = 1.0 / self.args.rate
+        next_at = time.perf_counter()
+        while not self.stop.is_set():
+            now = time.perf_counter()
+            if now < next_at:
+                time.sleep(min(next_at - now, 0.05))
+                continue
+            with self.lock:
+                self.in_flight += 1
+                self.max_backlog = max(self.max_backlog, self.in_flight)
+                gap = self.rng.expovariate(self.args.rate) if self.args.poisson else interval
+            pool.submit(self._tracked_send, self._choose())
+            next_at += gap
+
+    def _sampler(self):
+        """Every sample interval: scrape /metrics for server memory and queues, and time the probe"""
+        while not self.stop.wait(self.args.sample_interval):
+            point: Dict[str, Any] = {"t": round(time.perf_counter() - self.started_at, 3)}
+            start = time.perf_counter()
+            try:
+                requests.get(f"{self.base_url}{self.args.probe_path}", timeout=self.args.timeout)
+                point["probe_seconds"] = round(time.perf_counter() - start, 6)
+                self.probe_latencies.append(time.perf_counter() - start)
+            except requests.RequestException as e:
+                point["probe_error"] = type(e).__name__
+            try:
+                metrics = parse_prometheus(requests.get(f"{self.base_url}/metrics", timeout=self.args.timeout).text)
+                point["rss_bytes"] = int(metrics.get("process_resident_memory_bytes", 0))
+                point["worker_rss_bytes"] = int(metrics.get("rule_worker_resident_memory_bytes", 0))
+                point["pipeline_queue_depth"] = int(metrics.get("rule_pipeline_queue_depth", 0))
+                point["admitted_resumes"] = int(metrics.get("rule_admitted_resumes", 0))
+            except requests.RequestException as e:
+                point["metrics_error"] = type(e).__name__
+            with self.lock:
+                point["client_in_flight"] = self.in_flight
+                point["completed"] = len(self.samples)
+                self.timeline.append(point)
+
+    def run(self) -> Dict[str, Any]:
+        self.started_at = time.perf_counter()
+        sampler = threading.Thread(target=self._sampler, name="loadtest-sampler", daemon=True)
+        sampler.start()
+        with ThreadPoolExecutor(max_workers=self.args.concurrency, thread_name_prefix="loadtest") as pool:
+            if self.args.rate:
+                dispatcher = threading.Thread(target=self._open_loop, args=(pool,), daemon=True)
+                dispatcher.start()
+            else:
+                for _ in range(self.args.concurrency):
+                    pool.submit(self._closed_loop_worker)
+            time.sleep(self.args.duration)
+            self.stop.set()
+            # Leaving the pool waits for the requests still in flight
+        elapsed = time.perf_counter() - self.started_at
+        sampler.join(timeout=self.args.timeout)
+        return self.report(elapsed)
+
+    def report(self, elapsed: float) -> Dict[str, Any]:
+        def summarize(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+            statuses: Dict[str, int] = {}
+            for sample in samples:
+                key = str(sample["status"]) if sample["status"] is not None else sample["error"]
+                statuses[key] = statuses.get(key, 0) + 1
+            errors = sum(1 for sample in samples if sample["status"] is None or sample["status"] >= 400)
+            ok = [sample["latency"] for sample in samples if sample["status"] is not None and sample["status"] < 400]
+            return {
+                "requests": len(samples),
+                "throughput_per_second": round(len(samples) / elapsed, 3) if elapsed else None,
+                "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+                "rejected_429": statuses.get("429", 0),
+                "statuses": statuses,
+                "latency": percentiles([sample["latency"] for sample in samples]),
+                "success_latency": percentiles(ok),
+            }
+
+        by_kind: Dict[str, List[Dict[str, Any]]] = {}
+        by_endpoint: Dict[str, List[Dict[str, Any]]] = {}
+        for sample in self.samples:
+            by_kind.setdefault(sample["kind"], []).append(sample)
+            by_endpoint.setdefault(sample["endpoint"], []).append(sample)
+
+        rss = [point["rss_bytes"] for point in self.timeline if point.get("rss_bytes")]
+        worker_rss = [point["worker_rss_bytes"] for point in self.timeline if "worker_rss_bytes" in point]
+        args = vars(self.args)
+        return {
+            "meta": {
+                "commit": git_commit(),
+                "started_at": datetime.now().isoformat(),
+                "elapsed_seconds": round(elapsed, 3),
+                "resumes_per_batch": self.args.batch_size,
+                "max_client_backlog": self.max_backlog,
+                "args": args,
+            },
+            "overall": summarize(self.samples),
+            "by_kind": {kind: summarize(samples) for kind, samples in sorted(by_kind.items())},
+            "by_endpoint": {endpoint: summarize(samples) for endpoint, samples in sorted(by_endpoint.items())},
+            "probe": {"path": self.args.probe_path, "latency": percentiles(self.probe_latencies)},
+            "memory": {
+                "rss_max_bytes": max(rss) if rss else None,
+                "rss_last_bytes": rss[-1] if rss else None,
+                "worker_rss_max_bytes": max(worker_rss) if worker_rss else None,
+            },
+            "timeline": self.timeline,
+        }
+
+
+def load_pdfs(args) -> List[Tuple[str, bytes]]:
+    if args.pdf_dir:
+        paths = sorted(glob.glob(os.path.join(args.pdf_dir, "*.pdf")))
+        if not paths:
+            raise SystemExit(f"No PDFs found in {args.pdf_dir}")
+    else:
+        corpus_dir = tempfile.mkdtemp(prefix="rule-loadtest-")
+        pages = [int(count) for count in args.pages.split(",") if count]
+        kinds = [kind for kind in args.kinds.split(",") if kind]
+        manifest = build_corpus(corpus_dir, pages, args.per_size, kinds, args.seed)
+        paths = [os.path.join(corpus_dir, doc["filename"]) for doc in manifest]
+    pdfs = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pdfs.append((os.path.basename(path), f.read()))
+    return pdfs
+
+
+def print_summary(report: Dict[str, Any]):
+    print(f"{'endpoint':<36} {'req':>6} {'rps':>7} {'err%':>6} {'429':>5} {'p50':>8} {'p95':>8} {'p99':>8}")
+    rows = list(report["by_endpoint"].items()) + [("overall", report["overall"])]
+    for name, stats in rows:
+        latency = stats["latency"]
+        print(f"{name:<36} {stats['requests']:>6} {stats['throughput_per_second'] or 0:>7.2f} "
+              f"{stats['error_rate'] * 100:>5.1f}% {stats['rejected_429']:>5} "
+              f"{latency.get('p50', 0):>8.3f} {latency.get('p95', 0):>8.3f} {latency.get('p99', 0):>8.3f}")
+    probe = report["probe"]["latency"]
+    if probe.get("count"):
+        print(f"\nprobe {report['probe']['path']}: p50 {probe['p50']:.3f}s p95 {probe['p95']:.3f}s "
+              f"p99 {probe['p99']:.3f}s max {probe['max']:.3f}s (high values mean the event loop is blocked)")
+    memory = report["memory"]
+    if memory["rss_max_bytes"]:
+        print(f"server RSS max {memory['rss_max_bytes'] / 2 ** 20:.0f} MiB, "
+              f"workers max {(memory['worker_rss_max_bytes'] or 0) / 2 ** 20:.0f} MiB")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="HTTP load test for a running RULE backend")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--mix", default="upload=4,batch=1,analytics=3",
+                        help="Weighted request types: upload, batch, analytics")
+    parser.add_argument("--concurrency", type=int, default=8,
+                        help="Concurrent clients (closed loop), or the cap on requests in flight with --rate")
+    parser.add_argument("--rate", type=float, default=0.0,
+                        help="Open-loop arrival rate in requests/s (0 = closed loop at --concurrency)")
+    parser.add_argument("--poisson", action="store_true", help="Exponential inter-arrival times with --rate")
+    parser.add_argument("--duration", type=float, default=60.0, help="Seconds to generate load")
+    parser.add_argument("--batch-size", type=int, default=5, help="Resumes per batch upload")
+    parser.add_argument("--analytics-paths", default=",".join(DEFAULT_ANALYTICS_PATHS))
+    parser.add_argument("--probe-path", default=DEFAULT_PROBE_PATH)
+    parser.add_argument("--sample-interval", type=float, default=1.0, help="Seconds between memory/probe samples")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Per-request timeout (s)")
+    parser.add_argument("--pdf-dir", default=None, help="Use these PDFs instead of a generated corpus")
+    parser.add_argument("--pages", default="1,2", help="Page counts of the generated corpus")
+    parser.add_argument("--kinds", default="text", help="Kinds of generated resumes: text, image or both")
+    parser.add_argument("--per-size", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="Result file (default: benchmarks/results/loadtest-<time>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    pdfs = load_pdfs(args)
+    mode = f"open loop at {args.rate}/s" if args.rate else f"closed loop with {args.concurrency} clients"
+    print(f"[LOADTEST] {args.base_url}: {mode} for {args.duration:.0f}s, mix {args.mix}, {len(pdfs)} PDFs")
+
+    report = LoadTest(args, pdfs).run()
+    print_summary(report)
+
+    output = args.output or os.path.join(DEFAULT_RESULTS_DIR, f"loadtest-{datetime.now():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[LOADTEST] Results written to {output}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
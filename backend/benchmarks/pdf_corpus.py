@@ -0,0 +1,208 @@
+"""
+Synthetic resume corpus for RULE benchmarks
+Writes text-based and image-only (scanned-like) PDF resumes with a minimal hand-written PDF writer,
+so the corpus is deterministic and needs no PDF authoring dependency
+"""
+
+import io
+import json
+import os
+import random
+import zlib
+from typing import Any, Dict, List, Sequence
+
+from PIL import Image, ImageDraw, ImageFont
+
+# US Letter in points; text layout uses 12pt lines between 72pt margins
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792
+LINES_PER_PAGE = 52
+
+FIRST_NAMES = ["Asha", "Daniel", "Mei", "Rahul", "Sofia", "Kwame", "Elena", "Tomas", "Priya", "Lucas"]
+LAST_NAMES = ["Kumar", "Okafor", "Chen", "Silva", "Novak", "Haddad", "Larsen", "Mendes", "Iyer", "Weber"]
+COMPANIES = ["Northwind Labs", "Bluepeak Systems", "Cobalt Analytics", "Helio Retail", "Quanta Health",
+             "Riverstone Bank", "Orbital Logistics", "Greenfield Energy"]
+TITLES = ["Software Engineer", "Senior Backend Engineer", "Data Engineer", "Frontend Developer",
+          "Machine Learning Engineer", "DevOps Engineer", "Technical Lead"]
+SKILLS = ["Python", "FastAPI", "Django", "PostgreSQL", "Redis", "Kafka", "Docker", "Kubernetes", "AWS",
+          "React", "TypeScript", "Airflow", "Spark", "PyTorch", "Terraform", "GraphQL"]
+DUTIES = [
+    "Designed and operated REST APIs serving {n} requests per day",
+    "Migrated batch ETL jobs to streaming pipelines, cutting latency by {n} percent",
+    "Led a team of {n} engineers delivering the customer onboarding platform",
+    "Built CI/CD pipelines and infrastructure as code for {n} services",
+    "Optimized PostgreSQL queries and indexes, reducing p95 response time by {n} percent",
+    "Implemented feature stores and model serving for {n} production models",
+    "Mentored {n} junior developers and ran weekly design reviews",
+]
+
+
+def generate_resume_lines(seed: int, pages: int) -> List[str]:
+    """Deterministic resume text filling roughly the given number of pages"""
+    rng = random.Random(seed)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    lines = [
+        f"{first} {last}",
+        f"{first.lower()}.{last.lower()}@example.com | +1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}",
+        "",
+        "SUMMARY",
+        f"{rng.choice(TITLES)} with {rng.randint(2, 15)} years of experience building data-intensive products.",
+        "",
+        "SKILLS",
+        ", ".join(rng.sample(SKILLS, 8)),
+        "",
+        "EXPERIENCE",
+    ]
+    year = 2024
+    while len(lines) < pages * LINES_PER_PAGE - 6:
+        start = year - rng.randint(1, 3)
+        lines.append(f"{rng.choice(TITLES)} - {rng.choice(COMPANIES)} ({start}-{year})")
+        for duty in rng.sample(DUTIES, 4):
+            lines.append(f"- {duty.format(n=rng.randint(3, 90))}")
+        lines.append("")
+        year = start
+    lines.extend(["EDUCATION", f"B.Sc. Computer Science, State University ({year - 4})"])
+    return lines
+
+
+def _paginate(lines: Sequence[str]) -> List[List[str]]:
+    return [list(lines[i:i + LINES_PER_PAGE]) for i in range(0, max(1, len(lines)), LINES_PER_PAGE)]
+
+
+def _escape_pdf_text(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _write_pdf(page_objects: List[Dict[str, Any]]) -> bytes:
+    """
+    Serialize pages given as {"content": bytes, "resources": str, "xobjects": [(dict_str, data)]}
+    into a PDF with a correct cross-reference table
+    """
+    objects: List[bytes] = []
+
+    def add(body: bytes) -> int:
+        objects.append(body)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    pages_id = len(objects) + 1
+    objects.append(b"")  # placeholder for the page tree
+    page_ids = []
+    for page in page_objects:
+        xobject_refs = []
+        for index, (dictionary, data) in enumerate(page.get("xobjects", [])):
+            image_id = add(f"<< {dictionary} /Length {len(data)} >>\nstream\n".encode("latin-1") + data + b"\nendstream")
+            xobject_refs.append(f"/Im{index} {image_id} 0 R")
+        content = page["content"]
+        content_id = add(f"<< /Length {len(content)} >>\nstream\n".encode("latin-1") + content + b"\nendstream")
+        resources = f"/Font << /F1 {font_id} 0 R >>"
+        if xobject_refs:
+            resources += f" /XObject << {' '.join(xobject_refs)} >>"
+        page_ids.append(add(
+            f"<< /Type /Page /Parent {pages_id} 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources << {resources} >> /Contents {content_id} 0 R >>".encode("latin-1")
+        ))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[pages_id - 1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode("latin-1")
+    catalog_id = add(f"<< /Type /Catalog /Pages {pages_id} 0 R >>".encode("latin-1"))
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n".encode("latin-1") + body + b"\nendobj\n")
+    xref_offset = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root {catalog_id} 0 R >>\n"
+              f"startxref\n{xref_offset}\n%%EOF\n".encode("latin-1"))
+    return out.getvalue()
+
+
+def _text_page(page_lines: Sequence[str]) -> Dict[str, Any]:
+    commands = ["BT", "/F1 10 Tf", "12 TL", f"72 {PAGE_HEIGHT - 72} Td"]
+    for line in page_lines:
+        commands.append(f"({_escape_pdf_text(line)}) Tj T*")
+    commands.append("ET")
+    return {"content": "\n".join(commands).encode("latin-1", "replace")}
+
+
+def write_text_pdf(lines: Sequence[str]) -> bytes:
+    """PDF whose pages carry the lines as real (extractable) Helvetica text"""
+    return _write_pdf([_text_page(page_lines) for page_lines in _paginate(lines)])
+
+
+def _load_font(size: int):
+    try:
+        return ImageFont.load_default(size=size)
+    except TypeError:
+        # Pillow < 10.1 only ships the fixed-size bitmap font
+        return ImageFont.load_default()
+
+
+def render_page_image(page_lines: Sequence[str], dpi: int = 150) -> Image.Image:
+    """Grayscale raster of a page of text, as a scanner would produce it"""
+    scale = dpi / 72.0
+    image = Image.new("L", (int(PAGE_WIDTH * scale), int(PAGE_HEIGHT * scale)), 255)
+    draw = ImageDraw.Draw(image)
+    font = _load_font(int(10 * scale))
+    y = 72 * scale
+    for line in page_lines:
+        draw.text((72 * scale, y), line, fill=0, font=font)
+        y += 12 * scale
+    return image
+
+
+def _image_page(page_lines: Sequence[str], dpi: int) -> Dict[str, Any]:
+    image = render_page_image(page_lines, dpi)
+    data = zlib.compress(image.tobytes())
+    dictionary = (f"/Type /XObject /Subtype /Image /Width {image.width} /Height {image.height} "
+                  f"/ColorSpace /DeviceGray /BitsPerComponent 8 /Filter /FlateDecode")
+    content = f"q {PAGE_WIDTH} 0 0 {PAGE_HEIGHT} 0 0 cm /Im0 Do Q".encode("latin-1")
+    return {"content": content, "xobjects": [(dictionary, data)]}
+
+
+def write_image_pdf(lines: Sequence[str], dpi: int = 150) -> bytes:
+    """PDF whose pages are images only, with no text layer (forces the OCR path)"""
+    return _write_pdf([_image_page(page_lines, dpi) for page_lines in _paginate(lines)])
+
+
+def write_mixed_pdf(lines: Sequence[str], dpi: int = 150) -> bytes:
+    """Text PDF whose last page is a scan, like a scanned certificate appended to a resume"""
+    pages = _paginate(lines)
+    return _write_pdf([
+        _image_page(page_lines, dpi) if number == len(pages) and len(pages) > 1 else _text_page(page_lines)
+        for number, page_lines in enumerate(pages, start=1)
+    ])
+
+
+def build_corpus(out_dir: str, page_counts: Sequence[int] = (1, 2, 4), per_size: int = 2,
+                 kinds: Sequence[str] = ("text", "image"), seed: int = 0, dpi: int = 150) -> List[Dict[str, Any]]:
+    """
+    Write the corpus to out_dir and return its manifest (also saved as manifest.json).
+    Each entry has the file name, kind ("text", "image" or "mixed"), page count, size in bytes and
+    the seed of its text (generate_resume_lines(seed, pages) is what the resume says).
+    Mixed resumes have a scanned last page (a single page one is all text).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = []
+    for kind in kinds:
+        for pages in page_counts:
+            for index in range(per_size):
+                doc_seed = seed * 10007 + pages * 101 + index
+                lines = generate_resume_lines(doc_seed, pages)
+                if kind == "text":
+                    data = write_text_pdf(lines)
+                elif kind == "mixed":
+                    data = write_mixed_pdf(lines, dpi)
+                else:
+                    data = write_image_pdf(lines, dpi)
+                filename = f"{kind}_{pages}p_{index}.pdf"
+                with open(os.path.join(out_dir, filename), "wb") as f:
+                    f.write(data)
+                manifest.append({"filename": filename, "kind": kind, "pages": pages, "bytes": len(data),
+                                 "seed": doc_seed})
+    with open(os.path.join(out_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
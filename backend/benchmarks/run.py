@@ -0,0 +1,471 @@
+"""
+Benchmark runner for RULE
+Times every processing stage in isolation and whole resumes end to end against the stub LLM server,
+and writes the results as JSON so runs can be compared across commits (see compare.py).
+
+Usage:
+    python -m backend.benchmarks.run --pages 1,2,4 --per-size 2 --llm-latency 0.5
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import wait
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from .pdf_corpus import build_corpus, generate_resume_lines
+from .stub_llm import StubLLMServer, build_stub_analysis
+
+REPO_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+DEFAULT_RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def summarize(samples: List[float]) -> Dict[str, Any]:
+    """Count, mean and percentiles (seconds) of a list of durations"""
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        return ordered[min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))]
+
+    return {
+        "count": len(ordered),
+        "mean": round(statistics.fmean(ordered), 6),
+        "p50": round(percentile(0.50), 6),
+        "p95": round(percentile(0.95), 6),
+        "min": round(ordered[0], 6),
+        "max": round(ordered[-1], 6),
+    }
+
+
+def time_call(fn: Callable, *args, **kwargs):
+    start = time.perf_counter()
+    value = fn(*args, **kwargs)
+    return time.perf_counter() - start, value
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def configure_environment(workdir: str, stub: StubLLMServer, args) -> Dict[str, str]:
+    """
+    Point the backend at throwaway config, caches and the stub LLM.
+    Must run before any backend module is imported, since both configs are read at import time.
+    """
+    llm_config_path = os.path.join(workdir, "llm_config.json")
+    with open(llm_config_path, "w", encoding="utf-8") as f:
+        if args.provider == "mock":
+            json.dump({"provider": "mock", "model": "mock-analyzer", "api_key": "", "base_url": ""}, f)
+        else:
+            json.dump(stub.llm_config(args.provider), f)
+
+    processing_config_path = os.path.join(workdir, "processing_config.json")
+    with open(processing_config_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "executors": {"cpu_workers": args.cpu_workers, "io_workers": args.score_workers},
+            "pipeline": {"extract_workers": args.extract_workers, "score_workers": args.score_workers},
+            # Caches would turn every repeat into a hit; measure the full work instead
+            "result_cache": {"enabled": False, "directory": os.path.join(workdir, "cache", "results")},
+            "text_cache": {"enabled": False, "directory": os.path.join(workdir, "cache", "text")},
+            "admission": {"max_in_flight_resumes": 0, "max_queued_resumes": 0, "max_upload_bytes": 0},
+            "batch_jobs": {"directory": os.path.join(workdir, "batch_jobs")},
+            # Used with --provider mock: same latency as the stub, no HTTP round trip
+            "mock_llm": {
+                "latency": {"distribution": "uniform" if args.llm_jitter else "fixed",
+                            "mean_seconds": args.llm_latency + args.llm_jitter / 2,
+                            "stddev_seconds": args.llm_jitter / 12 ** 0.5},
+                "seed": args.seed
+            }
+        }, f)
+
+    os.environ["LLM_CONFIG_PATH"] = llm_config_path
+    os.environ["PROCESSING_CONFIG_PATH"] = processing_config_path
+    # LLMAutomation resets base_url to the provider default on load; make the stub the default
+    os.environ["OLLAMA_BASE_URL"] = stub.base_url
+    os.environ["OPENROUTER_BASE_URL"] = stub.openrouter_url
+    return {"llm_config": llm_config_path, "processing_config": processing_config_path}
+
+
+def group_name(doc: Dict[str, Any]) -> str:
+    return f"{doc['kind']}_{doc['pages']}p"
+
+
+def bench_per_document(docs: List[Dict[str, Any]], corpus_dir: str, repeat: int,
+                       fn: Callable[[str], Any]) -> Dict[str, Any]:
+    """Time fn(path) for every document, grouped by kind and page count"""
+    samples: Dict[str, List[float]] = {}
+    for doc in docs:
+        path = os.path.join(corpus_dir, doc["filename"])
+        for _ in range(repeat):
+            seconds, _ = time_call(fn, path)
+            samples.setdefault(group_name(doc), []).append(seconds)
+    return {group: summarize(values) for group, values in sorted(samples.items())}
+
+
+def bench_native_backends(docs: List[Dict[str, Any]], corpus_dir: str, repeat: int) -> Dict[str, Any]:
+    """
+    Detection and text extraction (analyze_pdf) of text resumes with every installed native backend,
+    with the text_quality score and the share of pdfplumber's words each backend recovers
+    """
+    from collections import Counter
+    from backend.modules.text_extract.native_backends import available_backends, get_backend
+    from backend.modules.text_extract.pdf_analyzer import analyze_pdf
+
+    paths = [os.path.join(corpus_dir, doc["filename"]) for doc in docs]
+    reference = {path: Counter(analyze_pdf(path, backend=get_backend("pdfplumber")).text.split()) for path in paths}
+    results = {}
+    for name in available_backends():
+        backend = get_backend(name)
+        results[name] = bench_per_document(docs, corpus_dir, repeat, lambda path: analyze_pdf(path, backend=backend))
+        qualities, recalls = [], []
+        for path in paths:
+            analysis = analyze_pdf(path, backend=backend)
+            qualities.append(analysis.quality or 0.0)
+            expected = reference[path]
+            recalls.append(sum((Counter(analysis.text.split()) & expected).values()) / max(1, sum(expected.values())))
+        results[name]["quality"] = round(statistics.fmean(qualities), 4)
+        results[name]["word_recall"] = round(statistics.fmean(recalls), 4)
+    return results
+
+
+def bench_ocr(docs: List[Dict[str, Any]], corpus_dir: str, repeat: int) -> Dict[str, Any]:
+    """
+    Extraction of image-only and mixed PDFs as the pipeline runs it (mixed ones OCR only their scanned pages),
+    with the detect/rasterize/Tesseract/cleaning split reported by the extractor.
+    "page_parallel" is the total with the pages OCR'd in parallel on the CPU pool (--cpu-workers).
+    """
+    missing = [tool for tool in ("pdftoppm", "tesseract") if shutil.which(tool) is None]
+    if missing:
+        return {"skipped": f"missing system tools: {', '.join(missing)}"}
+
+    from backend.pipelines.analyze_resume import extract_resume_text, extract_resume_text_on_pool
+
+    totals: Dict[str, List[float]] = {}
+    parallel_totals: Dict[str, List[float]] = {}
+    parts: Dict[str, Dict[str, List[float]]] = {}
+    for doc in docs:
+        path = os.path.join(corpus_dir, doc["filename"])
+        for _ in range(repeat):
+            seconds, extracted = time_call(extract_resume_text, path)
+            totals.setdefault(group_name(doc), []).append(seconds)
+            for stage, stage_seconds in extracted["timings"].items():
+                parts.setdefault(stage, {}).setdefault(group_name(doc), []).append(stage_seconds)
+            seconds, _ = time_call(extract_resume_text_on_pool, path, True)
+            parallel_totals.setdefault(group_name(doc), []).append(seconds)
+
+    results = {
+        "total": {group: summarize(values) for group, values in sorted(totals.items())},
+        "page_parallel": {group: summarize(values) for group, values in sorted(parallel_totals.items())},
+    }
+    for stage, groups in parts.items():
+        results[stage] = {group: summarize(values) for group, values in sorted(groups.items())}
+    return results
+
+
+def bench_ocr_engines(docs: List[Dict[str, Any]], corpus_dir: str, repeat: int) -> Dict[str, Any]:
+    """
+    Tesseract alone on the enhanced pages of image-only resumes with every installed OCR engine:
+    seconds per page, the first call (engine start) separately, the share of the resume's words recovered
+    and the mean word confidence. Uses the ocr.engine options of the processing config.
+    With both engines, "tesserocr_speedup" is pytesseract's mean seconds per page over tesserocr's.
+    """
+    missing = [tool for tool in ("pdftoppm", "tesseract") if shutil.which(tool) is None]
+    if missing:
+        return {"skipped": f"missing system tools: {', '.join(missing)}"}
+
+    from collections import Counter
+    from PIL import Image
+    from backend.modules.processing.config import processing_config
+    from backend.modules.text_extract.extract_ocr_pdf import enhance_image, iter_page_images
+    from backend.modules.text_extract.ocr_engines import available_engines, create_ocr_engine
+
+    pages = []
+    for doc in docs:
+        path = os.path.join(corpus_dir, doc["filename"])
+        for _, image in iter_page_images(path, dpi=300, streaming=False):
+            pages.append((doc, Image.fromarray(enhance_image(image))))
+    expected = {doc["filename"]: Counter(" ".join(generate_resume_lines(doc["seed"], doc["pages"])).split())
+                for doc in docs}
+
+    config = processing_config.get("ocr", {}).get("engine", {})
+    results = {}
+    for name in available_engines():
+        start = time.perf_counter()
+        engine = create_ocr_engine(config, name=name)
+        if engine.name != name:
+            # Installed but failed to start (e.g. missing language data): the fallback is measured on its own
+            results[name] = {"skipped": f"failed to start; {engine.name} was used instead"}
+            engine.close()
+            continue
+        engine.recognize(pages[0][1])
+        first_call = time.perf_counter() - start
+
+        samples: Dict[str, List[float]] = {}
+        words: Dict[str, Counter] = {filename: Counter() for filename in expected}
+        confidences = []
+        for iteration in range(repeat):
+            for doc, image in pages:
+                seconds, (text, confidence) = time_call(engine.recognize, image, True)
+                samples.setdefault(f"{group_name(doc)} per page", []).append(seconds)
+                if iteration == 0:
+                    confidences.append(confidence)
+                    words[doc["filename"]].update(text.split())
+        engine.close()
+
+        recalls = [sum((words[filename] & reference).values()) / max(1, sum(reference.values()))
+                   for filename, reference in expected.items()]
+        results[engine.name] = {group: summarize(values) for group, values in sorted(samples.items())}
+        results[engine.name]["first_call_seconds"] = round(first_call, 4)
+        results[engine.name]["word_recall"] = round(statistics.fmean(recalls), 4)
+        results[engine.name]["confidence"] = round(statistics.fmean(confidences), 2)
+
+    tesserocr, pytesseract = results.get("tesserocr", {}), results.get("pytesseract", {})
+    if tesserocr and pytesseract and "skipped" not in tesserocr and "skipped" not in pytesseract:
+        results["tesserocr_speedup"] = {
+            group: round(pytesseract[group]["mean"] / tesserocr[group]["mean"], 2)
+            for group in tesserocr if group in pytesseract and isinstance(tesserocr[group], dict)
+            and tesserocr[group].get("mean")
+        }
+    return results
+
+
+def bench_clean(page_counts: List[int], repeat: int) -> Dict[str, Any]:
+    """spaCy/spell-check cleaning of OCR-like text (mangled letters and line noise)"""
+    from backend.modules.text_extract.extract_ocr_pdf import clean_text
+
+    results = {}
+    for pages in page_counts:
+        text = "\n".join(generate_resume_lines(pages, pages)).replace("l", "1").replace("o", "0")
+        samples = [time_call(clean_text, text)[0] for _ in range(repeat)]
+        results[f"{pages}p"] = summarize(samples)
+    return results
+
+
+def bench_validate(repeat: int, job_description: str) -> Dict[str, Any]:
+    """Response validation of a stub analysis, as a JSON string and as an already parsed dict"""
+    from backend.modules.llm.response_validator import validate_llm_response
+
+    prompt = f"JOB DESCRIPTION (FOUNDATION):\n{job_description}\n------------"
+    analysis = build_stub_analysis(prompt)
+    raw = json.dumps(analysis)
+    return {
+        "json": summarize([time_call(validate_llm_response, raw, job_description)[0] for _ in range(repeat)]),
+        "dict": summarize([time_call(validate_llm_response, dict(analysis), job_description)[0]
+                           for _ in range(repeat)]),
+    }
+
+
+def bench_persist(repeat: int) -> Dict[str, Any]:
+    """save_result_to_json of a typical result"""
+    from backend.pipelines.analyze_resume import save_result_to_json
+
+    result = build_stub_analysis("")
+    samples = [time_call(save_result_to_json, result, f"bench-persist-{i}")[0] for i in range(repeat)]
+    return {"result": summarize(samples)}
+
+
+def mean_stage_timings(results: List[Dict[str, Any]]) -> Dict[str, float]:
+    stages: Dict[str, List[float]] = {}
+    for result in results:
+        for stage, seconds in (result.get("stage_timings") or {}).items():
+            stages.setdefault(stage, []).append(seconds)
+    return {stage: round(statistics.fmean(values), 6) for stage, values in sorted(stages.items())}
+
+
+def bench_end_to_end_sequential(docs: List[Dict[str, Any]], corpus_dir: str, repeat: int,
+                                job_description: str) -> Dict[str, Any]:
+    """process_single_resume one resume at a time: latency without contention"""
+    from backend.pipelines.analyze_resume import process_single_resume
+
+    samples: Dict[str, List[float]] = {}
+    results: Dict[str, List[Dict[str, Any]]] = {}
+    failures = 0
+    for doc in docs:
+        path = os.path.join(corpus_dir, doc["filename"])
+        for i in range(repeat):
+            seconds, result = time_call(
+                process_single_resume, path, job_description, f"bench-{group_name(doc)}-{i}", doc["filename"]
+            )
+            failures += 0 if result.get("success") else 1
+            samples.setdefault(group_name(doc), []).append(seconds)
+            results.setdefault(group_name(doc), []).append(result)
+    return {
+        "failures": failures,
+        "latency": {group: summarize(values) for group, values in sorted(samples.items())},
+        "stage_timings": {group: mean_stage_timings(values) for group, values in sorted(results.items())},
+    }
+
+
+def bench_end_to_end_pipeline(docs: List[Dict[str, Any]], corpus_dir: str, repeat: int,
+                              job_description: str) -> Dict[str, Any]:
+    """Whole corpus submitted at once to the staged pipeline: throughput under load"""
+    from backend.pipelines.staged_pipeline import PipelineItem, staged_pipeline
+
+    items = []
+    for doc in docs:
+        path = os.path.join(corpus_dir, doc["filename"])
+        for i in range(repeat):
+            with open(path, "rb") as f:
+                pdf_bytes = f.read()
+            items.append((group_name(doc), PipelineItem(
+                resume_id=f"bench-pipeline-{group_name(doc)}-{i}", filename=doc["filename"],
+                job_description=job_description, pdf_bytes=pdf_bytes
+            )))
+
+    start = time.perf_counter()
+    futures = [staged_pipeline.submit(item) for _, item in items]
+    wait(futures)
+    wall_seconds = time.perf_counter() - start
+
+    latencies: Dict[str, List[float]] = {}
+    failures = 0
+    for group, item in items:
+        result = item.future.result() or {}
+        failures += 0 if result.get("success") else 1
+        latencies.setdefault(group, []).append((result.get("stage_timings") or {}).get("total", 0.0))
+    staged_pipeline.shutdown()
+    return {
+        "resumes": len(items),
+        "failures": failures,
+        "wall_seconds": round(wall_seconds, 6),
+        "throughput_per_second": round(len(items) / wall_seconds, 3) if wall_seconds else None,
+        "latency": {group: summarize(values) for group, values in sorted(latencies.items())},
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="RULE processing benchmarks")
+    parser.add_argument("--pages", default="1,2,4", help="Comma-separated page counts of generated resumes")
+    parser.add_argument("--per-size", type=int, default=2, help="Resumes per kind and page count")
+    parser.add_argument("--kinds", default="text,image", help="Resume kinds: text, image and/or mixed (scanned last page)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions of every isolated measurement")
+    parser.add_argument("--e2e-repeat", type=int, default=1, help="Repetitions of every end-to-end resume")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--dpi", type=int, default=150, help="Resolution of image-only resumes")
+    parser.add_argument("--provider", choices=["ollama", "openrouter", "mock"], default="ollama",
+                        help="API format the analyzer uses against the stub LLM, or the in-process mock provider")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Stub LLM delay per request (s)")
+    parser.add_argument("--llm-jitter", type=float, default=0.0, help="Extra random stub delay, up to (s)")
+    parser.add_argument("--cpu-workers", type=int, default=2)
+    parser.add_argument("--extract-workers", type=int, default=2)
+    parser.add_argument("--score-workers", type=int, default=4)
+    parser.add_argument("--only", default="", help="Comma-separated sections to run "
+                        "(detect,native_extract,analyze,native_backends,ocr,ocr_engines,clean,validate,persist,e2e_sequential,e2e_pipeline)")
+    parser.add_argument("--corpus-dir", default=None, help="Keep the generated corpus here")
+    parser.add_argument("--output", default=None, help="Result file (default: benchmarks/results/<time>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> Dict[str, Any]:
+    args = parse_args(argv)
+    page_counts = [int(pages) for pages in args.pages.split(",") if pages]
+    kinds = [kind for kind in args.kinds.split(",") if kind]
+    only = {section for section in args.only.split(",") if section}
+    enabled = lambda section: not only or section in only
+
+    workdir = tempfile.mkdtemp(prefix="rule-bench-")
+    corpus_dir = args.corpus_dir or os.path.join(workdir, "corpus")
+    manifest = build_corpus(corpus_dir, page_counts, args.per_size, kinds, args.seed, args.dpi)
+    text_docs = [doc for doc in manifest if doc["kind"] == "text"]
+    # Mixed resumes need OCR for their scanned page, like image-only ones
+    image_docs = [doc for doc in manifest if doc["kind"] in ("image", "mixed")]
+
+    stub = StubLLMServer(args.llm_latency, args.llm_jitter, seed=args.seed).start()
+    configure_environment(workdir, stub, args)
+
+    # Imported only now: the backend reads its configs at import time
+    sys.path.insert(0, REPO_ROOT)
+    import backend.pipelines.analyze_resume as analyze_resume
+    from backend.modules.job_descriptions.store import DEFAULT_JOB_DESCRIPTION
+
+    # Keep benchmark results out of the real outputs/ directory
+    output_dir = os.path.join(workdir, "outputs")
+    os.makedirs(output_dir, exist_ok=True)
+    analyze_resume.get_output_dir = lambda: output_dir
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "args": vars(args),
+        },
+        "corpus": manifest,
+        "stages": {},
+        "end_to_end": {},
+    }
+    stages = report["stages"]
+    try:
+        if enabled("detect"):
+            stages["detect"] = bench_per_document(manifest, corpus_dir, args.repeat, analyze_resume.is_pdf_text_based)
+        if enabled("native_extract"):
+            stages["native_extract"] = bench_per_document(
+                text_docs, corpus_dir, args.repeat, analyze_resume.extract_lines_from_pdf
+            )
+        if enabled("analyze"):
+            # Detection and native extraction in the single pass the pipeline uses
+            stages["analyze"] = bench_per_document(manifest, corpus_dir, args.repeat, analyze_resume.analyze_pdf)
+        if enabled("native_backends") and text_docs:
+            stages["native_backends"] = bench_native_backends(text_docs, corpus_dir, args.repeat)
+        if enabled("ocr") and image_docs:
+            stages["ocr"] = bench_ocr(image_docs, corpus_dir, args.repeat)
+        if enabled("ocr_engines") and any(doc["kind"] == "image" for doc in image_docs):
+            stages["ocr_engines"] = bench_ocr_engines(
+                [doc for doc in image_docs if doc["kind"] == "image"], corpus_dir, args.repeat
+            )
+        if enabled("clean"):
+            stages["clean"] = bench_clean(page_counts, args.repeat)
+        if enabled("validate"):
+            stages["validate"] = bench_validate(args.repeat * 10, DEFAULT_JOB_DESCRIPTION)
+        if enabled("persist"):
+            stages["persist"] = bench_persist(args.repeat * 10)
+
+        # Image-only resumes go end to end only when OCR can actually run
+        e2e_docs = text_docs + (image_docs if "skipped" not in stages.get("ocr", {}) else [])
+        if enabled("e2e_sequential"):
+            report["end_to_end"]["sequential"] = bench_end_to_end_sequential(
+                e2e_docs, corpus_dir, args.e2e_repeat, DEFAULT_JOB_DESCRIPTION
+            )
+        if enabled("e2e_pipeline"):
+            report["end_to_end"]["pipeline"] = bench_end_to_end_pipeline(
+                e2e_docs, corpus_dir, args.e2e_repeat, DEFAULT_JOB_DESCRIPTION
+            )
+        report["end_to_end"]["llm_requests"] = dict(stub.requests)
+    finally:
+        stub.stop()
+        from backend.modules.processing.executors import executors
+        executors.shutdown()
+
+    report["meta"]["finished_at"] = datetime.now().isoformat()
+    output = args.output or os.path.join(
+        DEFAULT_RESULTS_DIR, f"{datetime.now():%Y%m%d-%H%M%S}-{(report['meta']['commit'] or 'nogit')[:8]}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"[BENCH] Results written to {output}")
+
+    if not args.corpus_dir:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return report
+
+
+if __name__ == "__main__":
+    main()
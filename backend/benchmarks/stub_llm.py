@@ -0,0 +1,164 @@
+"""
+Stub LLM server for RULE benchmarks
+An in-process HTTP server answering the Ollama /api/chat and OpenRouter chat-completions APIs
+with a schema-valid resume analysis after a configurable delay
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional
+
+OLLAMA_PATH = "/api/chat"
+OPENROUTER_PATH = "/api/v1/chat/completions"
+
+_JOB_DESCRIPTION_PATTERN = re.compile(
+    r"JOB DESCRIPTION \(FOUNDATION[^\n]*\n(.*?)\n-{6,}", re.DOTALL
+)
+_NAME_PATTERN = re.compile(r"CANDIDATE RESUME \(Plain Text\):\s*\n\s*(.+)")
+
+
+def build_stub_analysis(prompt: str) -> Dict[str, Any]:
+    """A ResumeAnalysisResponse-shaped answer echoing the job description found in the prompt"""
+    job_match = _JOB_DESCRIPTION_PATTERN.search(prompt)
+    name_match = _NAME_PATTERN.search(prompt)
+    fit_score = 5 + len(prompt) % 5
+    return {
+        "job_description": job_match.group(1).strip() if job_match else "",
+        "full_name": name_match.group(1).strip()[:80] if name_match else "Unknown",
+        "email": "",
+        "phone_number": "",
+        "total_experience_years": 5,
+        "roles": [{
+            "title": "Software Engineer", "company": "Unknown", "duration": "Unknown",
+            "start_date": "Unknown", "end_date": "Present"
+        }],
+        "work_experience_raw": "Benchmark stub analysis of the candidate's experience.",
+        "skills": {"Python": {"source": "Skills section", "years": "Unknown"}},
+        "projects": [],
+        "leadership_signals": False,
+        "leadership_justification": "",
+        "candidate_fit_summary": "Generated by the benchmark stub LLM server.",
+        "fit_score": fit_score,
+        "fit_score_reason": "Benchmark stub score",
+        "eligibility_status": "Eligible",
+        "eligibility_reason": "Benchmark stub eligibility"
+    }
+
+
+class StubLLMServer:
+    """
+    Serves both provider APIs on 127.0.0.1 from a background thread.
+    Each request sleeps latency_seconds (plus up to jitter_seconds) before answering;
+    Ollama answers are streamed as stream_chunks JSON lines like the real server.
+    """
+
+    def __init__(self, latency_seconds: float = 0.5, jitter_seconds: float = 0.0,
+                 stream_chunks: int = 4, port: int = 0, seed: int = 0):
+        self.latency_seconds = latency_seconds
+        self.jitter_seconds = jitter_seconds
+        self.stream_chunks = max(1, stream_chunks)
+        self.port = port
+        self.requests = {"ollama": 0, "openrouter": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}"
+
+    @property
+    def openrouter_url(self) -> str:
+        return f"{self.base_url}{OPENROUTER_PATH}"
+
+    def llm_config(self, provider: str, model: str = "benchmark-stub") -> Dict[str, Any]:
+        """An llm_config.json pointing the analyzer at this server"""
+        base_url = self.base_url if provider == "ollama" else self.openrouter_url
+        return {"provider": provider, "model": model, "api_key": "benchmark", "base_url": base_url}
+
+    def _delay(self) -> float:
+        with self._lock:
+            jitter = self._rng.uniform(0, self.jitter_seconds) if self.jitter_seconds else 0.0
+        return self.latency_seconds + jitter
+
+    def _count(self, provider: str):
+        with self._lock:
+            self.requests[provider] += 1
+
+    def start(self) -> "StubLLMServer":
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str = "application/json"):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    request = json.loads(self.rfile.read(length) or b"{}")
+                    prompt = request["messages"][-1]["content"]
+                except (ValueError, KeyError, IndexError):
+                    self._send(400, b'{"error": "expected a chat request with messages"}')
+                    return
+
+                time.sleep(stub._delay())
+                content = json.dumps(build_stub_analysis(prompt))
+                model = request.get("model") or "benchmark-stub"
+
+                if self.path == OLLAMA_PATH:
+                    stub._count("ollama")
+                    size = -(-len(content) // stub.stream_chunks)
+                    lines = [
+                        json.dumps({"model": model, "message": {"role": "assistant", "content": content[i:i + size]},
+                                    "done": False})
+                        for i in range(0, len(content), size)
+                    ]
+                    lines.append(json.dumps({"model": model, "message": {"role": "assistant", "content": ""},
+                                             "done": True}))
+                    self._send(200, "\n".join(lines).encode("utf-8"), "application/x-ndjson")
+                elif self.path == OPENROUTER_PATH:
+                    stub._count("openrouter")
+                    body = {
+                        "id": f"stub-{time.time_ns()}",
+                        "model": model,
+                        "choices": [{"index": 0, "finish_reason": "stop",
+                                     "message": {"role": "assistant", "content": content}}],
+                        "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4,
+                                  "total_tokens": (len(prompt) + len(content)) // 4}
+                    }
+                    self._send(200, json.dumps(body).encode("utf-8"))
+                else:
+                    self._send(404, b'{"error": "unknown path"}')
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "StubLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
@@ -0,0 +1,2 @@
+# Cache module for RULE
+# Content-addressed on-disk caches for extracted text and analysis results
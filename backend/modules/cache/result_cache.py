@@ -0,0 +1,83 @@
+"""
+Result cache for RULE
+Reuses a finished analysis when the same PDF is scored against the same job description,
+with the same LLM provider/model and prompt version
+"""
+
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional, Tuple
+
+from backend.modules.llm_prompts.parse_resume_llm import PROMPT_VERSION, load_llm_config
+from backend.modules.processing.config import processing_config
+from .store import JsonFileCache, sha256_hex
+
+
+def current_llm_identity() -> Tuple[str, str]:
+    """(provider, model) from llm_config.json; empty strings when it cannot be read"""
+    try:
+        llm_config = load_llm_config()
+        return llm_config.get("provider", "") or "", llm_config.get("model", "") or ""
+    except Exception:
+        return "", ""
+
+
+class ResultCache(JsonFileCache):
+    """LLM analysis results keyed on document hash, job description, provider/model and prompt version"""
+
+    def __init__(self, cache_dir: str, max_entries: int = 5000, enabled: bool = True):
+        super().__init__(cache_dir, max_entries)
+        self.enabled = enabled
+
+    def make_key(self, document_hash: str, job_description: str) -> str:
+        provider, model = current_llm_identity()
+        job_hash = sha256_hex(job_description.encode("utf-8"))
+        return sha256_hex(f"{document_hash}:{job_hash}:{provider}:{model}:{PROMPT_VERSION}".encode("utf-8"))
+
+    def lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached analysis for key, or None"""
+        if not self.enabled:
+            return None
+        entry = self.get(key)
+        if not entry or entry.get("prompt_version") != PROMPT_VERSION:
+            return None
+        return dict(entry["result"])
+
+    def store(self, key: str, result: Dict[str, Any]):
+        """Cache a validated analysis result"""
+        if not self.enabled:
+            return
+        provider, model = current_llm_identity()
+        try:
+            self.put(key, {
+                "prompt_version": PROMPT_VERSION,
+                "provider": provider,
+                "model": model,
+                "created_at": datetime.now().isoformat(),
+                "result": result
+            })
+        except OSError as e:
+            print(f"[CACHE] Failed to store result {key}: {e}")
+
+    def purge_stale_prompts(self) -> int:
+        """Drop entries produced with a different prompt version"""
+        removed = self.invalidate(lambda entry: entry.get("prompt_version") != PROMPT_VERSION)
+        if removed:
+            print(f"[CACHE] Removed {removed} cached results from older prompt versions")
+        return removed
+
+
+def _build_result_cache() -> ResultCache:
+    cache_config = processing_config["result_cache"]
+    cache_dir = cache_config.get("directory") or os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "..", "cache", "results")
+    )
+    return ResultCache(
+        cache_dir,
+        max_entries=int(cache_config.get("max_entries", 5000)),
+        enabled=bool(cache_config.get("enabled", True))
+    )
+
+
+# Global result cache instance
+result_cache = _build_result_cache()
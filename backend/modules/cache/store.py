@@ -0,0 +1,104 @@
+"""
+JSON file cache for RULE
+A size-bounded, content-addressed cache that stores one JSON file per key
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+
+def sha256_hex(data: bytes) -> str:
+    """Hex SHA-256 digest used as a content address"""
+    return hashlib.sha256(data).hexdigest()
+
+
+class JsonFileCache:
+    """On-disk cache with least-recently-used eviction once max_entries is exceeded"""
+
+    def __init__(self, cache_dir: str, max_entries: int = 5000):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, None]" = OrderedDict()
+        self._load_index()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _load_index(self):
+        """Rebuild the LRU order from file modification times"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entries = []
+        for filename in os.listdir(self.cache_dir):
+            if filename.endswith(".json"):
+                path = os.path.join(self.cache_dir, filename)
+                try:
+                    entries.append((os.path.getmtime(path), filename[:-5]))
+                except OSError:
+                    continue
+        for _, key in sorted(entries):
+            self._index[key] = None
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return the cached entry for key, or None on a miss"""
+        with self._lock:
+            if key not in self._index:
+                return None
+            path = self._path(key)
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"[CACHE] Dropping unreadable entry {key}: {e}")
+                self._remove(key)
+                return None
+            self._index.move_to_end(key)
+            # Keep the recency order across restarts
+            os.utime(path, None)
+            return entry
+
+    def put(self, key: str, entry: Dict[str, Any]):
+        """Store an entry and evict the least recently used ones beyond max_entries"""
+        with self._lock:
+            path = self._path(key)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False, default=str)
+            os.replace(temp_path, path)
+            self._index[key] = None
+            self._index.move_to_end(key)
+
+            while len(self._index) > self.max_entries:
+                oldest, _ = self._index.popitem(last=False)
+                self._remove(oldest)
+
+    def invalidate(self, predicate: Optional[Callable[[Dict[str, Any]], bool]] = None) -> int:
+        """Remove every entry (or those matching predicate); returns the number removed"""
+        removed = 0
+        with self._lock:
+            for key in list(self._index):
+                if predicate is not None:
+                    try:
+                        with open(self._path(key), "r", encoding="utf-8") as f:
+                            if not predicate(json.load(f)):
+                                continue
+                    except (OSError, json.JSONDecodeError):
+                        pass
+                self._remove(key)
+                removed += 1
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._index), "max_entries": self.max_entries, "directory": self.cache_dir}
+
+    def _remove(self, key: str):
+        self._index.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
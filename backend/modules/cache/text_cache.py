@@ -0,0 +1,125 @@
+"""
+Extracted text cache for RULE
+Keeps the text extracted from each PDF, keyed on its document hash, so re-scoring a resume
+against another job description (or after an LLM failure) skips PDF parsing and OCR
+"""
+
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from backend.modules.processing.config import processing_config
+from backend.modules.text_extract import extract_native_pdf, extract_ocr_pdf
+from backend.modules.text_extract.native_backends import BACKENDS
+from backend.modules.text_extract.ocr_engines import engine_signature, resolve_engine_name
+from .store import JsonFileCache
+
+
+def hybrid_extractor_name(native_extractor: str) -> str:
+    """Native text with the scanned pages OCR'd, versioned by both extractors"""
+    return f"{native_extractor}+{extract_ocr_pdf.EXTRACTOR_NAME}"
+
+
+def _ocr_extractor_version() -> str:
+    """OCR output also depends on the configured engine and its options (ocr.engine) and on adaptive DPI"""
+    ocr_config = processing_config.get("ocr", {})
+    version = f"{extract_ocr_pdf.EXTRACTOR_VERSION}/{engine_signature(ocr_config.get('engine', {}))}"
+    adaptive_dpi = ocr_config.get("adaptive_dpi", {})
+    if adaptive_dpi.get("enabled", False):
+        version += (f"/adaptive:{int(adaptive_dpi.get('initial_dpi', 200))}:"
+                    f"{float(adaptive_dpi.get('min_confidence', 80))}")
+    return version
+
+
+OCR_EXTRACTOR_VERSION = _ocr_extractor_version()
+# Engine the OCR version above is signed with; the workers may still fall back from it at runtime
+OCR_ENGINE = resolve_engine_name(processing_config.get("ocr", {}).get("engine", {}))
+
+# Current version of every extractor; cached text from any other version is ignored
+EXTRACTOR_VERSIONS = {extract_ocr_pdf.EXTRACTOR_NAME: OCR_EXTRACTOR_VERSION}
+for _backend in BACKENDS.values():
+    EXTRACTOR_VERSIONS[_backend.name] = _backend.version
+    EXTRACTOR_VERSIONS[hybrid_extractor_name(_backend.name)] = f"{_backend.version}+{OCR_EXTRACTOR_VERSION}"
+
+# extraction_method reported in results -> extractor that produced the text, when not recorded with it
+EXTRACTION_METHODS = {
+    "native": extract_native_pdf.EXTRACTOR_NAME,
+    "ocr": extract_ocr_pdf.EXTRACTOR_NAME,
+    "hybrid": hybrid_extractor_name(extract_native_pdf.EXTRACTOR_NAME),
+}
+
+
+class TextCache(JsonFileCache):
+    """Extracted resume text keyed on document hash, tagged with extractor name and version"""
+
+    def __init__(self, cache_dir: str, max_entries: int = 20000, enabled: bool = True):
+        super().__init__(cache_dir, max_entries)
+        self.enabled = enabled
+
+    def lookup(self, document_hash: str) -> Optional[Dict[str, Any]]:
+        """
+        Return {"resume_text", "extraction_method", "extractor", "extractor_version", "page_text_layers"}
+        for a document, or None when it is missing or was produced by an outdated extractor
+        """
+        if not self.enabled:
+            return None
+        entry = self.get(document_hash)
+        if not entry or EXTRACTOR_VERSIONS.get(entry.get("extractor")) != entry.get("extractor_version"):
+            return None
+        return {
+            "resume_text": entry["resume_text"],
+            "extraction_method": entry["extraction_method"],
+            "extractor": entry["extractor"],
+            "extractor_version": entry["extractor_version"],
+            "page_text_layers": entry.get("page_text_layers", []),
+        }
+
+    def store(self, document_hash: str, extracted: Dict[str, Any]):
+        """
+        Cache the output of extract_resume_text; empty text is never cached, nor is text OCR'd by another
+        engine than the one its extractor version names (a worker fell back, e.g. tesserocr failed to start)
+        """
+        if not self.enabled or not extracted.get("resume_text", "").strip():
+            return
+        engines = {page["engine"] for page in extracted.get("ocr_pages") or [] if page.get("engine")}
+        if engines - {OCR_ENGINE}:
+            print(f"[CACHE] Not caching text of {document_hash[:12]}: OCR'd with {', '.join(sorted(engines))}, "
+                  f"not the configured {OCR_ENGINE}")
+            return
+        extractor = extracted.get("extractor") or EXTRACTION_METHODS[extracted["extraction_method"]]
+        try:
+            self.put(document_hash, {
+                "extractor": extractor,
+                "extractor_version": EXTRACTOR_VERSIONS[extractor],
+                "extraction_method": extracted["extraction_method"],
+                "created_at": datetime.now().isoformat(),
+                "resume_text": extracted["resume_text"],
+                "page_text_layers": extracted.get("page_text_layers", [])
+            })
+        except OSError as e:
+            print(f"[CACHE] Failed to store extracted text {document_hash}: {e}")
+
+    def purge_stale_extractors(self) -> int:
+        """Drop text produced by an extractor version that is no longer current"""
+        removed = self.invalidate(
+            lambda entry: EXTRACTOR_VERSIONS.get(entry.get("extractor")) != entry.get("extractor_version")
+        )
+        if removed:
+            print(f"[CACHE] Removed {removed} cached texts from older extractor versions")
+        return removed
+
+
+def _build_text_cache() -> TextCache:
+    cache_config = processing_config["text_cache"]
+    cache_dir = cache_config.get("directory") or os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "..", "cache", "text")
+    )
+    return TextCache(
+        cache_dir,
+        max_entries=int(cache_config.get("max_entries", 20000)),
+        enabled=bool(cache_config.get("enabled", True))
+    )
+
+
+# Global text cache instance
+text_cache = _build_text_cache()
@@ -0,0 +1,2 @@
+# Job descriptions module for RULE
+# Versioned storage of the job descriptions resumes are scored against
@@ -0,0 +1,138 @@
+"""
+Job description store for RULE
+Keeps the current job description in jd_jsons/job_description.json, named job descriptions
+for parallel open roles in jd_jsons/named/, and every version ever scored against in
+jd_jsons/versions/, addressed by job_description_id
+"""
+
+import json
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from backend.modules.cache.store import sha256_hex
+
+DEFAULT_JOB_DESCRIPTION = "No specific job description provided."
+
+# Names double as file names, so keep them to a safe slug
+_NAME_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+
+
+def get_job_description_id(job_description: str) -> str:
+    """Content-derived version id of a job description; identical text always gets the same id"""
+    return sha256_hex(job_description.encode("utf-8"))[:12]
+
+
+class JobDescriptionStore:
+    """Current job description plus an immutable history of versions"""
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        self.current_path = os.path.join(base_dir, "job_description.json")
+        self.versions_dir = os.path.join(base_dir, "versions")
+        self.named_dir = os.path.join(base_dir, "named")
+        self._lock = threading.Lock()
+
+    def _write_json(self, path: str, data: Dict[str, Any]):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    def load_current(self) -> Optional[Dict[str, Any]]:
+        """The saved job description with its version id, or None if none has been saved"""
+        if not os.path.exists(self.current_path):
+            return None
+        with open(self.current_path, "r", encoding="utf-8") as f:
+            job_data = json.load(f)
+        job_description = job_data.get("job_description", "")
+        job_data.setdefault("job_description_id", get_job_description_id(job_description))
+        return job_data
+
+    def save_current(self, job_description: str) -> Dict[str, Any]:
+        """Make job_description the current one, recording it as a version"""
+        job_data = {
+            "job_description": job_description,
+            "job_description_id": self.save_version(job_description),
+            "updated_at": datetime.now().isoformat()
+        }
+        with self._lock:
+            self._write_json(self.current_path, job_data)
+        return job_data
+
+    def save_version(self, job_description: str) -> str:
+        """Record a job description version (idempotent) and return its id"""
+        job_description_id = get_job_description_id(job_description)
+        path = os.path.join(self.versions_dir, f"{job_description_id}.json")
+        with self._lock:
+            if not os.path.exists(path):
+                self._write_json(path, {
+                    "job_description_id": job_description_id,
+                    "job_description": job_description,
+                    "created_at": datetime.now().isoformat()
+                })
+        return job_description_id
+
+    def _named_path(self, name: str) -> str:
+        if not _NAME_PATTERN.match(name):
+            raise ValueError("Job description names may only contain letters, digits, '-' and '_' (max 64)")
+        return os.path.join(self.named_dir, f"{name}.json")
+
+    def save_named(self, name: str, job_description: str) -> Dict[str, Any]:
+        """Create or update a named job description (one per open role)"""
+        path = self._named_path(name)
+        job_data = {
+            "name": name,
+            "job_description": job_description,
+            "job_description_id": self.save_version(job_description),
+            "updated_at": datetime.now().isoformat()
+        }
+        with self._lock:
+            self._write_json(path, job_data)
+        return job_data
+
+    def get_named(self, name: str) -> Optional[Dict[str, Any]]:
+        """A named job description, or None if unknown"""
+        path = self._named_path(name)
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def list_named(self) -> List[Dict[str, Any]]:
+        """All named job descriptions, sorted by name"""
+        if not os.path.isdir(self.named_dir):
+            return []
+        named = []
+        for filename in sorted(os.listdir(self.named_dir)):
+            if filename.endswith(".json"):
+                job_data = self.get_named(filename[:-5])
+                if job_data:
+                    named.append(job_data)
+        return named
+
+    def delete_named(self, name: str) -> bool:
+        """Remove a named job description; its versions are kept for existing results"""
+        path = self._named_path(name)
+        with self._lock:
+            if not os.path.exists(path):
+                return False
+            os.remove(path)
+        return True
+
+    def get_version(self, job_description_id: str) -> Optional[str]:
+        """Text of a recorded version, or None if unknown"""
+        path = os.path.join(self.versions_dir, f"{os.path.basename(job_description_id)}.json")
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("job_description")
+
+
+# Global job description store instance
+job_description_store = JobDescriptionStore(
+    os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..", "jd_jsons"))
+)
@@ -0,0 +1,197 @@
+"""
+Mock LLM provider for RULE
+Answers resume analysis prompts offline with schema-valid ResumeAnalysisResponse JSON,
+after a sampled latency and with configurable error and malformed-JSON rates, so the
+backend's own throughput and the validation fallback paths can be exercised without a real LLM
+"""
+
+import json
+import math
+import random
+import re
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from backend.modules.processing.config import DEFAULT_PROCESSING_CONFIG, processing_config
+from ..base_provider import BaseLLMProvider
+
+# Characters per token used to estimate token counts
+CHARS_PER_TOKEN = 4
+
+_JOB_DESCRIPTION_PATTERN = re.compile(r"JOB DESCRIPTION \(FOUNDATION[^\n]*\n(.*?)\n-{6,}", re.DOTALL)
+_RESUME_PATTERN = re.compile(r"CANDIDATE RESUME \(Plain Text\):\s*\n(.*?)\n-{6,}", re.DOTALL)
+_EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+_SKILL_WORDS = ["Python", "FastAPI", "Django", "PostgreSQL", "Docker", "Kubernetes", "AWS", "React",
+                "TypeScript", "Kafka", "Spark", "Terraform", "Redis", "GraphQL", "Airflow", "PyTorch"]
+
+
+class MockLLMError(RuntimeError):
+    """Simulated provider failure (the equivalent of a 5xx or a dropped connection)"""
+
+
+class MockProvider(BaseLLMProvider):
+    """Offline provider; settings come from the mock_llm section of the processing config"""
+
+    AVAILABLE_MODELS = ["mock-analyzer"]
+
+    def __init__(self, model: str, api_key: str | None = None, settings: Optional[Dict[str, Any]] = None):
+        super().__init__(model, api_key)
+        self.settings = _merge_settings(settings if settings is not None else processing_config.get("mock_llm", {}))
+        self._rng = random.Random(self.settings.get("seed"))
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def list_models():
+        """Return available mock models"""
+        return MockProvider.AVAILABLE_MODELS
+
+    def send_prompt(self, prompt: str) -> dict | None:
+        try:
+            return json.loads(self.complete(prompt))
+        except (MockLLMError, json.JSONDecodeError) as e:
+            print("[❌ Mock LLM Error]", e)
+            return None
+
+    def analyze(self, prompt: str):
+        """
+        Resume analysis for call_mistral_resume_analyzer: the parsed dict for well-formed output,
+        or the raw text when the response was made malformed (for the validator to handle)
+        """
+        content = self.complete(prompt)
+        try:
+            return json.loads(content)
+        except json.JSONDecodeError:
+            print("[DEBUG] Mock LLM returned malformed JSON")
+            return content
+
+    def complete(self, prompt: str) -> str:
+        """Sleep for the sampled latency and return the response text; raises MockLLMError on simulated errors"""
+        with self._lock:
+            failed = self._rng.random() < self.settings["error_rate"]
+            malformed = self._rng.random() < self.settings["malformed_json_rate"]
+            completion_tokens = max(50, int(self._sample_normal(self.settings["completion_tokens"])))
+            latency = self._sample_latency()
+            seed = self._rng.random()
+
+        prompt_tokens = math.ceil(len(prompt) / CHARS_PER_TOKEN)
+        latency += (prompt_tokens * self.settings["seconds_per_prompt_token"]
+                    + completion_tokens * self.settings["seconds_per_completion_token"])
+        time.sleep(latency)
+
+        if failed:
+            raise MockLLMError(f"Mock LLM simulated failure after {latency:.2f}s")
+
+        content = json.dumps(build_mock_analysis(prompt, completion_tokens, seed))
+        if malformed:
+            content = _malform(content, seed)
+        return content
+
+    def _sample_normal(self, spec: Dict[str, float]) -> float:
+        return self._rng.gauss(float(spec.get("mean", 0)), float(spec.get("stddev", 0)))
+
+    def _sample_latency(self) -> float:
+        spec = self.settings["latency"]
+        mean, stddev = float(spec["mean_seconds"]), float(spec["stddev_seconds"])
+        distribution = spec["distribution"]
+        if distribution == "fixed":
+            value = mean
+        elif distribution == "uniform":
+            value = self._rng.uniform(mean - stddev * math.sqrt(3), mean + stddev * math.sqrt(3))
+        elif distribution == "normal":
+            value = self._rng.gauss(mean, stddev)
+        elif distribution == "lognormal":
+            # Parameters chosen so the samples have the configured mean and standard deviation
+            if mean <= 0:
+                value = 0.0
+            else:
+                sigma = math.sqrt(math.log(1 + (stddev / mean) ** 2))
+                value = self._rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+        else:
+            raise ValueError(f"Unknown mock latency distribution: {distribution}")
+        return min(float(spec["max_seconds"]), max(float(spec["min_seconds"]), value))
+
+
+def build_mock_analysis(prompt: str, completion_tokens: int = 400, seed: float = 0.5) -> Dict[str, Any]:
+    """A ResumeAnalysisResponse-valid analysis derived from the prompt, padded to about completion_tokens"""
+    job_match = _JOB_DESCRIPTION_PATTERN.search(prompt)
+    resume_match = _RESUME_PATTERN.search(prompt)
+    resume_text = resume_match.group(1) if resume_match else ""
+    first_line = next((line.strip() for line in resume_text.splitlines() if line.strip()), "")
+    email_match = _EMAIL_PATTERN.search(resume_text)
+    skills = [skill for skill in _SKILL_WORDS if skill.lower() in resume_text.lower()] or ["Communication"]
+
+    fit_score = 1 + int(seed * 10) % 10
+    analysis = {
+        "job_description": job_match.group(1).strip() if job_match else "",
+        "full_name": first_line[:80] or "Unknown",
+        "email": email_match.group(0) if email_match else "",
+        "phone_number": "",
+        "total_experience_years": int(seed * 15),
+        "roles": [{
+            "title": "Software Engineer",
+            "company": "Unknown",
+            "duration": "Unknown",
+            "start_date": "Unknown",
+            "end_date": "Present"
+        }],
+        "work_experience_raw": "Mock analysis: experience summarized from the resume text.",
+        "skills": {skill: {"source": "Skills section", "years": "Unknown"} for skill in skills},
+        "projects": [],
+        "leadership_signals": seed > 0.5,
+        "leadership_justification": "Mock leadership assessment",
+        "candidate_fit_summary": "Mock analysis generated offline by the mock LLM provider.",
+        "fit_score": fit_score,
+        "fit_score_reason": f"Mock score {fit_score}/10",
+        "eligibility_status": "Eligible" if fit_score >= 5 else "Not Eligible",
+        "eligibility_reason": "Mock eligibility derived from the fit score"
+    }
+
+    # Pad with projects until the response reaches the requested size
+    target_chars = completion_tokens * CHARS_PER_TOKEN
+    size = len(json.dumps(analysis))
+    index = 0
+    while size < target_chars:
+        project = {
+            "name": f"Project {index + 1}",
+            "tech_stack": ", ".join(skills[:3]),
+            "description": "Mock project description relevant to the job requirements. " * 2
+        }
+        analysis["projects"].append(project)
+        size += len(json.dumps(project)) + 2
+        index += 1
+    return analysis
+
+
+def _malform(content: str, seed: float) -> str:
+    """Corrupt a JSON response the way real LLMs do"""
+    variant = int(seed * 1000) % 3
+    if variant == 0:
+        # Truncated mid-object (hit the token limit)
+        return content[:max(1, len(content) // 2)]
+    if variant == 1:
+        # Prose around the JSON
+        return f"Here is the analysis you asked for:\n{content}\nLet me know if you need anything else."
+    # Single quotes and a trailing comma
+    return content.replace('"', "'").rstrip("}") + ",}"
+
+
+def _merge_settings(overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Overlay settings onto the mock_llm defaults, one level deep"""
+    defaults = DEFAULT_PROCESSING_CONFIG["mock_llm"]
+    settings = {**defaults, **(overrides or {})}
+    for key in ("latency", "completion_tokens"):
+        settings[key] = {**defaults[key], **(overrides or {}).get(key, {})}
+    return settings
+
+
+_providers: Dict[str, MockProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_mock_provider(model: str) -> MockProvider:
+    """Shared provider per model, so the random stream and settings persist across requests"""
+    with _providers_lock:
+        if model not in _providers:
+            _providers[model] = MockProvider(model)
+        return _providers[model]
@@ -12,7 +12,7 @@ from .base_provider import BaseLLMProvider
 class LLMAutomation:
     def __init__(self, config_path: str = None):
         """Initialize LLM automation with optional config file path"""
-        self.config_path = config_path or os.path.join(
+        self.config_path = config_path or os.getenv("LLM_CONFIG_PATH") or os.path.join(
             os.path.dirname(__file__), "..", "..", "..", "configs", "llm_config.json"
         )
         self.current_config = self.load_config()
@@ -24,9 +24,10 @@ class LLMAutomation:
         
         default_urls = {
             "ollama": ollama_base_url,  # Use environment variable or default
-            "openrouter": "https://openrouter.ai/api/v1/chat/completions",
+            "openrouter": os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1/chat/completions"),
             "openai": "https://api.openai.com/v1/chat/completions",
-            "anthropic": "https://api.anthropic.com/v1/messages"
+            "anthropic": "https://api.anthropic.com/v1/messages",
+            "mock": ""  # Offline, no endpoint
         }
         
         return default_urls.get(provider, ollama_base_url)
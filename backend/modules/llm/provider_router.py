@@ -1,11 +1,14 @@
 from .handlers.openrouter_handler import OpenRouterProvider
 from .handlers.ollama_handler import OllamaProvider
+from .handlers.mock_handler import MockProvider
 from .base_provider import BaseLLMProvider
 
 # Registry of supported providers
 PROVIDER_REGISTRY = {
     "openrouter": OpenRouterProvider,
-    "ollama": OllamaProvider
+    "ollama": OllamaProvider,
+    # Offline provider for load tests (see handlers/mock_handler.py)
+    "mock": MockProvider
 }
 
 def get_provider(provider_name: str, model: str, api_key: str | None = None) -> BaseLLMProvider:
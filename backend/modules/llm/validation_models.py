@@ -4,7 +4,6 @@ Pydantic AI validation models for LLM response validation
 
 from pydantic import BaseModel, Field, validator
 from typing import List, Dict, Optional, Any
-from pydantic_ai import Agent, RunContext
 from enum import Enum
 
 
@@ -112,11 +111,16 @@ class ValidationResult(BaseModel):
 # Pydantic AI Agent factory for structured extraction
 def create_resume_analysis_agent(provider="openrouter", model="anthropic/claude-3.5-sonnet"):
     """Create a Pydantic AI agent configured for the current LLM provider"""
+    # Imported here: pydantic_ai is only needed when a response fails validation
+    from pydantic_ai import Agent
+
     # Map provider to Pydantic AI format
     if provider == "openrouter":
         model_string = f"openai:{model}"  # OpenRouter uses OpenAI-compatible API
     elif provider == "ollama":
         model_string = f"ollama:{model}"
+    elif provider == "mock":
+        model_string = "test"  # Pydantic AI's offline TestModel, so fallbacks stay offline too
     else:
         model_string = f"openai:{model}"  # Default fallback
 
@@ -1,16 +1,14 @@
 import requests
 import json
 import os
+import hashlib
 from dotenv import load_dotenv
 
 load_dotenv()
 api_key = os.getenv("MISTRAL_API_KEY")
 
-def call_mistral_resume_analyzer(resume_text,job_description,api_key):
-    # Example job description for filtering
-    # job_description = job_description
-
-    prompt = f"""
+# Resume analysis prompt; {job_description} and {resume_text} are filled in per call
+RESUME_ANALYSIS_PROMPT_TEMPLATE = """
 You are an expert AI assistant for technical recruitment. Your task is to judge a candidate's resume **only in relation to the Job Description (JD)**. The JD is the SINGLE SOURCE OF TRUTH. Do not reward unrelated experience. Be strict, practical, and industry-aware (no keyword gaming).
 
 Return **ONLY a valid JSON object** that conforms EXACTLY to the structure shown below—no extra keys, no markdown, no comments, no code fences.
@@ -102,23 +100,83 @@ STRICT RULES:
 - Keep explanations concise and practical.
 """
 
+# Changes whenever the prompt text changes, so cached analyses made with an older prompt are not reused
+PROMPT_VERSION = hashlib.sha256(RESUME_ANALYSIS_PROMPT_TEMPLATE.encode("utf-8")).hexdigest()[:12]
+
+
+OPENROUTER_CHAT_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+
+def get_llm_config_path():
+    """Path of the central LLM config; LLM_CONFIG_PATH overrides it (e.g. for benchmarks)"""
+    return os.getenv("LLM_CONFIG_PATH") or os.path.abspath(
+        os.path.join(os.path.dirname(__file__), '../../../configs/llm_config.json')
+    )
+
+
+def load_llm_config():
+    """Load the central configs/llm_config.json used for resume analysis"""
+    config_path = get_llm_config_path()
+    with open(config_path, 'r') as f:
+        return json.load(f)
+
+
+def warm_up_llm(keep_alive="30m", timeout=300):
+    """
+    Make the configured provider ready for the first resume.
+    Ollama gets a one-token generation with keep_alive, which loads the model into memory and keeps it there;
+    hosted providers have nothing to load and the mock provider needs nothing, so they are skipped.
+    """
+    llm_config = load_llm_config()
+    provider = llm_config.get('provider', 'openrouter')
+    model = llm_config.get('model')
+    if provider != 'ollama':
+        return {"provider": provider, "model": model, "action": "skipped"}
+
+    base_url = llm_config.get('base_url') or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
+    response = requests.post(
+        f"{base_url.rstrip('/')}/api/generate",
+        json={
+            "model": model,
+            "prompt": "Reply with OK.",
+            "stream": False,
+            "keep_alive": keep_alive,
+            "options": {"num_predict": 1}
+        },
+        timeout=timeout
+    )
+    if response.status_code != 200:
+        raise RuntimeError(f"Ollama warm-up failed with {response.status_code}: {response.text[:200]}")
+    return {"provider": provider, "model": model, "action": "generated", "keep_alive": keep_alive}
+
+
+def call_mistral_resume_analyzer(resume_text,job_description,api_key):
+    # Example job description for filtering
+    # job_description = job_description
+
+    prompt = RESUME_ANALYSIS_PROMPT_TEMPLATE.format(job_description=job_description, resume_text=resume_text)
+
     # Dynamically load API key from llm_config.json
     # Always use the central configs/llm_config.json
-    config_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../../configs/llm_config.json'))
     try:
-        with open(config_path, 'r') as f:
-            llm_config = json.load(f)
-            provider = llm_config.get('provider', 'openrouter')
-            api_key = llm_config.get('api_key')
-            model = llm_config.get('model')
-            base_url = llm_config.get('base_url')
-            # Only require api_key if provider is not ollama
-            if provider != 'ollama' and not api_key:
-                raise ValueError('API key not found in llm_config.json')
+        llm_config = load_llm_config()
+        provider = llm_config.get('provider', 'openrouter')
+        api_key = llm_config.get('api_key')
+        model = llm_config.get('model')
+        base_url = llm_config.get('base_url')
+        # Only require api_key for hosted providers
+        if provider not in ('ollama', 'mock') and not api_key:
+            raise ValueError('API key not found in llm_config.json')
     except Exception as e:
         raise RuntimeError(f'Error loading llm_config.json: {e}')
 
     # Use config values for provider/model/base_url
+    if provider == 'mock':
+        # Offline provider for load tests: no network call; latency and failures come from
+        # the mock_llm section of the processing config. Malformed output is returned as raw text.
+        from backend.modules.llm.handlers.mock_handler import get_mock_provider
+        return get_mock_provider(model or "mock-analyzer").analyze(prompt)
+
     if provider == 'ollama':
         # Default Ollama base URL if not set
         if not base_url:
@@ -243,7 +301,11 @@ STRICT RULES:
             ]
         }
         try:
-            response = requests.post("https://openrouter.ai/api/v1/chat/completions", headers=headers, json=data, timeout=120)
+            # base_url is stored as the full chat-completions URL for OpenRouter
+            url = (base_url or os.getenv("OPENROUTER_BASE_URL", OPENROUTER_CHAT_URL)).rstrip('/')
+            if not url.endswith("/chat/completions"):
+                url = f"{url}/chat/completions"
+            response = requests.post(url, headers=headers, json=data, timeout=120)
         except requests.exceptions.Timeout:
             print("[ERROR] OpenRouter API request timed out after 120 seconds")
             return {"fit_score": 1, "fit_score_reason": "OpenRouter API timeout - unable to analyze resume", "eligibility_status": "Not Eligible", "eligibility_reason": "System timeout prevented resume analysis", "work_experience_raw": "Could not extract work experience due to timeout"}
@@ -0,0 +1,2 @@
+# Metrics module for RULE
+# Per-stage timings and Prometheus-format metrics for resume processing
@@ -0,0 +1,40 @@
+"""
+Process memory for RULE
+Resident set size of the API process and of its worker processes (CPU pool), read from /proc
+"""
+
+import glob
+import os
+import resource
+from typing import List, Optional
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def resident_memory_bytes(pid: str = "self") -> Optional[int]:
+    """Current RSS of a process, or None when it cannot be read"""
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        if pid != "self":
+            return None
+        # No procfs (e.g. macOS): fall back to the peak RSS, which ru_maxrss reports in bytes there
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def child_pids() -> List[str]:
+    """Direct children of this process (CPU pool workers)"""
+    pids = []
+    for path in glob.glob("/proc/self/task/*/children"):
+        try:
+            with open(path, "r") as f:
+                pids.extend(f.read().split())
+        except OSError:
+            continue
+    return pids
+
+
+def children_resident_memory_bytes() -> int:
+    """Summed RSS of the child processes; 0 without procfs"""
+    return sum(resident_memory_bytes(pid) or 0 for pid in child_pids())
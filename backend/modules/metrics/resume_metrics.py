@@ -0,0 +1,81 @@
+"""
+Resume processing metrics for RULE
+Histograms and counters for every processing stage, broken down by extraction path,
+LLM provider/model and outcome
+"""
+
+from .registry import metrics_registry
+from .timing import ResumeTrace
+
+STAGE_DURATION = metrics_registry.histogram(
+    "rule_stage_duration_seconds",
+    "Time spent in one processing stage of a resume",
+    ["stage", "path"]
+)
+RESUME_DURATION = metrics_registry.histogram(
+    "rule_resume_duration_seconds",
+    "End-to-end processing time of a resume, including queueing",
+    ["path", "outcome"]
+)
+RESUMES_PROCESSED = metrics_registry.counter(
+    "rule_resumes_processed_total",
+    "Resumes processed",
+    ["path", "outcome"]
+)
+LLM_REQUEST_DURATION = metrics_registry.histogram(
+    "rule_llm_request_duration_seconds",
+    "Round trip of one resume analysis LLM request",
+    ["provider", "model", "outcome"]
+)
+VALIDATIONS = metrics_registry.counter(
+    "rule_llm_validations_total",
+    "LLM responses validated, by whether a fallback response had to be used",
+    ["provider", "model", "outcome"]
+)
+CACHE_LOOKUPS = metrics_registry.counter(
+    "rule_cache_lookups_total",
+    "Result and text cache lookups",
+    ["cache", "result"]
+)
+QUEUE_DEPTH = metrics_registry.gauge(
+    "rule_pipeline_queue_depth",
+    "Resumes waiting in front of a pipeline stage",
+    ["stage", "priority"]
+)
+ADMITTED_RESUMES = metrics_registry.gauge(
+    "rule_admitted_resumes",
+    "Admitted, unfinished resumes by admission class",
+    ["kind"]
+)
+PROCESS_RSS = metrics_registry.gauge(
+    "process_resident_memory_bytes",
+    "Resident memory of the API process"
+)
+WORKER_RSS = metrics_registry.gauge(
+    "rule_worker_resident_memory_bytes",
+    "Summed resident memory of the worker (CPU pool) processes"
+)
+ADMITTED_BYTES = metrics_registry.gauge(
+    "rule_admitted_upload_bytes",
+    "Bytes of admitted uploads not yet processed"
+)
+OCR_PAGE_CONFIDENCE = metrics_registry.histogram(
+    "rule_ocr_page_confidence",
+    "Mean Tesseract word confidence (0-100) of OCR'd pages, by the DPI their text was taken from",
+    ["dpi"],
+    buckets=(30, 50, 60, 70, 75, 80, 85, 90, 95, 100)
+)
+
+
+def record_resume(trace: ResumeTrace):
+    """Observe the stage timings and outcome of a finished resume (once per trace)"""
+    if trace.recorded:
+        return
+    trace.recorded = True
+    for stage, seconds in trace.timings.items():
+        STAGE_DURATION.observe(seconds, stage=stage, path=trace.path)
+    RESUME_DURATION.observe(trace.total_seconds(), path=trace.path, outcome=trace.outcome)
+    RESUMES_PROCESSED.inc(path=trace.path, outcome=trace.outcome)
+    for page in trace.ocr_pages:
+        if page.get("confidence") is not None:
+            OCR_PAGE_CONFIDENCE.observe(page["confidence"], dpi=str(page["dpi"]))
@@ -0,0 +1,52 @@
+"""
+Stage timing for RULE
+Lightweight helpers to time processing stages; safe to use inside CPU pool worker processes,
+which return their timings to the parent as plain dicts
+"""
+
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@contextmanager
+def timed(timings: Optional[Dict[str, float]], stage: str):
+    """Add the duration of the with-block to timings[stage] (a no-op when timings is None)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if timings is not None:
+            timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+@dataclass
+class ResumeTrace:
+    """Stage timings, extraction path and outcome of one resume, reported as stage_timings on results"""
+    timings: Dict[str, float] = field(default_factory=dict)
+    # "native", "ocr" or "cached" (result cache hit)
+    path: str = "unknown"
+    # "success", "fallback" (LLM output failed validation), "cache_hit", "failed" or "cancelled"
+    outcome: str = "unknown"
+    started_at: float = field(default_factory=time.perf_counter)
+    recorded: bool = False
+    # {"page", "dpi", "confidence"} of each OCR'd page, when the resume needed OCR
+    ocr_pages: List[Dict[str, Any]] = field(default_factory=list)
+
+    def measure(self, stage: str):
+        return timed(self.timings, stage)
+
+    def add(self, timings: Optional[Dict[str, float]]):
+        """Merge timings measured elsewhere (e.g. in a worker process)"""
+        for stage, seconds in (timings or {}).items():
+            self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+
+    def total_seconds(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def stage_timings(self) -> Dict[str, float]:
+        """Timings in seconds, rounded for inclusion in results"""
+        timings = {stage: round(seconds, 4) for stage, seconds in self.timings.items()}
+        timings["total"] = round(self.total_seconds(), 4)
+        return timings
@@ -0,0 +1,2 @@
+# Processing module for RULE
+# Background batch jobs and resume processing orchestration
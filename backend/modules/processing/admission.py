@@ -0,0 +1,183 @@
+"""
+Admission control for RULE
+Bounds how much work the backend accepts: resumes in flight on the synchronous upload endpoints,
+resumes queued in background batch jobs, and bytes of uploads not yet processed.
+Rejections carry a Retry-After estimated from recent per-resume latency.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Dict, List
+
+from backend.modules.metrics.registry import metrics_registry
+from .config import processing_config
+
+ADMISSION_REJECTIONS = metrics_registry.counter(
+    "rule_admission_rejections_total",
+    "Upload requests refused by admission control",
+    ["kind", "status"]
+)
+
+
+class AdmissionRejected(Exception):
+    """Raised when accepting a request would exceed an admission limit"""
+
+    def __init__(self, message: str, retry_after: int = None, status_code: int = 429):
+        super().__init__(message)
+        self.message = message
+        self.retry_after = retry_after
+        self.status_code = status_code
+
+
+@dataclass
+class AdmissionSlot:
+    """One admitted resume; release it exactly once when the resume is finished"""
+    size: int
+    background: bool
+    admitted_at: float = field(default_factory=time.monotonic)
+    # Slots re-admitted after a restart are not timed, their latency spans the downtime
+    timed: bool = True
+    released: bool = False
+
+
+class AdmissionController:
+    """Counts admitted, unfinished resumes per class and rejects work beyond the configured limits"""
+
+    def __init__(self, max_in_flight_resumes: int = 64, max_queued_resumes: int = 2000,
+                 max_upload_bytes: int = 512 * 1024 * 1024, default_retry_after_seconds: int = 5,
+                 max_retry_after_seconds: int = 300, latency_window: int = 50,
+                 max_resumes_per_request: int = 0):
+        # A limit of 0 disables that check
+        self.max_in_flight_resumes = max_in_flight_resumes
+        self.max_queued_resumes = max_queued_resumes
+        self.max_upload_bytes = max_upload_bytes
+        self.max_resumes_per_request = max_resumes_per_request
+        self.default_retry_after_seconds = default_retry_after_seconds
+        self.max_retry_after_seconds = max_retry_after_seconds
+        # Indexed by background flag: False = in flight (synchronous endpoints), True = queued (batch jobs)
+        self._counts = {False: 0, True: 0}
+        self._latencies = {False: deque(maxlen=latency_window), True: deque(maxlen=latency_window)}
+        self._bytes = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "AdmissionController":
+        admission_config = config.get("admission", {})
+        return cls(
+            max_in_flight_resumes=int(admission_config.get("max_in_flight_resumes", 64)),
+            max_queued_resumes=int(admission_config.get("max_queued_resumes", 2000)),
+            max_upload_bytes=int(admission_config.get("max_upload_bytes", 512 * 1024 * 1024)),
+            default_retry_after_seconds=int(admission_config.get("default_retry_after_seconds", 5)),
+            max_retry_after_seconds=int(admission_config.get("max_retry_after_seconds", 300)),
+            latency_window=int(admission_config.get("latency_window", 50)),
+            max_resumes_per_request=int(admission_config.get("max_resumes_per_request", 0))
+        )
+
+    def _limit(self, background: bool) -> int:
+        return self.max_queued_resumes if background else self.max_in_flight_resumes
+
+    def admit(self, sizes: List[int], background: bool = False, force: bool = False) -> List[AdmissionSlot]:
+        """
+        Admit one resume per entry of sizes (upload size in bytes).
+        A request larger than a limit on its own is admitted once nothing else holds that limit,
+        so existing clients sending big batches are throttled rather than refused.
+
+        Args:
+            sizes: Size of each resume to admit
+            background: True for background batch jobs, False for synchronous endpoints
+            force: Admit regardless of the limits (batches resumed after a restart)
+
+        Returns:
+            One AdmissionSlot per resume
+
+        Raises:
+            AdmissionRejected: 413 when the request exceeds max_resumes_per_request, 429 when the backend is busy
+        """
+        count, total_bytes = len(sizes), sum(sizes)
+        limit = self._limit(background)
+        kind = "queued" if background else "in-flight"
+
+        if not force and self.max_resumes_per_request and count > self.max_resumes_per_request:
+            ADMISSION_REJECTIONS.inc(kind=kind, status="413")
+            raise AdmissionRejected(
+                f"Too many resumes in one request ({count}); at most {self.max_resumes_per_request} are accepted",
+                status_code=413
+            )
+
+        with self._lock:
+            if not force:
+                # Requests count at most the whole limit, so an oversized one needs the limit to itself
+                excess = self._counts[background] + min(count, limit) - limit if limit else 0
+                excess_bytes = (self._bytes + min(total_bytes, self.max_upload_bytes) - self.max_upload_bytes
+                                if self.max_upload_bytes else 0)
+                if excess > 0 or excess_bytes > 0:
+                    self._rejected += 1
+                    ADMISSION_REJECTIONS.inc(kind=kind, status="429")
+                    if excess_bytes > 0:
+                        # Express the byte overshoot in resumes of the current average size
+                        admitted = self._counts[False] + self._counts[True]
+                        average_size = self._bytes / admitted if admitted else total_bytes / max(1, count)
+                        excess = max(excess, math.ceil(excess_bytes / max(1.0, average_size)))
+                    raise AdmissionRejected(
+                        f"Server busy: too many {kind} resumes or upload bytes, retry later",
+                        retry_after=self._retry_after(background, excess)
+                    )
+            self._counts[background] += count
+            self._bytes += total_bytes
+
+        return [AdmissionSlot(size=size, background=background, timed=not force) for size in sizes]
+
+    def release(self, slot: AdmissionSlot):
+        """Return an admitted resume's capacity and record its latency"""
+        with self._lock:
+            if slot.released:
+                return
+            slot.released = True
+            self._counts[slot.background] -= 1
+            self._bytes -= slot.size
+            if slot.timed:
+                self._latencies[slot.background].append(time.monotonic() - slot.admitted_at)
+
+    def _retry_after(self, background: bool, excess: int) -> int:
+        """
+        Seconds until roughly `excess` resumes of this class have finished.
+        By Little's law the class completes about outstanding / average_latency resumes per second.
+        Must be called with the lock held.
+        """
+        samples = self._latencies[background]
+        outstanding = self._counts[background]
+        if not samples or outstanding <= 0:
+            return self.default_retry_after_seconds
+
+        average_latency = sum(samples) / len(samples)
+        throughput = outstanding / max(average_latency, 1e-3)
+        return int(min(self.max_retry_after_seconds, max(1, math.ceil(excess / throughput))))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "in_flight_resumes": self._counts[False],
+                "queued_resumes": self._counts[True],
+                "upload_bytes": self._bytes,
+                "rejected_requests": self._rejected,
+                "limits": {
+                    "max_in_flight_resumes": self.max_in_flight_resumes,
+                    "max_queued_resumes": self.max_queued_resumes,
+                    "max_upload_bytes": self.max_upload_bytes,
+                    "max_resumes_per_request": self.max_resumes_per_request
+                },
+                "average_latency_seconds": {
+                    "in_flight": round(sum(self._latencies[False]) / len(self._latencies[False]), 3)
+                    if self._latencies[False] else None,
+                    "queued": round(sum(self._latencies[True]) / len(self._latencies[True]), 3)
+                    if self._latencies[True] else None
+                }
+            }
+
+
+# Global admission controller shared by the upload endpoints and batch jobs
+admission_controller = AdmissionController.from_config(processing_config)
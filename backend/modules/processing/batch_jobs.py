@@ -0,0 +1,320 @@
+"""
+Batch Job Manager for RULE
+Runs batch resume analysis on the staged pipeline in the background and tracks per-file progress,
+either for uploaded PDFs or for stored resumes re-scored against a new job description.
+Batches are persisted in the batch store and resumed after a restart.
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+from uuid import uuid4
+
+from .admission import AdmissionController, AdmissionSlot, admission_controller
+from .batch_store import BatchStore, batch_store
+from .models import BatchJob, BatchFile, BatchKind, BatchStatus, FileStatus, Priority
+from .uploads import UploadedPdf
+from backend.modules.job_descriptions.store import get_job_description_id
+
+# Pipeline stage name -> file status shown to pollers
+_STAGE_STATUS = {
+    "extracting": FileStatus.EXTRACTING,
+    "scoring": FileStatus.SCORING,
+}
+
+
+class BatchJobManager:
+    """Accepts batches of spooled resume files and processes them in the background"""
+
+    def __init__(self, store: BatchStore, admission: AdmissionController):
+        self._store = store
+        self._admission = admission
+        # file_id -> admission slot, released when the file finishes
+        self._slots: Dict[str, AdmissionSlot] = {}
+        self._jobs: Dict[str, BatchJob] = {}
+        self._results: Dict[str, List[dict]] = {}
+        # batch_id -> file_id -> BatchFile, and unfinished file counts, so callbacks stay O(1)
+        # even for batches of thousands of files
+        self._files: Dict[str, Dict[str, BatchFile]] = {}
+        self._remaining: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def submit_batch(self, files: List[UploadedPdf], job_description: str,
+                     rejected_files: Optional[List[dict]] = None,
+                     slots: Optional[List[AdmissionSlot]] = None) -> BatchJob:
+        """
+        Register a batch and queue its files on the staged pipeline
+
+        Args:
+            files: Uploaded PDFs; they are moved into the batch store, which owns them from then on
+            job_description: Job description every file is scored against
+            rejected_files: Files refused at upload time, reported with the batch
+            slots: Admission slots of the files, released as each file finishes
+
+        Returns:
+            The newly created BatchJob
+        """
+        job = BatchJob(
+            batch_id=str(uuid4()),
+            job_description=job_description,
+            job_description_id=get_job_description_id(job_description),
+            files=[
+                BatchFile(file_id=str(uuid4()), filename=upload.filename, resume_id=str(uuid4()))
+                for upload in files
+            ],
+            rejected_files=rejected_files or []
+        )
+        # Persisted before anything is queued so a restart can always pick the batch up
+        self._store.create(job, files)
+        if slots:
+            with self._lock:
+                self._slots.update((f.file_id, slot) for f, slot in zip(job.files, slots))
+        self._register(job)
+
+        for batch_file in job.files:
+            self._queue_file(job, batch_file)
+
+        print(f"[BATCH] Queued batch {job.batch_id} with {len(job.files)} files")
+        return job
+
+    def submit_rescore(self, resume_ids: Optional[List[str]], job_description: str) -> BatchJob:
+        """
+        Re-score stored resumes against a job description without re-uploading them
+
+        Each stored result is located by resume id and its text is taken by document hash from the
+        text cache, or else from the text saved with the results, so only the LLM scoring runs
+        (bounded by the pipeline's score workers). Ids whose text is in neither are rejected.
+        Every re-scored resume gets a new resume_id; the original result is left untouched.
+
+        Args:
+            resume_ids: Results to re-score; None re-scores every stored result
+            job_description: Job description to score against
+
+        Returns:
+            The newly created BatchJob
+        """
+        from backend.modules.cache.text_cache import text_cache
+        from backend.pipelines.analyze_resume import load_stored_result, load_stored_text, list_stored_resume_ids
+
+        if resume_ids is None:
+            resume_ids = list_stored_resume_ids()
+
+        files, rejected_files = [], []
+        # document hash -> resume id it is re-scored from
+        seen_documents = {}
+        for resume_id in resume_ids:
+            stored = load_stored_result(resume_id)
+            if stored is None:
+                rejected_files.append({"filename": None, "error": "Resume analysis not found", "resume_id": resume_id})
+                continue
+            document_hash = stored.get("document_hash")
+            if not document_hash:
+                rejected_files.append({
+                    "filename": stored.get("filename"),
+                    "error": "No document hash recorded for this result; re-upload the PDF to re-score it",
+                    "resume_id": resume_id
+                })
+                continue
+            if text_cache.lookup(document_hash) is None and load_stored_text(document_hash) is None:
+                rejected_files.append({
+                    "filename": stored.get("filename"),
+                    "error": "Extracted text of this resume is no longer stored; re-upload the PDF to re-score it",
+                    "resume_id": resume_id
+                })
+                continue
+            # Several results may come from the same PDF; score each document once
+            if document_hash in seen_documents:
+                rejected_files.append({
+                    "filename": stored.get("filename"),
+                    "error": f"Same document as resume {seen_documents[document_hash]}, which is re-scored instead",
+                    "resume_id": resume_id,
+                    "source_resume_id": seen_documents[document_hash]
+                })
+                continue
+            seen_documents[document_hash] = resume_id
+            files.append(BatchFile(
+                file_id=str(uuid4()),
+                filename=stored.get("filename") or resume_id,
+                resume_id=str(uuid4()),
+                source_resume_id=resume_id,
+                document_hash=document_hash
+            ))
+
+        job = BatchJob(
+            batch_id=str(uuid4()),
+            kind=BatchKind.RESCORE,
+            job_description=job_description,
+            job_description_id=get_job_description_id(job_description),
+            files=files,
+            rejected_files=rejected_files
+        )
+        self._store.create(job, [])
+        self._register(job)
+
+        for batch_file in job.files:
+            self._queue_file(job, batch_file)
+
+        print(f"[BATCH] Queued re-score {job.batch_id} of {len(job.files)} resumes "
+              f"against job description {job.job_description_id}")
+        return job
+
+    def recover(self) -> int:
+        """
+        Reload persisted batches after a restart and re-queue their unfinished files.
+        Files already done or failed are never processed (or billed) again; files that were
+        mid-scoring hit the result cache if their LLM call had completed.
+
+        Returns:
+            Number of batches resumed
+        """
+        resumed = 0
+        for job, summaries in self._store.load_all():
+            if job.status == BatchStatus.COMPLETED:
+                with self._lock:
+                    self._jobs[job.batch_id] = job
+                continue
+
+            unfinished = [f for f in job.files if f.status not in (FileStatus.DONE, FileStatus.FAILED)]
+            for batch_file in unfinished:
+                batch_file.status = FileStatus.PENDING
+            # Resumed work counts against the queue limit, but is never refused
+            slots = self._admission.admit(
+                [self._store.stored_size(job.batch_id, f.file_id) for f in unfinished],
+                background=True, force=True
+            )
+            with self._lock:
+                self._slots.update((f.file_id, slot) for f, slot in zip(unfinished, slots))
+            self._register(job, summaries, len(unfinished))
+            for batch_file in unfinished:
+                self._queue_file(job, batch_file)
+
+            resumed += 1
+            print(f"[BATCH] Resumed batch {job.batch_id}: {len(unfinished)} of {len(job.files)} files left")
+        return resumed
+
+    def _register(self, job: BatchJob, summaries: Optional[List[dict]] = None, remaining: Optional[int] = None):
+        remaining = len(job.files) if remaining is None else remaining
+        with self._lock:
+            self._jobs[job.batch_id] = job
+            self._results[job.batch_id] = list(summaries or [])
+            self._files[job.batch_id] = {f.file_id: f for f in job.files}
+            self._remaining[job.batch_id] = remaining
+
+        if remaining == 0:
+            self._finish_batch(job)
+
+    def _queue_file(self, job: BatchJob, batch_file: BatchFile):
+        """Submit one file of a batch to the staged pipeline"""
+        # Imported lazily so the manager can be constructed without loading the pipeline
+        from backend.pipelines.staged_pipeline import PipelineItem, staged_pipeline
+
+        if job.kind == BatchKind.RESCORE:
+            item_fields = {"document_hash": batch_file.document_hash, "priority": Priority.BACKGROUND}
+        else:
+            # The stored PDF is kept until the file is done so a restart mid-scoring can retry it
+            item_fields = {
+                "pdf_path": self._store.file_path(job.batch_id, batch_file.file_id),
+                "delete_after_extract": False,
+                "priority": Priority.BATCH
+            }
+
+        item = PipelineItem(
+            resume_id=batch_file.resume_id,
+            filename=batch_file.filename,
+            job_description=job.job_description,
+            # Files of one batch share a flow, so batches take turns instead of draining one by one
+            flow=job.batch_id,
+            on_state=lambda _item, stage, b=job.batch_id, f=batch_file.file_id: self._on_stage(b, f, stage),
+            **item_fields
+        )
+        future = staged_pipeline.submit(item)
+        future.add_done_callback(
+            lambda fut, b=job.batch_id, f=batch_file.file_id: self._on_file_done(b, f, fut.result())
+        )
+
+    def get_job(self, batch_id: str) -> Optional[BatchJob]:
+        """Return a snapshot of the batch job, or None if unknown"""
+        with self._lock:
+            job = self._jobs.get(batch_id)
+            return job.copy(deep=True) if job else None
+
+    def list_jobs(self) -> List[BatchJob]:
+        """Return snapshots of all known batch jobs, newest first"""
+        with self._lock:
+            jobs = [job.copy(deep=True) for job in self._jobs.values()]
+        return sorted(jobs, key=lambda j: j.created_at, reverse=True)
+
+    def _on_stage(self, batch_id: str, file_id: str, stage: str):
+        """Pipeline callback: a file entered extraction or scoring"""
+        with self._lock:
+            job = self._jobs[batch_id]
+            batch_file = self._files[batch_id][file_id]
+            batch_file.status = _STAGE_STATUS.get(stage, batch_file.status)
+            if batch_file.started_at is None:
+                batch_file.started_at = datetime.now()
+            job.status = BatchStatus.RUNNING
+            status = batch_file.status
+
+        self._store.record(batch_id, file_id, status)
+
+    def _on_file_done(self, batch_id: str, file_id: str, result: dict):
+        """Pipeline callback: record the outcome of one file"""
+        from backend.pipelines.analyze_resume import summarize_result
+
+        with self._lock:
+            job = self._jobs[batch_id]
+            batch_file = self._files[batch_id][file_id]
+            batch_file.finished_at = datetime.now()
+            if result.get("success", False):
+                batch_file.status = FileStatus.DONE
+                batch_file.fit_score = result.get("fit_score", 0)
+                # Keep only the fields needed for ranking; full results live in outputs/
+                summary = summarize_result(result)
+                self._results[batch_id].append(summary)
+                event = {"fit_score": batch_file.fit_score, "summary": summary}
+            else:
+                batch_file.status = FileStatus.FAILED
+                batch_file.error = result.get("error", "Processing failed")
+                event = {"error": batch_file.error}
+            status = batch_file.status
+
+            self._remaining[batch_id] -= 1
+            all_finished = self._remaining[batch_id] == 0
+            slot = self._slots.pop(file_id, None)
+
+        if slot:
+            self._admission.release(slot)
+
+        # Journaled before the PDF is removed: a file is never left both unfinished and without input
+        self._store.record(batch_id, file_id, status, **event)
+        self._store.remove_file(batch_id, file_id)
+
+        if all_finished:
+            self._finish_batch(job)
+
+    def _finish_batch(self, job: BatchJob):
+        """Rank the successful results and mark the batch as completed"""
+        from backend.pipelines.analyze_resume import build_ranked_summary
+
+        with self._lock:
+            job.ranked_resumes = build_ranked_summary(self._results.pop(job.batch_id, []))
+            self._files.pop(job.batch_id, None)
+            self._remaining.pop(job.batch_id, None)
+            job.status = BatchStatus.COMPLETED
+            job.finished_at = datetime.now()
+            resume_ids = [f.resume_id for f in job.files if f.resume_id]
+
+        self._store.complete(job)
+        print(f"[BATCH] Batch {job.batch_id} completed: {job.progress()}")
+
+        try:
+            from backend.modules.analytics.engine import analytics_engine
+            batch_analytics = analytics_engine.compute_batch_analytics(job.batch_id, resume_ids)
+            batch_analytics.processing_time_seconds = (job.finished_at - job.created_at).total_seconds()
+            analytics_engine.save_batch_analytics(batch_analytics)
+        except Exception as e:
+            print(f"[WARNING] Failed to save batch analytics for {job.batch_id}: {e}")
+
+
+# Global batch job manager instance
+batch_job_manager = BatchJobManager(batch_store, admission_controller)
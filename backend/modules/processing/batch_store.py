@@ -0,0 +1,163 @@
+"""
+Batch Store for RULE
+Persists background batch jobs so they survive a backend restart: a manifest per batch,
+an append-only journal of per-file state changes, and the uploaded PDFs until each file is done
+"""
+
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Tuple
+
+from .config import processing_config
+from .models import BatchJob, FileStatus
+from .uploads import UploadedPdf
+
+
+class BatchStore:
+    """
+    On-disk layout, one directory per batch:
+        <base_dir>/<batch_id>/manifest.json   batch as created (rewritten once it completes)
+        <base_dir>/<batch_id>/journal.jsonl   one line per file state change
+        <base_dir>/<batch_id>/files/<file_id>.pdf   uploaded PDF, removed once the file is done
+    The journal keeps per-file updates O(1) instead of rewriting the manifest for every change.
+    """
+
+    def __init__(self, base_dir: str):
+        self.base_dir = base_dir
+        self._lock = threading.Lock()
+
+    def _batch_dir(self, batch_id: str) -> str:
+        return os.path.join(self.base_dir, batch_id)
+
+    def _write_manifest(self, job: BatchJob):
+        path = os.path.join(self._batch_dir(job.batch_id), "manifest.json")
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(job.json())
+        os.replace(temp_path, path)
+
+    def file_path(self, batch_id: str, file_id: str) -> str:
+        return os.path.join(self._batch_dir(batch_id), "files", f"{file_id}.pdf")
+
+    def create(self, job: BatchJob, uploads: List[UploadedPdf]):
+        """Persist a new batch and take ownership of its uploaded PDFs"""
+        os.makedirs(os.path.join(self._batch_dir(job.batch_id), "files"), exist_ok=True)
+        for batch_file, upload in zip(job.files, uploads):
+            path = self.file_path(job.batch_id, batch_file.file_id)
+            if upload.data is not None:
+                with open(path, "wb") as f:
+                    f.write(upload.data)
+            else:
+                shutil.move(upload.path, path)
+        # Written last: a manifest on disk means every file of the batch is there too
+        with self._lock:
+            self._write_manifest(job)
+
+    def record(self, batch_id: str, file_id: str, status: FileStatus, **fields: Any):
+        """Append a file state change to the batch journal"""
+        event = {"file_id": file_id, "status": status.value, "at": datetime.now().isoformat(), **fields}
+        line = json.dumps(event, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            with open(os.path.join(self._batch_dir(batch_id), "journal.jsonl"), "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def stored_size(self, batch_id: str, file_id: str) -> int:
+        """Size of a stored PDF, 0 if it is gone"""
+        try:
+            return os.path.getsize(self.file_path(batch_id, file_id))
+        except OSError:
+            return 0
+
+    def remove_file(self, batch_id: str, file_id: str):
+        """Delete the stored PDF of a finished file"""
+        try:
+            os.remove(self.file_path(batch_id, file_id))
+        except FileNotFoundError:
+            pass
+
+    def complete(self, job: BatchJob):
+        """Write the final manifest and drop the journal and any remaining PDFs"""
+        batch_dir = self._batch_dir(job.batch_id)
+        with self._lock:
+            self._write_manifest(job)
+            try:
+                os.remove(os.path.join(batch_dir, "journal.jsonl"))
+            except FileNotFoundError:
+                pass
+        shutil.rmtree(os.path.join(batch_dir, "files"), ignore_errors=True)
+
+    def load_all(self) -> List[Tuple[BatchJob, List[Dict[str, Any]]]]:
+        """
+        Load every stored batch with its journal replayed onto the manifest
+
+        Returns:
+            (job, summaries) pairs; summaries are the ranking summaries of files already done
+        """
+        loaded = []
+        if not os.path.isdir(self.base_dir):
+            return loaded
+
+        for batch_id in os.listdir(self.base_dir):
+            manifest_path = os.path.join(self._batch_dir(batch_id), "manifest.json")
+            if not os.path.exists(manifest_path):
+                continue
+            try:
+                with open(manifest_path, "r", encoding="utf-8") as f:
+                    job = BatchJob(**json.load(f))
+                summaries = self._replay(job)
+            except Exception as e:
+                print(f"[WARNING] Skipping unreadable batch {batch_id}: {e}")
+                continue
+            loaded.append((job, summaries))
+
+        return loaded
+
+    def _replay(self, job: BatchJob) -> List[Dict[str, Any]]:
+        journal_path = os.path.join(self._batch_dir(job.batch_id), "journal.jsonl")
+        summaries: Dict[str, Dict[str, Any]] = {}
+        if not os.path.exists(journal_path):
+            return []
+
+        files = {f.file_id: f for f in job.files}
+        line = ""
+        with open(journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except json.JSONDecodeError:
+                    # A torn final line from a crash mid-write
+                    continue
+                batch_file = files.get(event.get("file_id"))
+                if batch_file is None:
+                    continue
+                at = datetime.fromisoformat(event["at"])
+                batch_file.status = FileStatus(event["status"])
+                if batch_file.status in (FileStatus.EXTRACTING, FileStatus.SCORING):
+                    batch_file.started_at = batch_file.started_at or at
+                elif batch_file.status == FileStatus.DONE:
+                    batch_file.fit_score = event.get("fit_score")
+                    batch_file.finished_at = at
+                    summaries[batch_file.file_id] = event.get("summary") or {}
+                elif batch_file.status == FileStatus.FAILED:
+                    batch_file.error = event.get("error")
+                    batch_file.finished_at = at
+
+        if line and not line.endswith("\n"):
+            # End the torn line, otherwise the next event appended after the restart joins it and is lost too
+            with open(journal_path, "a", encoding="utf-8") as f:
+                f.write("\n")
+        return list(summaries.values())
+
+
+def _build_batch_store() -> BatchStore:
+    base_dir = processing_config["batch_jobs"].get("directory") or os.path.abspath(
+        os.path.join(os.path.dirname(__file__), "..", "..", "..", "batch_jobs")
+    )
+    return BatchStore(base_dir)
+
+
+# Global batch store instance
+batch_store = _build_batch_store()
@@ -0,0 +1,203 @@
+"""
+Processing configuration for RULE
+Loads worker pool sizes and processing limits from configs/processing_config.json
+"""
+
+import copy
+import json
+import os
+from typing import Any, Dict
+
+# Defaults used for any section or key missing from the config file
+DEFAULT_PROCESSING_CONFIG: Dict[str, Any] = {
+    "executors": {
+        # Process pool for CPU-bound PDF parsing and OCR (0 runs them inline)
+        "cpu_workers": 2,
+        # Thread pool for I/O-bound LLM calls
+        "io_workers": 8,
+        # multiprocessing start method for the CPU pool
+        "start_method": "spawn"
+    },
+    "pipeline": {
+        # Concurrent extractions (each one occupies a CPU pool worker)
+        "extract_workers": 2,
+        # Concurrent LLM scoring calls
+        "score_workers": 4,
+        # Concurrent result writers
+        "persist_workers": 1,
+        # Capacity of the queues between stages, per priority class
+        "queue_size": 8,
+        # Relative share of stage capacity per priority class under contention
+        "priority_weights": {
+            "interactive": 8,
+            "batch": 3,
+            "background": 1
+        }
+    },
+    "uploads": {
+        # Uploads up to this size are processed from memory; larger ones are spooled to a temp file
+        "max_in_memory_bytes": 5 * 1024 * 1024
+    },
+    "result_cache": {
+        # Reuse analyses of identical PDF + job description + provider/model + prompt version
+        "enabled": True,
+        "max_entries": 5000,
+        # Defaults to <repo>/cache/results
+        "directory": None
+    },
+    "text_cache": {
+        # Reuse extracted resume text per PDF, independent of the job description
+        "enabled": True,
+        "max_entries": 20000,
+        # Defaults to <repo>/cache/text
+        "directory": None
+    },
+    "admission": {
+        # Resumes accepted by the synchronous upload endpoints and not yet finished (0 = unlimited)
+        "max_in_flight_resumes": 64,
+        # Resumes waiting in background batch jobs
+        "max_queued_resumes": 2000,
+        # Bytes of accepted uploads not yet processed
+        "max_upload_bytes": 512 * 1024 * 1024,
+        # Resumes one request may upload; larger requests get 413 (0 = unlimited: they wait for the limits)
+        "max_resumes_per_request": 0,
+        # Retry-After bounds; the estimate comes from the last latency_window resume latencies
+        "default_retry_after_seconds": 5,
+        "max_retry_after_seconds": 300,
+        "latency_window": 50
+    },
+    "native_extraction": {
+        # Text layer extractor: "pypdfium2", "pdftotext" (poppler), "pypdf", "pdfplumber",
+        # or "auto" for the first of these that is installed
+        "backend": "auto",
+        # Used again when the text of the chosen backend looks garbled (quality below min_quality, 0..1)
+        "fallback_backend": "pdfplumber",
+        "min_quality": 0.5
+    },
+    "ocr": {
+        # OCR only the pages without a text layer and merge them with the native text of the others;
+        # false extracts any text-based PDF natively, dropping its scanned pages
+        "per_page": True,
+        # Pages with less text than this are OCR'd (blank, or a scan with a typed page number)
+        "min_page_text_length": 20,
+        "rasterize": {
+            # Render and OCR window_pages pages at a time, rendering the next window during OCR,
+            # instead of rendering the whole document first; bounds memory per document
+            "streaming": True,
+            "window_pages": 1,
+            # Render single-channel images instead of RGB (OCR converts to grayscale anyway)
+            "grayscale": True,
+            # Have poppler write pages to a temp directory and load each one only for its OCR
+            "paths_only": False
+        },
+        "parallel": {
+            # OCR the pages of a scanned PDF as separate tasks on the CPU pool (executors.cpu_workers),
+            # which every document shares, instead of one page after another in a single worker
+            "enabled": True,
+            # Pages of one document submitted to the pool at a time; 0 means cpu_workers
+            "max_pages_in_flight": 0
+        },
+        "adaptive_dpi": {
+            # OCR pages rendered at initial_dpi and render again at 300 DPI only the pages whose
+            # mean Tesseract word confidence is below min_confidence. Opt-in: it changes the OCR text,
+            # so turning it on re-extracts cached OCR text
+            "enabled": False,
+            "initial_dpi": 200,
+            "min_confidence": 80
+        },
+        "engine": {
+            # "tesserocr" keeps initialized libtesseract engines in each worker and reuses them for every page;
+            # "pytesseract" starts the tesseract binary per page. "auto" prefers tesserocr when installed
+            "backend": "auto",
+            "lang": "eng",
+            # Tesseract page segmentation mode and OCR engine mode (3 and 3 are Tesseract's defaults)
+            "psm": 3,
+            "oem": 3,
+            # Only recognize these characters; empty allows all
+            "whitelist": "",
+            # Initialized tesserocr engines per process (pages OCR'd at once in one process)
+            "pool_size": 1
+        }
+    },
+    "startup": {
+        # Load spaCy, the spell checker and OpenCV/Tesseract bindings when the API starts
+        # (in every CPU worker) instead of on the first scanned resume
+        "preload_ocr_models": False,
+        "warm_up": {
+            # Exercise each processing path once at startup, in the background
+            "enabled": False,
+            # OCR a tiny embedded page on every CPU worker (Tesseract, spaCy, spell checker)
+            "ocr": True,
+            # One-token generation so Ollama loads the model; hosted providers are skipped
+            "llm": True,
+            # How long Ollama keeps the model loaded after the warm-up request
+            "ollama_keep_alive": "30m",
+            "llm_timeout_seconds": 300,
+            # Failed steps (e.g. Ollama not up yet) are retried after this many seconds
+            "retry_interval_seconds": 30,
+            # Components /api/ready waits for before reporting ready
+            "required": ["ocr", "llm"]
+        }
+    },
+    "batch_jobs": {
+        # Batch manifests, per-file journals and uploaded PDFs; defaults to <repo>/batch_jobs
+        "directory": None
+    },
+    "mock_llm": {
+        # Behaviour of the offline "mock" LLM provider (for load tests)
+        "latency": {
+            # "fixed", "uniform", "normal" or "lognormal"
+            "distribution": "lognormal",
+            "mean_seconds": 1.5,
+            "stddev_seconds": 0.5,
+            "min_seconds": 0.0,
+            "max_seconds": 30.0
+        },
+        # Simulated generation cost added to the sampled latency
+        "seconds_per_prompt_token": 0.0,
+        "seconds_per_completion_token": 0.0,
+        # Size of the generated analysis in tokens (about 4 characters each)
+        "completion_tokens": {"mean": 400, "stddev": 100},
+        # Fraction of requests that fail like an unreachable or erroring provider
+        "error_rate": 0.0,
+        # Fraction of responses that are not valid JSON (truncated, wrapped in prose, single-quoted)
+        "malformed_json_rate": 0.0,
+        # Seed for reproducible runs; null samples differently on every start
+        "seed": None
+    }
+}
+
+
+def get_config_path() -> str:
+    """Path of the processing config, next to llm_config.json"""
+    return os.getenv("PROCESSING_CONFIG_PATH") or os.path.abspath(os.path.join(
+        os.path.dirname(__file__), "..", "..", "..", "configs", "processing_config.json"
+    ))
+
+
+def _merge(defaults: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """Recursively overlay overrides onto a copy of defaults"""
+    merged = copy.deepcopy(defaults)
+    for key, value in overrides.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _merge(merged[key], value)
+        else:
+            merged[key] = value
+    return merged
+
+
+def load_processing_config(config_path: str = None) -> Dict[str, Any]:
+    """Load processing configuration, falling back to defaults for missing values"""
+    config_path = config_path or get_config_path()
+    try:
+        if os.path.exists(config_path):
+            with open(config_path, 'r', encoding='utf-8') as f:
+                return _merge(DEFAULT_PROCESSING_CONFIG, json.load(f))
+    except Exception as e:
+        print(f"[⚠️ Processing Config Load Error] {e}")
+
+    return copy.deepcopy(DEFAULT_PROCESSING_CONFIG)
+
+
+# Loaded once at import; pool sizes are fixed for the lifetime of the process
+processing_config = load_processing_config()
@@ -0,0 +1,161 @@
+"""
+Executor layer for RULE
+Runs CPU-bound PDF work on a process pool and I/O-bound LLM calls on a thread pool,
+so the FastAPI event loop never executes blocking resume processing
+"""
+
+import asyncio
+import functools
+import multiprocessing
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional
+
+from .config import processing_config
+
+
+class ProcessingExecutors:
+    """Separately sized pools for CPU-bound extraction and I/O-bound LLM calls"""
+
+    def __init__(self, cpu_workers: int = 2, io_workers: int = 8, start_method: str = "spawn"):
+        self.cpu_workers = cpu_workers
+        self.io_workers = io_workers
+        self.start_method = start_method
+        # Created on first use so worker processes importing this module don't spawn pools of their own
+        self._cpu_pool: ProcessPoolExecutor = None
+        self._io_pool: ThreadPoolExecutor = None
+        self._lock = threading.Lock()
+        # Picklable function each CPU worker runs once when it starts (e.g. loading OCR models)
+        self._worker_initializer: Optional[Callable] = None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ProcessingExecutors":
+        executor_config = config.get("executors", {})
+        return cls(
+            cpu_workers=int(executor_config.get("cpu_workers", 2)),
+            io_workers=int(executor_config.get("io_workers", 8)),
+            start_method=executor_config.get("start_method", "spawn")
+        )
+
+    def _get_cpu_pool(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._cpu_pool is None:
+                self._cpu_pool = ProcessPoolExecutor(
+                    max_workers=self.cpu_workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                    initializer=self._worker_initializer
+                )
+            return self._cpu_pool
+
+    def set_worker_initializer(self, initializer: Optional[Callable]):
+        """Run initializer in every CPU worker started from now on"""
+        with self._lock:
+            self._worker_initializer = initializer
+
+    def start_cpu_workers(self):
+        """Start the CPU workers now (running the initializer) instead of on the first extraction"""
+        self.run_on_cpu_workers(_noop)
+
+    def run_on_cpu_workers(self, fn: Callable, *args, **kwargs) -> List[Any]:
+        """
+        Submit fn cpu_workers times at once and return the results.
+        The pool spawns a worker per pending task up to cpu_workers, so this starts them, but a worker that
+        is free early can run fn more than once while another runs none: per-worker setup belongs in the
+        initializer, and fn should only report on it. Runs fn once inline when the pool is disabled.
+        """
+        if self.cpu_workers <= 0:
+            return [fn(*args, **kwargs)]
+        pool = self._get_cpu_pool()
+        return [future.result() for future in [pool.submit(fn, *args, **kwargs) for _ in range(self.cpu_workers)]]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            started = len(getattr(self._cpu_pool, "_processes", None) or {}) if self._cpu_pool else 0
+        return {
+            "cpu_workers": self.cpu_workers,
+            "cpu_workers_started": started,
+            "io_workers": self.io_workers,
+        }
+
+    def _get_io_pool(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._io_pool is None:
+                self._io_pool = ThreadPoolExecutor(max_workers=self.io_workers, thread_name_prefix="llm-io")
+            return self._io_pool
+
+    def _reset_cpu_pool(self):
+        """Drop a pool whose worker died so the next call starts a fresh one"""
+        with self._lock:
+            if self._cpu_pool is not None:
+                self._cpu_pool.shutdown(wait=False, cancel_futures=True)
+                self._cpu_pool = None
+
+    def run_cpu(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a picklable CPU-bound function on the process pool and wait for its result"""
+        if self.cpu_workers <= 0:
+            return fn(*args, **kwargs)
+
+        try:
+            return self._get_cpu_pool().submit(fn, *args, **kwargs).result()
+        except BrokenProcessPool:
+            print(f"[ERROR] CPU worker process died while running {getattr(fn, '__name__', fn)}; restarting pool")
+            self._reset_cpu_pool()
+            raise
+
+    def map_cpu(self, fn: Callable, arg_list: List[tuple], max_in_flight: int = 0) -> List[Any]:
+        """
+        Run fn(*args) for every args tuple on the process pool and return the results in the same order.
+        At most max_in_flight calls (default cpu_workers) are submitted at a time; the pool is shared,
+        so calls from concurrent callers queue behind each other rather than adding processes.
+        """
+        if self.cpu_workers <= 0:
+            return [fn(*args) for args in arg_list]
+
+        limit = max_in_flight if max_in_flight > 0 else self.cpu_workers
+        pool = self._get_cpu_pool()
+        results: List[Any] = [None] * len(arg_list)
+        pending = {}
+        next_index = 0
+        try:
+            while next_index < len(arg_list) or pending:
+                while next_index < len(arg_list) and len(pending) < limit:
+                    pending[pool.submit(fn, *arg_list[next_index])] = next_index
+                    next_index += 1
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+        except BrokenProcessPool:
+            print(f"[ERROR] CPU worker process died while running {getattr(fn, '__name__', fn)}; restarting pool")
+            self._reset_cpu_pool()
+            raise
+        finally:
+            for future in pending:
+                future.cancel()
+        return results
+
+    def run_io(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking I/O-bound function (LLM request) on the thread pool and wait for its result"""
+        return self._get_io_pool().submit(fn, *args, **kwargs).result()
+
+    async def run_io_async(self, fn: Callable, *args, **kwargs) -> Any:
+        """Await an I/O-bound function without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_io_pool(), functools.partial(fn, *args, **kwargs))
+
+    def shutdown(self, wait: bool = True):
+        with self._lock:
+            if self._cpu_pool is not None:
+                self._cpu_pool.shutdown(wait=wait)
+                self._cpu_pool = None
+            if self._io_pool is not None:
+                self._io_pool.shutdown(wait=wait)
+                self._io_pool = None
+
+
+def _noop():
+    return None
+
+
+# Global executor layer shared by the API handlers and the pipeline
+executors = ProcessingExecutors.from_config(processing_config)
@@ -0,0 +1,83 @@
+"""
+Processing data models for RULE
+Handles data structures for background batch jobs and per-file progress
+"""
+
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from pydantic import BaseModel, Field
+from enum import Enum
+
+
+class BatchStatus(str, Enum):
+    """Lifecycle of a background batch job"""
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+
+
+class BatchKind(str, Enum):
+    """What a batch job scores: freshly uploaded PDFs or stored resumes against a new job description"""
+    UPLOAD = "upload"
+    RESCORE = "rescore"
+
+
+class Priority(str, Enum):
+    """Scheduling class of a resume in the processing pipeline"""
+    INTERACTIVE = "interactive"  # single uploads a recruiter is waiting on
+    BATCH = "batch"  # batch uploads and batch jobs
+    BACKGROUND = "background"  # re-scoring stored resumes
+
+
+class FileStatus(str, Enum):
+    """Lifecycle of a single file inside a batch job"""
+    PENDING = "pending"
+    EXTRACTING = "extracting"
+    SCORING = "scoring"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class BatchFile(BaseModel):
+    """Progress of one resume inside a batch job"""
+    file_id: str
+    filename: str
+    resume_id: Optional[str] = None
+    # Result being re-scored, for rescore batches
+    source_resume_id: Optional[str] = None
+    document_hash: Optional[str] = None
+    status: FileStatus = FileStatus.PENDING
+    error: Optional[str] = None
+    fit_score: Optional[float] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class BatchJob(BaseModel):
+    """A background batch job and the state of each of its files"""
+    batch_id: str
+    status: BatchStatus = BatchStatus.QUEUED
+    kind: BatchKind = BatchKind.UPLOAD
+    job_description: str
+    job_description_id: Optional[str] = None
+    files: List[BatchFile] = []
+    rejected_files: List[Dict[str, Any]] = []
+    ranked_resumes: List[Dict[str, Any]] = []
+    created_at: datetime = Field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+
+    def count(self, status: FileStatus) -> int:
+        return sum(1 for f in self.files if f.status == status)
+
+    def progress(self) -> Dict[str, Any]:
+        """Summary counters for status polling"""
+        finished = self.count(FileStatus.DONE) + self.count(FileStatus.FAILED)
+        return {
+            "total_files": len(self.files),
+            "pending": self.count(FileStatus.PENDING),
+            "extracting": self.count(FileStatus.EXTRACTING),
+            "scoring": self.count(FileStatus.SCORING),
+            "done": self.count(FileStatus.DONE),
+            "failed": self.count(FileStatus.FAILED) + len(self.rejected_files),
+            "percent_complete": round(100.0 * finished / len(self.files), 1) if self.files else 100.0
+        }
@@ -0,0 +1,95 @@
+"""
+Scheduling for RULE
+Weighted fair queue used between pipeline stages, so interactive uploads are served ahead of
+bulk batches and no single batch can starve the others
+"""
+
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional
+
+
+class FairQueue:
+    """
+    Thread-safe queue with two levels of fairness:
+    - across priority classes, dequeues are shared in proportion to the class weights
+      (stride scheduling: the non-empty class with the lowest pass value goes next)
+    - within a class, flows (one batch or request each) are served round robin
+
+    Each class is bounded separately, so a full batch backlog never blocks an interactive put.
+    get() returns None once stop_one() has been called and the queue is empty.
+    """
+
+    def __init__(self, weights: Dict[str, float], maxsize_per_class: int = 0):
+        if not weights or any(weight <= 0 for weight in weights.values()):
+            raise ValueError("Priority weights must be positive")
+        self._weights = dict(weights)
+        self._maxsize = maxsize_per_class
+        self._flows: Dict[str, "OrderedDict[str, Deque[Any]]"] = {name: OrderedDict() for name in weights}
+        self._sizes: Dict[str, int] = {name: 0 for name in weights}
+        self._pass: Dict[str, float] = {name: 0.0 for name in weights}
+        self._virtual_time = 0.0
+        self._stops = 0
+        self._cond = threading.Condition()
+
+    def put(self, item: Any, priority: str, flow: str):
+        """Add an item to a flow of a priority class, blocking while that class is full"""
+        if priority not in self._weights:
+            raise ValueError(f"Unknown priority class: {priority}")
+
+        with self._cond:
+            while self._maxsize and self._sizes[priority] >= self._maxsize:
+                self._cond.wait()
+            if self._sizes[priority] == 0:
+                # A class returning from idle starts at the current virtual time instead of
+                # cashing in the turns it did not use
+                self._pass[priority] = max(self._pass[priority], self._virtual_time)
+            flows = self._flows[priority]
+            if flow not in flows:
+                flows[flow] = deque()
+            flows[flow].append(item)
+            self._sizes[priority] += 1
+            self._cond.notify_all()
+
+    def get(self) -> Optional[Any]:
+        """Remove and return the next item by weighted fair order; None tells the caller to stop"""
+        with self._cond:
+            while True:
+                active = [name for name in self._weights if self._sizes[name]]
+                if active:
+                    break
+                if self._stops:
+                    self._stops -= 1
+                    return None
+                self._cond.wait()
+
+            # Ties go to the class listed first in the weights (highest priority)
+            priority = min(active, key=lambda name: self._pass[name])
+            self._virtual_time = self._pass[priority]
+            self._pass[priority] += 1.0 / self._weights[priority]
+
+            flows = self._flows[priority]
+            flow, items = next(iter(flows.items()))
+            item = items.popleft()
+            if items:
+                flows.move_to_end(flow)
+            else:
+                del flows[flow]
+            self._sizes[priority] -= 1
+            self._cond.notify_all()
+            return item
+
+    def stop_one(self):
+        """Make one get() return None once the queue has drained"""
+        with self._cond:
+            self._stops += 1
+            self._cond.notify_all()
+
+    def qsize(self) -> int:
+        with self._cond:
+            return sum(self._sizes.values())
+
+    def depths(self) -> Dict[str, int]:
+        """Queued items per priority class"""
+        with self._cond:
+            return dict(self._sizes)
@@ -0,0 +1,20 @@
+"""
+Streaming helpers for RULE
+Formats per-resume batch events as NDJSON lines or Server-Sent Events
+"""
+
+import json
+from typing import Any, Dict
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream",
+}
+
+
+def format_event(event: str, data: Dict[str, Any], stream_format: str = "ndjson") -> str:
+    """Serialize one event in the requested stream format"""
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+    return json.dumps({"event": event, **data}, ensure_ascii=False, default=str) + "\n"
+
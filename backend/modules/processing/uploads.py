@@ -0,0 +1,62 @@
+"""
+Upload handling for RULE
+Keeps uploaded resumes in memory and only spools them to a temp file above a size threshold
+"""
+
+import os
+import shutil
+import tempfile
+from dataclasses import dataclass
+from typing import BinaryIO, Optional, Union
+
+from .config import processing_config
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class UploadedPdf:
+    """An uploaded resume held either as bytes or as a spooled temp file"""
+    filename: str
+    size: int
+    data: Optional[bytes] = None
+    path: Optional[str] = None
+
+    @property
+    def source(self) -> Union[bytes, str]:
+        """What the extraction functions accept: the bytes, or the temp file path"""
+        return self.data if self.data is not None else self.path
+
+    def cleanup(self):
+        """Remove the temp file, if one was written"""
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def read_upload(filename: str, upload: BinaryIO, max_in_memory_bytes: int = None) -> UploadedPdf:
+    """
+    Read an uploaded PDF into memory, spilling to a temp file only when it exceeds the threshold
+
+    Args:
+        filename: Original filename of the upload
+        upload: Binary file object of the upload (UploadFile.file)
+        max_in_memory_bytes: Size threshold; defaults to uploads.max_in_memory_bytes from config
+
+    Returns:
+        UploadedPdf with either data or path set
+    """
+    if max_in_memory_bytes is None:
+        max_in_memory_bytes = int(processing_config["uploads"]["max_in_memory_bytes"])
+
+    # Read one byte past the threshold to find out whether the file fits
+    head = upload.read(max_in_memory_bytes + 1)
+    if len(head) <= max_in_memory_bytes:
+        return UploadedPdf(filename=filename, size=len(head), data=head)
+
+    with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
+        temp_file.write(head)
+        shutil.copyfileobj(upload, temp_file, _CHUNK_SIZE)
+        size = temp_file.tell()
+        temp_path = temp_file.name
+
+    return UploadedPdf(filename=filename, size=size, path=temp_path)
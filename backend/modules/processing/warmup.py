@@ -0,0 +1,137 @@
+"""
+Startup warm-up for RULE
+Exercises the OCR path on every CPU worker and loads the Ollama model in the background after startup,
+and tracks which components are warm so /api/ready only reports ready once first requests will be fast
+"""
+
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, List
+
+from .config import processing_config
+from .executors import executors
+
+# Component states reported by /api/ready
+DISABLED = "disabled"
+PENDING = "pending"
+WARMING = "warming"
+WARM = "warm"
+FAILED = "failed"
+
+
+class WarmupManager:
+    """Runs the configured warm-up steps on a background thread and records their state"""
+
+    def __init__(self, enabled: bool = False, ocr: bool = True, llm: bool = True,
+                 preload_ocr_models: bool = False, ollama_keep_alive: str = "30m",
+                 llm_timeout_seconds: float = 300, required: List[str] = None,
+                 retry_interval_seconds: float = 30):
+        self.ocr_enabled = enabled and ocr
+        self.llm_enabled = enabled and llm
+        # Loading the OCR models without exercising them is still a warm-up of the ocr component
+        self.preload_ocr_models = preload_ocr_models or self.ocr_enabled
+        self.ollama_keep_alive = ollama_keep_alive
+        self.llm_timeout_seconds = llm_timeout_seconds
+        self.required = list(required if required is not None else ["ocr", "llm"])
+        self.retry_interval_seconds = retry_interval_seconds
+        self._components: Dict[str, Dict[str, Any]] = {
+            "ocr": {"state": PENDING if self.preload_ocr_models else DISABLED},
+            "llm": {"state": PENDING if self.llm_enabled else DISABLED},
+        }
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._started = False
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "WarmupManager":
+        startup_config = config.get("startup", {})
+        warm_up_config = startup_config.get("warm_up", {})
+        return cls(
+            enabled=bool(warm_up_config.get("enabled", False)),
+            ocr=bool(warm_up_config.get("ocr", True)),
+            llm=bool(warm_up_config.get("llm", True)),
+            preload_ocr_models=bool(startup_config.get("preload_ocr_models", False)),
+            ollama_keep_alive=warm_up_config.get("ollama_keep_alive", "30m"),
+            llm_timeout_seconds=float(warm_up_config.get("llm_timeout_seconds", 300)),
+            required=warm_up_config.get("required", ["ocr", "llm"]),
+            retry_interval_seconds=float(warm_up_config.get("retry_interval_seconds", 30))
+        )
+
+    def start(self):
+        """Begin warming up in the background (idempotent); call once at API startup"""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+
+        if self.preload_ocr_models:
+            from backend.modules.text_extract.extract_ocr_pdf import warm_up_cpu_worker
+            # Must be set before anything creates the pool (e.g. batch recovery), so that every worker
+            # warms up as it starts: each worker runs it exactly once, without holding up queued extractions
+            executors.set_worker_initializer(functools.partial(warm_up_cpu_worker, self.ocr_enabled))
+            threading.Thread(target=self._run, args=("ocr", self._warm_ocr),
+                             name="warm-up-ocr", daemon=True).start()
+        if self.llm_enabled:
+            threading.Thread(target=self._run, args=("llm", self._warm_llm),
+                             name="warm-up-llm", daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _warm_ocr(self) -> Dict[str, Any]:
+        from backend.modules.text_extract.extract_ocr_pdf import warm_up_cpu_worker
+        # Starts the workers, which warm up in their initializer; the call only collects (or, after
+        # a failure, retries) that warm-up. Inline without a pool.
+        outcomes = executors.run_on_cpu_workers(warm_up_cpu_worker, self.ocr_enabled)
+        errors = [outcome["error"] for outcome in outcomes if "error" in outcome]
+        if errors:
+            raise RuntimeError(errors[0])
+        detail = {"workers": executors.stats()["cpu_workers_started"],
+                  "action": "ocr" if self.ocr_enabled else "preloaded"}
+        if self.ocr_enabled:
+            detail["timings"] = outcomes
+        return detail
+
+    def _warm_llm(self) -> Dict[str, Any]:
+        from backend.modules.llm_prompts.parse_resume_llm import warm_up_llm
+        return warm_up_llm(keep_alive=self.ollama_keep_alive, timeout=self.llm_timeout_seconds)
+
+    def _run(self, name: str, step: Callable[[], Dict[str, Any]]):
+        """Run one warm-up step, retrying failures until it succeeds or the API shuts down"""
+        attempts = 0
+        while not self._stop.is_set():
+            attempts += 1
+            self._update(name, state=WARMING, attempts=attempts)
+            start = time.perf_counter()
+            try:
+                detail = step()
+            except Exception as e:
+                print(f"[WARNING] Warm-up of {name} failed (attempt {attempts}): {e}")
+                self._update(name, state=FAILED, error=str(e), seconds=round(time.perf_counter() - start, 3))
+                self._stop.wait(self.retry_interval_seconds)
+                continue
+            seconds = round(time.perf_counter() - start, 3)
+            print(f"[DEBUG] Warm-up of {name} finished in {seconds}s")
+            self._update(name, state=WARM, error=None, seconds=seconds, detail=detail)
+            return
+
+    def _update(self, name: str, **fields):
+        with self._lock:
+            self._components[name].update(fields)
+
+    def components(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {name: dict(component) for name, component in self._components.items()}
+
+    def is_ready(self) -> bool:
+        """True once every required component that is enabled is warm"""
+        components = self.components()
+        return all(
+            components[name]["state"] in (WARM, DISABLED)
+            for name in self.required if name in components
+        )
+
+
+# Global warm-up state shared by the startup hook and /api/ready
+warmup_manager = WarmupManager.from_config(processing_config)
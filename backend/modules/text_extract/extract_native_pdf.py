@@ -3,10 +3,17 @@
 import pdfplumber
 import os
 
-def extract_lines_from_pdf(pdf_path: str) -> str:
+from .pdf_source import PdfSource, open_pdf_source
+
+# Recorded with cached text; bump when the extraction output changes
+EXTRACTOR_NAME = "pdfplumber"
+EXTRACTOR_VERSION = "2"
+
+def extract_lines_from_pdf(pdf_path: PdfSource) -> str:
+    """Extract text lines from a PDF given as a path, bytes or an in-memory buffer"""
     all_lines = []
 
-    with pdfplumber.open(pdf_path) as pdf:
+    with pdfplumber.open(open_pdf_source(pdf_path)) as pdf:
         for page in pdf.pages:
             text = page.extract_text()
             if text:
@@ -1,28 +1,125 @@
 import os
+import queue
 import re
-import cv2
-import spacy
-import pytesseract
-import numpy as np
-from spellchecker import SpellChecker
-from pdf2image import convert_from_path
-from PIL import Image
+import tempfile
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from pdf2image import convert_from_path, pdfinfo_from_path
+from PIL import Image, ImageDraw, ImageFont
 from datetime import datetime
 
-# Load NLP model and spell checker
-nlp = spacy.load("en_core_web_sm")
-spell = SpellChecker()
+from backend.modules.metrics.timing import timed
+from .ocr_engines import get_ocr_engine
+from .pdf_source import PdfSource, describe_pdf_source, read_pdf_bytes
+
+# Recorded with cached text; bump when the OCR or cleanup output changes
+EXTRACTOR_NAME = "tesseract-spacy"
+EXTRACTOR_VERSION = "4"
+
+# spaCy, the spell checker, OpenCV and the OCR engine are only needed for scanned resumes,
+# so they are imported on first use instead of when the API (or a worker process) starts
+_nlp = None
+_spell = None
+_models_lock = threading.Lock()
+# Outcome of warm_up_cpu_worker in this process: its timings, or {"error": ...}
+_worker_warm_up: Optional[dict] = None
+
+# -------------------- Models -------------------- #
+
+def get_nlp():
+    """spaCy pipeline, loaded on first use"""
+    global _nlp
+    if _nlp is None:
+        with _models_lock:
+            if _nlp is None:
+                import spacy
+                _nlp = spacy.load("en_core_web_sm")
+    return _nlp
+
+def get_spell_checker():
+    """Spell checker with its word frequency dictionary, loaded on first use"""
+    global _spell
+    if _spell is None:
+        with _models_lock:
+            if _spell is None:
+                from spellchecker import SpellChecker
+                _spell = SpellChecker()
+    return _spell
+
+def ocr_models_loaded() -> bool:
+    return _nlp is not None and _spell is not None
+
+def warm_up_ocr_models():
+    """Load everything the OCR path needs ahead of the first scanned resume"""
+    import cv2  # noqa: F401
+    get_ocr_engine()
+    get_nlp()
+    get_spell_checker()
+
+# Tiny embedded resume page OCR'd by warm_up_ocr_page
+WARM_UP_LINES = [
+    "Jane Doe - jane.doe@example.com",
+    "Senior Software Engineer, Acme Corp, Jan 2020 - Present",
+    "Skills: Python, FastAPI, PostgreSQL, Docker",
+]
+
+def warm_up_ocr_page() -> dict:
+    """
+    Run the OCR path once on a small generated page: image enhancement, Tesseract, and cleaning
+    with spaCy and the spell checker. Pays their first-use costs (model and dictionary loads,
+    Tesseract's language data) before real traffic; returns the seconds spent per step.
+    """
+    timings = {}
+    with timed(timings, "models"):
+        warm_up_ocr_models()
+
+    image = Image.new("RGB", (900, 40 + 40 * len(WARM_UP_LINES)), "white")
+    draw = ImageDraw.Draw(image)
+    font = ImageFont.load_default(size=24)
+    for i, line in enumerate(WARM_UP_LINES):
+        draw.text((20, 20 + 40 * i), line, fill="black", font=font)
+
+    with timed(timings, "ocr"):
+        raw_text, _ = recognize_page(image)
+    with timed(timings, "clean"):
+        clean_text(raw_text or " ".join(WARM_UP_LINES))
+    return {stage: round(seconds, 4) for stage, seconds in timings.items()}
+
+def warm_up_cpu_worker(ocr_page: bool = False) -> dict:
+    """
+    Warm up this process once: load the OCR models, and with ocr_page also OCR the warm-up page.
+    Installed as the CPU worker initializer, and called again by the warm-up check, which retries
+    a failed warm-up. Never raises: a failing initializer would break the whole process pool.
+    """
+    global _worker_warm_up
+    if _worker_warm_up is None or "error" in _worker_warm_up:
+        try:
+            if ocr_page:
+                _worker_warm_up = warm_up_ocr_page()
+            else:
+                warm_up_ocr_models()
+                _worker_warm_up = {}
+        except Exception as e:
+            print(f"[WARNING] OCR warm-up of worker {os.getpid()} failed: {e}")
+            _worker_warm_up = {"error": f"{type(e).__name__}: {e}"}
+    return _worker_warm_up
 
 # -------------------- Utilities -------------------- #
 
 def extract_emails_names(text):
     emails = re.findall(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", text)
-    doc = nlp(text)
+    doc = get_nlp()(text)
     names = [ent.text for ent in doc.ents if ent.label_ == "PERSON"]
     return set(emails), set(names)
 
 def enhance_image(pil_img):
-    img = cv2.cvtColor(np.array(pil_img), cv2.COLOR_RGB2GRAY)
+    import cv2
+    import numpy as np
+
+    img = np.array(pil_img)
+    if img.ndim == 3:
+        # Pages rendered in colour; grayscale renders are already single-channel
+        img = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
     img = cv2.bilateralFilter(img, 9, 75, 75)
     img = cv2.adaptiveThreshold(img, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
                                 cv2.THRESH_BINARY, 11, 2)
@@ -52,7 +149,8 @@ def convert_dates(text):
 def clean_text(raw_text):
     raw_text = fix_common_ocr_errors(raw_text)
     emails, names = extract_emails_names(raw_text)
-    doc = nlp(raw_text)
+    doc = get_nlp()(raw_text)
+    spell = get_spell_checker()
     corrected = []
 
     for token in doc:
@@ -83,47 +181,276 @@ def clean_text(raw_text):
 
     return clean.strip()
 
+# -------------------- Rasterization -------------------- #
+
+def _page_windows(page_numbers: Iterable[int], window_pages: int) -> List[List[int]]:
+    """Split page numbers into runs of consecutive pages, at most window_pages long"""
+    windows: List[List[int]] = []
+    for page_number in page_numbers:
+        if windows and windows[-1][-1] == page_number - 1 and len(windows[-1]) < window_pages:
+            windows[-1].append(page_number)
+        else:
+            windows.append([page_number])
+    return windows
+
+
+def iter_page_images(pdf_path: PdfSource, page_numbers: Optional[List[int]] = None, dpi: int = 300,
+                     streaming: bool = True, grayscale: bool = True, window_pages: int = 1,
+                     paths_only: bool = False, timings: dict = None) -> Iterator[Tuple[int, Image.Image]]:
+    """
+    Render the given 1-based pages (all by default) and yield (page number, image) in page order.
+    With streaming, pages are rendered window_pages at a time and the next window is rendered on a
+    background thread while the caller OCRs the current one, so at most two windows are in memory.
+    Without it, the requested pages are rendered at once before the first one is yielded.
+    grayscale renders single-channel images (a third of the memory of RGB, and what OCR uses anyway).
+    With paths_only, poppler writes the pages to a temp directory and each is loaded only when yielded.
+    Pages that fail to render are reported and skipped; raises when the PDF cannot be read at all.
+    """
+    with tempfile.TemporaryDirectory(prefix="rule-ocr-") as temp_dir:
+        if isinstance(pdf_path, str):
+            pdf_file = pdf_path
+        else:
+            # Written once; convert_from_bytes would write a temp copy for every window
+            pdf_file = os.path.join(temp_dir, "source.pdf")
+            with open(pdf_file, "wb") as f:
+                f.write(read_pdf_bytes(pdf_path))
+
+        if page_numbers is None and streaming:
+            with timed(timings, "rasterize"):
+                page_numbers = list(range(1, int(pdfinfo_from_path(pdf_file)["Pages"]) + 1))
+        if page_numbers is None:
+            # Not streaming: the whole document in one poppler call
+            windows = [None]
+        else:
+            # Runs of consecutive pages, so each rendered first..last range is exactly its window
+            windows = _page_windows(page_numbers, max(1, window_pages if streaming else len(page_numbers)))
+
+        def render(window: Optional[List[int]]):
+            page_range = {} if window is None else {
+                "first_page": window[0], "last_page": window[-1]
+            }
+            with timed(timings, "rasterize"):
+                pages = convert_from_path(
+                    pdf_file, dpi=dpi, grayscale=grayscale, **page_range,
+                    output_folder=temp_dir if paths_only else None, paths_only=paths_only
+                )
+            if window is None:
+                window = list(range(1, len(pages) + 1))
+            return list(zip(window, pages))
+
+        if not streaming:
+            rendered_pages = [page for window in windows for page in render(window)]
+            yield from _load_pages(rendered_pages, paths_only)
+            return
+
+        rendered: queue.Queue = queue.Queue(maxsize=1)
+        stop = threading.Event()
+
+        def produce():
+            for window in windows:
+                try:
+                    item = render(window)
+                except Exception as e:
+                    print(f"❌ Failed to convert pages {window[0]}-{window[-1]} to images: {e}")
+                    item = []
+                while not stop.is_set():
+                    try:
+                        rendered.put(item, timeout=0.1)
+                        break
+                    except queue.Full:
+                        continue
+                if stop.is_set():
+                    return
+            rendered.put(None)
+
+        producer = threading.Thread(target=produce, name="ocr-rasterize", daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = rendered.get()
+                if item is None:
+                    break
+                yield from _load_pages(item, paths_only)
+        finally:
+            # Also reached when the caller stops early: let the producer finish its window
+            # before the temp directory is removed
+            stop.set()
+            while producer.is_alive():
+                try:
+                    rendered.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            producer.join()
+
+
+def _load_pages(rendered: List[tuple], paths_only: bool) -> Iterator[Tuple[int, Image.Image]]:
+    for page_number, page in rendered:
+        if paths_only:
+            with Image.open(page) as image:
+                image.load()
+            os.remove(page)
+            page = image
+        yield page_number, page
+
 # -------------------- OCR Pipeline -------------------- #
 
-def extract_text_easyocr_from_pdf(pdf_path: str, dpi: int = 300) -> str:
+def extract_text_easyocr_from_pdf(pdf_path: PdfSource, dpi: int = 300, timings: dict = None,
+                                  page_stats: list = None, adaptive_dpi: dict = None, **rasterize_options) -> str:
     """
     Extract text from PDF using Tesseract OCR with enhanced cleaning, page by page.
+    Accepts a file path, raw bytes or an in-memory buffer.
     Returns concatenated text from all pages as a single string.
     Compatible with your existing pipeline and API usage.
+    When timings is given, seconds spent rasterizing, in Tesseract and cleaning are added to it.
+    rasterize_options (streaming, grayscale, window_pages, paths_only) are passed to iter_page_images;
+    see ocr_pages for adaptive_dpi and page_stats.
     """
-    print(f"\n📄 OCR with Tesseract: {pdf_path}")
+    print(f"\n📄 OCR with Tesseract: {describe_pdf_source(pdf_path)}")
 
     try:
-        images = convert_from_path(pdf_path, dpi=dpi)
+        page_texts = ocr_pages(pdf_path, None, dpi, timings, page_stats, adaptive_dpi, rasterize_options)
     except Exception as e:
         print(f"❌ Failed to convert PDF to images: {e}")
         return ""
 
-    print(f"📦 {len(images)} pages loaded for OCR.")
-    all_text = ""
+    print(f"📦 {len(page_texts)} pages OCR'd.")
+    return join_page_texts(page_texts)
 
-    for i, img in enumerate(images):
-        print(f"📸 Processing Page {i + 1}...")
 
-        try:
-            enhanced_img = enhance_image(img)
-            pil_enhanced = Image.fromarray(enhanced_img)
+def join_page_texts(page_texts: Dict[int, str]) -> str:
+    """OCR text of a whole document: each page's text under a "--- Page N ---" header, in page order"""
+    return "".join(f"\n--- Page {number} ---\n{page_texts[number]}\n" for number in sorted(page_texts)).strip()
+
+
+def ocr_pages(pdf_path: PdfSource, page_numbers: Optional[List[int]], dpi: int = 300, timings: dict = None,
+              page_stats: list = None, adaptive_dpi: dict = None, rasterize_options: dict = None) -> Dict[int, str]:
+    """
+    Render, OCR and clean the given 1-based pages (all by default); returns the cleaned text per page number.
+    With adaptive_dpi ({"initial_dpi", "min_confidence"}), pages are rendered at initial_dpi first and
+    only those whose mean Tesseract word confidence is below min_confidence are rendered again at dpi.
+    With page_stats, {"page", "dpi", "confidence", "engine"} of every OCR'd page is appended to it
+    (confidence is None without adaptive_dpi, which is the only mode that reads it; engine is the
+    OCR engine that actually ran, which may be a fallback from the configured one).
+    Pages that fail to render or OCR are left out; raises when the PDF cannot be rendered at all.
+    """
+    rasterize_options = rasterize_options or {}
+    render_dpi = min(dpi, int(adaptive_dpi["initial_dpi"])) if adaptive_dpi else dpi
+    texts = {}
+    for page_number, img in iter_page_images(pdf_path, page_numbers, dpi=render_dpi, timings=timings,
+                                             **rasterize_options):
+        if adaptive_dpi:
+            cleaned_text = ocr_page_adaptive(pdf_path, img, page_number, render_dpi, dpi,
+                                             float(adaptive_dpi["min_confidence"]), timings, page_stats,
+                                             rasterize_options)
+        else:
+            cleaned_text = ocr_page_image(img, page_number, timings)
+            if cleaned_text is not None and page_stats is not None:
+                page_stats.append({"page": page_number, "dpi": render_dpi, "confidence": None,
+                                   "engine": get_ocr_engine().name})
+        del img
+        if cleaned_text is not None:
+            texts[page_number] = cleaned_text
+    return texts
+
+
+def recognize_page(img, with_confidence: bool = False) -> Tuple[str, Optional[float]]:
+    """
+    Enhance a rendered page and run it through the configured OCR engine (see ocr_engines);
+    with_confidence also returns the mean word confidence, 0-100.
+    """
+    pil_enhanced = Image.fromarray(enhance_image(img))
+    return get_ocr_engine().recognize(pil_enhanced, with_confidence=with_confidence)
+
+
+def ocr_page_image(img, page_number: int, timings: dict = None):
+    """Enhance, OCR and clean one rendered page; None when OCR fails on it"""
+    print(f"📸 Processing Page {page_number}...")
+    try:
+        with timed(timings, "ocr"):
+            raw_text, _ = recognize_page(img)
+        print(f"\n🔍 Raw OCR output (Page {page_number}):\n{raw_text[:500]}...\n")
+
+        with timed(timings, "clean"):
+            cleaned_text = clean_text(raw_text)
+        print(f"✅ Page {page_number}: {len(cleaned_text)} characters cleaned")
+        return cleaned_text
+    except Exception as ocr_error:
+        print(f"❌ OCR failed on page {page_number}: {ocr_error}")
+        return None
+
+
+def ocr_page_adaptive(pdf_path: PdfSource, img, page_number: int, dpi: int, max_dpi: int, min_confidence: float,
+                      timings: dict = None, page_stats: list = None, rasterize_options: dict = None):
+    """
+    OCR a page rendered at dpi; when its mean word confidence is below min_confidence, render it again
+    at max_dpi and keep whichever text Tesseract is more confident in (pages without any recognized
+    words are not rendered again). Cleans the result like
+    ocr_page_image; None when OCR fails on the page.
+    """
+    print(f"📸 Processing Page {page_number} at {dpi} DPI...")
+    try:
+        with timed(timings, "ocr"):
+            raw_text, confidence = recognize_page(img, with_confidence=True)
+        stats = {"page": page_number, "dpi": dpi, "confidence": confidence, "engine": get_ocr_engine().name}
 
-            raw_text = pytesseract.image_to_string(pil_enhanced)
-            print(f"\n🔍 Raw OCR output (Page {i + 1}):\n{raw_text[:500]}...\n")
+        # A blank page has no words and confidence 0; a sharper render would not find any either
+        if confidence < min_confidence and max_dpi > dpi and raw_text.strip():
+            print(f"🔁 Page {page_number}: confidence {confidence} at {dpi} DPI; rendering at {max_dpi} DPI")
+            options = {**(rasterize_options or {}), "streaming": False}
+            for _, high_img in iter_page_images(pdf_path, [page_number], dpi=max_dpi, timings=timings, **options):
+                with timed(timings, "ocr"):
+                    high_text, high_confidence = recognize_page(high_img, with_confidence=True)
+                if high_confidence >= confidence:
+                    raw_text = high_text
+                    stats.update(dpi=max_dpi, confidence=high_confidence)
+            stats["initial_confidence"] = confidence
+        print(f"\n🔍 Raw OCR output (Page {page_number}, {stats['dpi']} DPI, "
+              f"confidence {stats['confidence']}):\n{raw_text[:500]}...\n")
 
+        with timed(timings, "clean"):
             cleaned_text = clean_text(raw_text)
-            print(f"✅ Page {i + 1}: {len(cleaned_text)} characters cleaned")
+        print(f"✅ Page {page_number}: {len(cleaned_text)} characters cleaned")
+        if page_stats is not None:
+            page_stats.append(stats)
+        return cleaned_text
+    except Exception as ocr_error:
+        print(f"❌ OCR failed on page {page_number}: {ocr_error}")
+        return None
 
-            all_text += f"\n--- Page {i + 1} ---\n{cleaned_text}\n"
-        except Exception as ocr_error:
-            print(f"❌ OCR failed on page {i + 1}: {ocr_error}")
 
-    return all_text.strip()
+def extract_text_from_pages(pdf_path: PdfSource, page_numbers: List[int], dpi: int = 300,
+                            timings: dict = None, page_stats: list = None, adaptive_dpi: dict = None,
+                            **rasterize_options) -> Dict[int, str]:
+    """
+    OCR only the given 1-based pages of a PDF, rendering them as iter_page_images does.
+    Returns the cleaned text per page number; pages that fail to render or OCR are left out.
+    """
+    print(f"\n📄 OCR of pages {page_numbers} with Tesseract: {describe_pdf_source(pdf_path)}")
+    try:
+        return ocr_pages(pdf_path, page_numbers, dpi, timings, page_stats, adaptive_dpi, rasterize_options)
+    except Exception as e:
+        print(f"❌ Failed to convert pages {page_numbers} to images: {e}")
+        return {}
+
+
+def ocr_pdf_page(pdf_path: PdfSource, page_number: int, dpi: int = 300, rasterize_options: dict = None,
+                 adaptive_dpi: dict = None) -> Tuple[Optional[str], Dict[str, float], List[dict]]:
+    """
+    Render and OCR a single page: the task of page-parallel OCR, run on a CPU worker whose
+    spaCy pipeline and spell checker stay loaded between pages.
+    Returns the cleaned text (None when the page fails), the seconds spent per stage and the page stats.
+    """
+    timings = {}
+    page_stats = []
+    # One page needs no render-ahead thread
+    options = {**(rasterize_options or {}), "streaming": False}
+    texts = extract_text_from_pages(pdf_path, [page_number], dpi=dpi, timings=timings, page_stats=page_stats,
+                                    adaptive_dpi=adaptive_dpi, **options)
+    return texts.get(page_number), timings, page_stats
 
 
 # Alternative function name to match Tesseract implementation
-def extract_text_tesseract_from_pdf(pdf_path: str, dpi: int = 300) -> str:
+def extract_text_tesseract_from_pdf(pdf_path: PdfSource, dpi: int = 300) -> str:
     """
     Extract text from PDF using Tesseract OCR with enhanced cleaning.
     This is an alias for extract_text_easyocr_from_pdf to maintain compatibility.
@@ -0,0 +1,187 @@
+"""
+Native text extraction backends for RULE
+Interchangeable extractors for the text layer of a PDF: pdfplumber (layout-aware and slowest), pypdf,
+pypdfium2 (PDFium) and poppler's pdftotext. get_backend picks one by name, or the fastest available for "auto",
+and text_quality scores extracted text so garbled output can be re-extracted with a safer backend.
+"""
+
+import importlib.util
+import os
+import re
+import shutil
+import string
+import subprocess
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Callable, ContextManager, Iterator, List
+
+from . import extract_native_pdf
+from .pdf_source import PdfSource, open_pdf_source, read_pdf_bytes
+
+# Lazily evaluated text of each page, in order; calling one extracts that page
+PageTexts = List[Callable[[], str]]
+
+
+def _normalize(text: str) -> str:
+    """Same line conventions for every backend: \\n line breaks, no trailing spaces"""
+    text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return "\n".join(line.rstrip() for line in text.split("\n")).strip("\n")
+
+
+class NativeTextBackend(ABC):
+    """Extracts the text layer of a PDF page by page; recorded with cached text as name and version"""
+    name = ""
+    version = "1"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    @abstractmethod
+    def open(self, pdf_source: PdfSource) -> ContextManager[PageTexts]:
+        """Context manager yielding the lazily extracted text of each page, in order"""
+
+
+class PdfplumberBackend(NativeTextBackend):
+    name = extract_native_pdf.EXTRACTOR_NAME
+    version = extract_native_pdf.EXTRACTOR_VERSION
+
+    @contextmanager
+    def open(self, pdf_source: PdfSource) -> Iterator[PageTexts]:
+        import pdfplumber
+
+        with pdfplumber.open(open_pdf_source(pdf_source)) as pdf:
+            # Unnormalized, so the text matches extract_lines_from_pdf and earlier cached text
+            yield [lambda page=page: page.extract_text() or "" for page in pdf.pages]
+
+
+class PypdfBackend(NativeTextBackend):
+    name = "pypdf"
+
+    @contextmanager
+    def open(self, pdf_source: PdfSource) -> Iterator[PageTexts]:
+        from pypdf import PdfReader
+
+        reader = PdfReader(open_pdf_source(pdf_source))
+        yield [lambda page=page: _normalize(page.extract_text() or "") for page in reader.pages]
+
+
+# PDFium is not thread-safe: with cpu_workers 0 the pipeline threads extract in one process,
+# so every pypdfium2 call of the process goes through this lock
+_PDFIUM_LOCK = threading.Lock()
+
+
+class PdfiumBackend(NativeTextBackend):
+    name = "pypdfium2"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return importlib.util.find_spec("pypdfium2") is not None
+
+    @contextmanager
+    def open(self, pdf_source: PdfSource) -> Iterator[PageTexts]:
+        import pypdfium2 as pdfium
+
+        source = pdf_source if isinstance(pdf_source, str) else read_pdf_bytes(pdf_source)
+        with _PDFIUM_LOCK:
+            document = pdfium.PdfDocument(source)
+            page_count = len(document)
+
+        def page_text(index: int) -> str:
+            with _PDFIUM_LOCK:
+                page = document[index]
+                text_page = page.get_textpage()
+                try:
+                    text = text_page.get_text_range()
+                finally:
+                    text_page.close()
+                    page.close()
+            return _normalize(text)
+
+        try:
+            yield [lambda index=index: page_text(index) for index in range(page_count)]
+        finally:
+            with _PDFIUM_LOCK:
+                document.close()
+
+
+class PdftotextBackend(NativeTextBackend):
+    """poppler's pdftotext (installed with poppler-utils for pdf2image); one process per document"""
+    name = "pdftotext"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return shutil.which("pdftotext") is not None
+
+    @contextmanager
+    def open(self, pdf_source: PdfSource) -> Iterator[PageTexts]:
+        temp_path = None
+        if isinstance(pdf_source, str):
+            path = pdf_source
+        else:
+            fd, temp_path = tempfile.mkstemp(suffix=".pdf")
+            with os.fdopen(fd, "wb") as f:
+                f.write(read_pdf_bytes(pdf_source))
+            path = temp_path
+        try:
+            completed = subprocess.run(
+                ["pdftotext", "-enc", "UTF-8", path, "-"], capture_output=True, check=True, timeout=120
+            )
+        finally:
+            if temp_path:
+                os.remove(temp_path)
+        # Pages are separated (and terminated) by form feeds
+        pages = completed.stdout.decode("utf-8", errors="replace").split("\f")[:-1]
+        yield [lambda text=text: _normalize(text) for text in pages]
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (PdfplumberBackend, PypdfBackend, PdfiumBackend, PdftotextBackend)
+}
+# Tried in this order for "auto": fastest first, pdfplumber always available
+AUTO_ORDER = ["pypdfium2", "pdftotext", "pypdf", "pdfplumber"]
+
+
+def available_backends() -> List[str]:
+    return [name for name, backend in BACKENDS.items() if backend.is_available()]
+
+
+def get_backend(name: str = "auto") -> NativeTextBackend:
+    """Backend by name, or the first available one in AUTO_ORDER for "auto" """
+    if name == "auto":
+        name = next(candidate for candidate in AUTO_ORDER if BACKENDS[candidate].is_available())
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown native extraction backend: {name} (choose from {', '.join(BACKENDS)} or auto)")
+    if not BACKENDS[name].is_available():
+        raise ValueError(f"Native extraction backend {name} is not installed")
+    return BACKENDS[name]()
+
+
+_ALLOWED_CHARS = set(string.ascii_letters + string.digits + string.punctuation + string.whitespace + "•–—‘’“”€£")
+_CID = re.compile(r"\(cid:\d+\)")
+
+
+def text_quality(text: str) -> float:
+    """
+    0..1 score of how much extracted text looks like readable text.
+    Penalizes undecodable glyphs ((cid:NN), U+FFFD, control characters), words run together
+    (missing spaces) and letter-spaced words (one character per token). Clean resumes score close to 1.
+    """
+    stripped = text.strip()
+    if not stripped:
+        return 1.0
+    cid_chars = sum(len(match) for match in _CID.findall(stripped))
+    stripped = _CID.sub("", stripped)
+    good_chars = sum(1 for char in stripped if char in _ALLOWED_CHARS or (char.isalnum() and char.isprintable()))
+    char_score = good_chars / (len(stripped) + cid_chars)
+
+    words = stripped.split()
+    if not words:
+        return char_score
+    good_words = sum(1 for word in words if 2 <= len(word) <= 25)
+    # Natural text has some one-letter words ("a", "I", bullets), so only a minority counts against it
+    word_score = min(1.0, good_words / len(words) / 0.8)
+    return round(char_score * word_score, 4)
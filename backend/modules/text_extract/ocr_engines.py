@@ -0,0 +1,249 @@
+"""
+OCR engines for RULE
+Interchangeable Tesseract front ends: tesserocr keeps initialized libtesseract engines in memory and reuses
+them for every page, while pytesseract runs the tesseract binary once per page (process start, temp image
+file and language model load each time). get_ocr_engine returns the configured engine of the current process.
+"""
+
+import importlib.util
+import queue
+import shlex
+import shutil
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from backend.modules.processing.config import processing_config
+
+
+class OcrEngine(ABC):
+    """Runs Tesseract on a page image with fixed options (language, page segmentation and engine mode, whitelist)"""
+    name = ""
+
+    def __init__(self, lang: str = "eng", psm: int = 3, oem: int = 3, whitelist: str = ""):
+        self.lang = lang
+        self.psm = psm
+        self.oem = oem
+        self.whitelist = whitelist
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return True
+
+    @abstractmethod
+    def recognize(self, image, with_confidence: bool = False) -> Tuple[str, Optional[float]]:
+        """Text of the image, laid out a line per text line; with_confidence also the mean word confidence (0-100)"""
+
+    def warm_up(self):
+        """Pay the engine's first-use cost (library and language model load) now"""
+
+    def close(self):
+        pass
+
+
+class PytesseractEngine(OcrEngine):
+    """The tesseract command line through pytesseract; one process per page"""
+    name = "pytesseract"
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return importlib.util.find_spec("pytesseract") is not None and shutil.which("tesseract") is not None
+
+    def _config(self) -> str:
+        config = f"--psm {self.psm} --oem {self.oem}"
+        if self.whitelist:
+            config += f" -c tessedit_char_whitelist={shlex.quote(self.whitelist)}"
+        return config
+
+    def recognize(self, image, with_confidence: bool = False) -> Tuple[str, Optional[float]]:
+        import pytesseract
+
+        if not with_confidence:
+            return pytesseract.image_to_string(image, lang=self.lang, config=self._config()), None
+        # Still one Tesseract run: the text is rebuilt from the word boxes
+        data = pytesseract.image_to_data(image, lang=self.lang, config=self._config(),
+                                         output_type=pytesseract.Output.DICT)
+        return text_from_ocr_data(data), mean_word_confidence(data)
+
+    def warm_up(self):
+        import pytesseract  # noqa: F401
+
+
+class TesserocrEngine(OcrEngine):
+    """
+    libtesseract in process through tesserocr. Initialized engines are pooled and reused across pages;
+    an engine serves one page at a time, so pool_size bounds the pages OCR'd concurrently in this process.
+    """
+    name = "tesserocr"
+
+    def __init__(self, lang: str = "eng", psm: int = 3, oem: int = 3, whitelist: str = "", pool_size: int = 1):
+        super().__init__(lang, psm, oem, whitelist)
+        self.pool_size = max(1, pool_size)
+        self._idle: queue.LifoQueue = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return importlib.util.find_spec("tesserocr") is not None
+
+    def _create_api(self):
+        import tesserocr
+
+        api = tesserocr.PyTessBaseAPI(lang=self.lang, psm=self.psm, oem=self.oem)
+        if self.whitelist:
+            api.SetVariable("tessedit_char_whitelist", self.whitelist)
+        return api
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            create = self._created < self.pool_size
+            if create:
+                self._created += 1
+        if not create:
+            return self._idle.get()
+        try:
+            return self._create_api()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    def recognize(self, image, with_confidence: bool = False) -> Tuple[str, Optional[float]]:
+        api = self._acquire()
+        try:
+            api.SetImage(image)
+            text = api.GetUTF8Text()
+            confidence = None
+            if with_confidence:
+                confidences = [conf for conf in api.AllWordConfidences() if conf >= 0]
+                confidence = round(sum(confidences) / len(confidences), 2) if confidences else 0.0
+            return text, confidence
+        finally:
+            api.Clear()
+            self._idle.put(api)
+
+    def warm_up(self):
+        self._idle.put(self._acquire())
+
+    def close(self):
+        while True:
+            try:
+                api = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            api.End()
+            with self._lock:
+                self._created -= 1
+
+
+ENGINES = {engine.name: engine for engine in (TesserocrEngine, PytesseractEngine)}
+# Tried in this order for "auto": in-process first, pytesseract as the fallback
+AUTO_ORDER = ["tesserocr", "pytesseract"]
+
+
+def available_engines() -> List[str]:
+    return [name for name, engine in ENGINES.items() if engine.is_available()]
+
+
+def _engine_options(config: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "lang": config.get("lang", "eng"),
+        "psm": int(config.get("psm", 3)),
+        "oem": int(config.get("oem", 3)),
+        "whitelist": config.get("whitelist", "") or "",
+    }
+
+
+def resolve_engine_name(config: Dict[str, Any], name: str = None, warn: bool = False) -> str:
+    """
+    Engine an ocr.engine config section selects (name overrides its "backend"): "auto" is the first
+    installed engine in AUTO_ORDER, and an unknown or missing engine falls back to pytesseract
+    """
+    name = name or config.get("backend", "auto")
+    if name == "auto":
+        return next((candidate for candidate in AUTO_ORDER if ENGINES[candidate].is_available()), "pytesseract")
+    if name not in ENGINES:
+        if warn:
+            print(f"[ERROR] Unknown OCR engine: {name} (choose from {', '.join(ENGINES)} or auto); using pytesseract")
+        return "pytesseract"
+    if name != "pytesseract" and not ENGINES[name].is_available():
+        if warn:
+            print(f"[WARNING] OCR engine {name} is not installed; using pytesseract")
+        return "pytesseract"
+    return name
+
+
+def engine_signature(config: Dict[str, Any]) -> str:
+    """
+    The engine and options an ocr.engine config section OCRs with, e.g. "tesserocr:eng:psm3:oem3:"
+    (the whitelist comes last). Recorded with cached OCR text, so changing any of them re-extracts it.
+    It names the engine the config resolves to; the text cache refuses text that OCR page stats show
+    came from another engine (create_ocr_engine falling back at runtime).
+    """
+    options = _engine_options(config)
+    return (f"{resolve_engine_name(config)}:{options['lang']}:psm{options['psm']}:oem{options['oem']}:"
+            f"{options['whitelist']}")
+
+
+def create_ocr_engine(config: Dict[str, Any], name: str = None) -> OcrEngine:
+    """
+    Engine from an ocr.engine config section (name overrides its "backend"), warmed up.
+    See resolve_engine_name; tesserocr failing to initialize (e.g. missing language data)
+    also falls back to pytesseract.
+    """
+    options = _engine_options(config)
+    if resolve_engine_name(config, name, warn=True) == "tesserocr":
+        engine = TesserocrEngine(pool_size=int(config.get("pool_size", 1)), **options)
+        try:
+            engine.warm_up()
+            return engine
+        except Exception as e:
+            print(f"[WARNING] tesserocr failed to initialize ({e}); using pytesseract")
+    engine = PytesseractEngine(**options)
+    engine.warm_up()
+    return engine
+
+
+_engine: Optional[OcrEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_ocr_engine() -> OcrEngine:
+    """The configured OCR engine of this process (every CPU worker has its own), created on first use"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = create_ocr_engine(processing_config.get("ocr", {}).get("engine", {}))
+    return _engine
+
+
+def text_from_ocr_data(data: Dict[str, list]) -> str:
+    """Page text from image_to_data output, laid out like image_to_string: one line per text line, blocks apart"""
+    lines: List[str] = []
+    current_line = current_block = None
+    for i, word in enumerate(data["text"]):
+        if not word or not word.strip():
+            continue
+        block = (data["page_num"][i], data["block_num"][i])
+        line = block + (data["par_num"][i], data["line_num"][i])
+        if line != current_line:
+            if current_block is not None and block != current_block:
+                lines.append("")
+            lines.append(word)
+            current_line, current_block = line, block
+        else:
+            lines[-1] += " " + word
+    return "\n".join(lines)
+
+
+def mean_word_confidence(data: Dict[str, list]) -> float:
+    """Mean confidence (0-100) of the recognized words; 0 when Tesseract found none"""
+    confidences = [float(conf) for word, conf in zip(data["text"], data["conf"])
+                   if word and word.strip() and float(conf) >= 0]
+    return round(sum(confidences) / len(confidences), 2) if confidences else 0.0
@@ -0,0 +1,123 @@
+"""
+Single-pass PDF analysis for RULE
+Opens a resume PDF once with a native extraction backend, decides between native extraction and OCR
+from its text layer while the pages are extracted, and returns the native text together with
+per-page text-layer flags
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from .native_backends import NativeTextBackend, PdfplumberBackend, text_quality
+from .pdf_source import PdfSource
+
+# Documents with less text than this across all pages are treated as scanned
+MIN_TEXT_LENGTH = 20
+# Pages with less text than this have no usable text layer (blank, or a scan with at most a page number)
+MIN_PAGE_TEXT_LENGTH = 20
+
+
+@dataclass
+class PdfAnalysis:
+    """Outcome of analyze_pdf; picklable so it can be returned from the CPU pool"""
+    text_based: bool
+    # Native text, one line per text line, in page order
+    text: str = ""
+    # Backend that produced the text, and text_quality of it
+    extractor: str = ""
+    quality: Optional[float] = None
+    page_count: int = 0
+    # True per page (in order) when the page has a usable text layer; only the pages read so far
+    # when analysis stopped at the threshold
+    page_text_layers: List[bool] = field(default_factory=list)
+    # Native text of each page read (empty unless extract_text)
+    page_texts: List[str] = field(default_factory=list)
+    text_length: int = 0
+
+    @property
+    def complete(self) -> bool:
+        """Every page was read"""
+        return len(self.page_text_layers) == self.page_count
+
+    def merged_text(self, page_replacements: Dict[int, str]) -> str:
+        """Native text with the given 1-based pages replaced (e.g. by their OCR text), in page order"""
+        lines: List[str] = []
+        for number, text in enumerate(self.page_texts, start=1):
+            text = page_replacements.get(number, text)
+            if text:
+                lines.extend(text.split("\n"))
+        return "\n".join(lines)
+
+    def pages_without_text_layer(self) -> List[int]:
+        """1-based numbers of the pages read that need OCR"""
+        return [number for number, has_text in enumerate(self.page_text_layers, start=1) if not has_text]
+
+
+def analyze_pdf(pdf_path: PdfSource, min_text_length: int = MIN_TEXT_LENGTH, extract_text: bool = True,
+                timings: Optional[Dict[str, float]] = None,
+                min_page_text_length: int = MIN_PAGE_TEXT_LENGTH,
+                backend: Optional[NativeTextBackend] = None,
+                fallback_backend: Optional[NativeTextBackend] = None,
+                min_quality: float = 0.0) -> PdfAnalysis:
+    """
+    Parse a PDF once: extract each page's text layer, and decide it is text-based as soon as
+    min_text_length characters (stripped, across pages) have been seen.
+    A page counts as having a text layer with at least min_page_text_length characters.
+    With extract_text=False it returns at that point without reading the remaining pages.
+    When timings is given, the seconds until the decision are added as "detect" and
+    the rest of the extraction as "native_extract".
+    backend defaults to pdfplumber. When the extracted text of a text-based PDF scores below
+    min_quality (see text_quality), it is extracted again with fallback_backend.
+    Raises when the PDF cannot be opened.
+    """
+    backend = backend or PdfplumberBackend()
+    analysis = _analyze_with(pdf_path, backend, min_text_length, extract_text, timings, min_page_text_length)
+    if not (analysis.text_based and extract_text):
+        return analysis
+
+    analysis.quality = text_quality(analysis.text)
+    if (analysis.quality < min_quality and fallback_backend is not None
+            and fallback_backend.name != backend.name):
+        print(f"[WARNING] {backend.name} text scored {analysis.quality} (< {min_quality}); "
+              f"extracting again with {fallback_backend.name}")
+        analysis = _analyze_with(pdf_path, fallback_backend, min_text_length, extract_text, timings,
+                                 min_page_text_length)
+        analysis.quality = text_quality(analysis.text) if analysis.text_based else None
+    return analysis
+
+
+def _analyze_with(pdf_path: PdfSource, backend: NativeTextBackend, min_text_length: int, extract_text: bool,
+                  timings: Optional[Dict[str, float]], min_page_text_length: int) -> PdfAnalysis:
+    start = time.perf_counter()
+    decided_at = None
+    lines: List[str] = []
+    analysis = PdfAnalysis(text_based=False, extractor=backend.name)
+
+    with backend.open(pdf_path) as pages:
+        analysis.page_count = len(pages)
+        for page_text in pages:
+            text = page_text()
+            stripped = text.strip()
+            analysis.page_text_layers.append(len(stripped) >= min_page_text_length)
+            analysis.text_length += len(stripped)
+            if text:
+                lines.extend(text.split("\n"))
+            if extract_text:
+                analysis.page_texts.append(text)
+
+            if decided_at is None and analysis.text_length >= min_text_length:
+                analysis.text_based = True
+                decided_at = time.perf_counter()
+                if not extract_text:
+                    break
+
+    end = time.perf_counter()
+    if analysis.text_based:
+        analysis.text = "\n".join(lines) if extract_text else ""
+    if timings is not None:
+        decided_at = decided_at or end
+        timings["detect"] = timings.get("detect", 0.0) + decided_at - start
+        if analysis.text_based and extract_text:
+            timings["native_extract"] = timings.get("native_extract", 0.0) + end - decided_at
+    return analysis
@@ -0,0 +1,36 @@
+# backend/modules/text_extract/pdf_source.py
+
+import io
+from typing import BinaryIO, Union
+
+# A resume PDF given as a file path, raw bytes or an open binary buffer
+PdfSource = Union[str, bytes, bytearray, BinaryIO]
+
+
+def open_pdf_source(pdf_source: PdfSource) -> Union[str, BinaryIO]:
+    """Return something pypdf and pdfplumber can open: a path or a seekable buffer"""
+    if isinstance(pdf_source, (bytes, bytearray)):
+        return io.BytesIO(pdf_source)
+    if hasattr(pdf_source, "seek"):
+        pdf_source.seek(0)
+    return pdf_source
+
+
+def read_pdf_bytes(pdf_source: PdfSource) -> bytes:
+    """Return the raw PDF bytes regardless of how the source was given"""
+    if isinstance(pdf_source, (bytes, bytearray)):
+        return bytes(pdf_source)
+    if isinstance(pdf_source, str):
+        with open(pdf_source, "rb") as f:
+            return f.read()
+    pdf_source.seek(0)
+    return pdf_source.read()
+
+
+def describe_pdf_source(pdf_source: PdfSource) -> str:
+    """Short label for log messages"""
+    if isinstance(pdf_source, str):
+        return pdf_source
+    if isinstance(pdf_source, (bytes, bytearray)):
+        return f"<in-memory PDF, {len(pdf_source)} bytes>"
+    return "<in-memory PDF buffer>"
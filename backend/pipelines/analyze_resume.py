@@ -1,9 +1,9 @@
 import os
 import json
 from dotenv import load_dotenv
-from pypdf import PdfReader
 import sys
 import warnings
+from typing import Optional
 
 # Suppress DeprecationWarning from cryptography (optional)
 warnings.filterwarnings("ignore", category=DeprecationWarning)
@@ -11,10 +11,25 @@ warnings.filterwarnings("ignore", category=DeprecationWarning)
 # Add project root to sys.path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
-from backend.modules.text_extract.extract_native_pdf import extract_lines_from_pdf
+from backend.modules.text_extract.pdf_source import PdfSource, describe_pdf_source, read_pdf_bytes
+from backend.modules.text_extract.pdf_analyzer import analyze_pdf, MIN_TEXT_LENGTH, MIN_PAGE_TEXT_LENGTH
 from backend.modules.llm_prompts.parse_resume_llm import call_mistral_resume_analyzer
-from backend.modules.text_extract.extract_ocr_pdf import extract_text_easyocr_from_pdf
+from backend.modules.text_extract.extract_ocr_pdf import (
+    extract_text_easyocr_from_pdf, extract_text_from_pages, join_page_texts, ocr_pdf_page,
+    EXTRACTOR_NAME as OCR_EXTRACTOR_NAME
+)
+from backend.modules.text_extract.native_backends import get_backend
 from backend.modules.llm.response_validator import validate_llm_response, response_validator
+from backend.modules.processing.executors import executors
+from backend.modules.processing.config import processing_config
+from backend.modules.cache.result_cache import result_cache, current_llm_identity
+from backend.modules.cache.text_cache import text_cache, hybrid_extractor_name
+from backend.modules.cache.store import sha256_hex
+from backend.modules.job_descriptions.store import get_job_description_id
+from backend.modules.metrics.timing import ResumeTrace
+from backend.modules.metrics.resume_metrics import (
+    CACHE_LOOKUPS, LLM_REQUEST_DURATION, VALIDATIONS, record_resume
+)
 
 load_dotenv()
 api_key = os.getenv("MISTRAL_API_KEY")
@@ -44,30 +59,22 @@ def clean_ai_response(raw_response: str) -> str:
     return cleaned.strip()
 
 
-def is_pdf_text_based(pdf_path: str, min_text_length: int = 20) -> bool:
+def is_pdf_text_based(pdf_path: PdfSource, min_text_length: int = MIN_TEXT_LENGTH) -> bool:
     """
     Checks if the PDF contains extractable text.
-    Returns True if total extractable text length across pages exceeds min_text_length.
+    Accepts a file path, raw bytes or an in-memory buffer.
+    Returns True as soon as the text layer of the pages read so far reaches min_text_length.
     """
     try:
-        print(f"[DEBUG] Checking if PDF is text-based: {pdf_path}")
-        reader = PdfReader(pdf_path)
-        total_text = ""
-        for i, page in enumerate(reader.pages, start=1):
-            text = page.extract_text()
-            if text:
-                total_text += text.strip()
-            else:
-                print(f"[DEBUG] Page {i}: No extractable text.")
-        if len(total_text) >= min_text_length:
-            print(f"[DEBUG] Total extracted text length: {len(total_text)} characters.")
-            return True
-        else:
-            print(f"[DEBUG] Total extracted text length too short ({len(total_text)} chars). Treating as image-based PDF.")
-            return False
+        print(f"[DEBUG] Checking if PDF is text-based: {describe_pdf_source(pdf_path)}")
+        analysis = analyze_pdf(pdf_path, min_text_length, extract_text=False,
+                               backend=native_extraction_options()["backend"])
     except Exception as e:
         print(f"[ERROR] PDF read failed: {e}")
         return False
+    if not analysis.text_based:
+        print(f"[DEBUG] Total extracted text length too short ({analysis.text_length} chars). Treating as image-based PDF.")
+    return analysis.text_based
 
 
 def get_output_dir() -> str:
@@ -85,81 +92,483 @@ def save_result_to_json(result: dict, resume_id: str):
         json.dump(result, f, indent=2, ensure_ascii=False)
     print(f"✅ Result saved to {json_path}")
 
-def process_resume(pdf_path: str, job_description: str, resume_id: str):
-    if not os.path.exists(pdf_path):
-        print("❌ Resume not found:", pdf_path)
+
+def load_stored_result(resume_id: str):
+    """Read a saved result from outputs/, or None if it does not exist"""
+    json_path = os.path.join(get_output_dir(), f"{os.path.basename(resume_id)}.json")
+    if not os.path.exists(json_path):
         return None
+    with open(json_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def get_stored_text_path(document_hash: str) -> str:
+    text_dir = os.path.join(get_output_dir(), "texts")
+    os.makedirs(text_dir, exist_ok=True)
+    return os.path.join(text_dir, f"{os.path.basename(document_hash)}.json")
+
+
+def save_stored_text(document_hash: str, resume_text: str, extraction_method: str):
+    """
+    Keep the extracted text of a scored resume in outputs/texts/, next to its results.
+    Unlike the text cache it is never evicted or purged, so stored resumes can always be re-scored.
+    """
+    path = get_stored_text_path(document_hash)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump({"resume_text": resume_text, "extraction_method": extraction_method}, f, ensure_ascii=False)
+    os.replace(temp_path, path)
 
-    print(f"[DEBUG] Extracting resume from: {pdf_path}")
-    resume_text = extract_lines_from_pdf(pdf_path)
 
-    if not resume_text.strip():
-        print("❌ Extracted text is empty!")
+def load_stored_text(document_hash: str) -> Optional[dict]:
+    """{"resume_text", "extraction_method"} saved by save_stored_text, or None"""
+    path = get_stored_text_path(document_hash)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[WARNING] Failed to read stored text {document_hash}: {e}")
         return None
 
-    print("[DEBUG] Calling Mistral LLM for analysis...")
-    raw_result = call_mistral_resume_analyzer(resume_text, job_description, api_key)
 
-    if raw_result is None:
-        print("❌ AI analysis returned None.")
-        fallback = response_validator.create_fallback_response(job_description, "AI returned None")
-        save_result_to_json(fallback.dict(), resume_id)
-        return fallback.dict()
+def list_stored_resume_ids() -> list:
+    """Resume ids of all saved results, most recently written first"""
+    output_dir = get_output_dir()
+    entries = [entry for entry in os.scandir(output_dir) if entry.name.endswith(".json")]
+    entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+    return [entry.name[:-5] for entry in entries]
 
-    # Validate and extract structured data using Pydantic AI
-    validation_result = validate_llm_response(raw_result, job_description)
 
-    if validation_result.is_valid and validation_result.validated_data:
-        print("✅ LLM response validation successful")
-        result_dict = validation_result.validated_data.dict()
-        save_result_to_json(result_dict, resume_id)
-        return result_dict
-    else:
-        print(f"❌ LLM response validation failed: {validation_result.errors}")
-        # Create fallback response with validation errors
-        fallback = response_validator.create_fallback_response(
-            job_description,
-            f"Validation failed: {', '.join(validation_result.errors)}"
-        )
-        save_result_to_json(fallback.dict(), resume_id)
-        return fallback.dict()
+_native_extraction_options = None
 
 
-def process_resume_ocr(pdf_path: str, job_description: str, resume_id: str):
-    if not os.path.exists(pdf_path):
-        print("❌ Resume not found:", pdf_path)
-        return None
+def native_extraction_options() -> dict:
+    """analyze_pdf arguments for the configured native extraction backend and its quality fallback"""
+    global _native_extraction_options
+    if _native_extraction_options is None:
+        config = processing_config.get("native_extraction", {})
+        try:
+            backend = get_backend(config.get("backend", "auto"))
+            fallback = get_backend(config["fallback_backend"]) if config.get("fallback_backend") else None
+        except ValueError as e:
+            print(f"[ERROR] {e}; using pdfplumber")
+            backend, fallback = get_backend("pdfplumber"), None
+        _native_extraction_options = {
+            "backend": backend,
+            "fallback_backend": fallback,
+            "min_quality": float(config.get("min_quality", 0.5)),
+        }
+    return _native_extraction_options
+
+
+def ocr_rasterize_options() -> dict:
+    """iter_page_images arguments from the ocr.rasterize config"""
+    config = processing_config.get("ocr", {}).get("rasterize", {})
+    return {
+        "streaming": bool(config.get("streaming", True)),
+        "grayscale": bool(config.get("grayscale", True)),
+        "window_pages": int(config.get("window_pages", 1)),
+        "paths_only": bool(config.get("paths_only", False)),
+    }
 
-    print(f"[DEBUG] Extracting OCR text from: {pdf_path}")
-    resume_text = extract_text_easyocr_from_pdf(pdf_path)
 
-    if not resume_text.strip():
-        print("❌ Extracted OCR text is empty!")
+def ocr_parallel_options() -> dict:
+    """Page-parallel OCR settings from the ocr.parallel config"""
+    config = processing_config.get("ocr", {}).get("parallel", {})
+    return {
+        "enabled": bool(config.get("enabled", True)),
+        "max_pages_in_flight": int(config.get("max_pages_in_flight", 0)),
+    }
+
+
+def ocr_adaptive_dpi_options() -> Optional[dict]:
+    """adaptive_dpi argument of the OCR functions from the ocr.adaptive_dpi config; None when disabled"""
+    config = processing_config.get("ocr", {}).get("adaptive_dpi", {})
+    if not config.get("enabled", False):
         return None
+    return {
+        "initial_dpi": int(config.get("initial_dpi", 200)),
+        "min_confidence": float(config.get("min_confidence", 80)),
+    }
+
+
+def extract_resume_text(pdf_path: PdfSource, defer_ocr: bool = False) -> dict:
+    """
+    Extraction stage: detect the PDF type and extract its text.
+    CPU-bound and picklable, so it can run on the process pool.
+    The per-stage seconds measured in the worker are returned under "timings".
+    The PDF is parsed once: its text layer both decides native vs OCR and, for text-based PDFs,
+    is the extracted text. "page_text_layers" flags the pages that have a text layer.
+    Pages without one in an otherwise text-based PDF are OCR'd on their own and merged in page order
+    ("hybrid"); a PDF without any is OCR'd as a whole. "extractor" names the extractor(s) used.
+    "ocr_pages" has the DPI and Tesseract confidence of every OCR'd page.
+    With defer_ocr, pages that need OCR are not OCR'd here: they are returned as "pending_ocr_pages",
+    with the "analysis" to merge their text into, for extract_resume_text_on_pool to OCR in parallel.
+    """
+    ocr_config = processing_config.get("ocr", {})
+    timings = {}
+    page_stats = []
+    print(f"[DEBUG] Analyzing PDF: {describe_pdf_source(pdf_path)}")
+    try:
+        analysis = analyze_pdf(
+            pdf_path, timings=timings,
+            min_page_text_length=int(ocr_config.get("min_page_text_length", MIN_PAGE_TEXT_LENGTH)),
+            **native_extraction_options()
+        )
+    except Exception as e:
+        print(f"[ERROR] PDF read failed: {e}")
+        analysis = None
+
+    if analysis is not None and analysis.text_based:
+        scanned_pages = analysis.pages_without_text_layer() if ocr_config.get("per_page", True) else []
+        if not scanned_pages:
+            print(f"[DEBUG] Text-based PDF: {analysis.text_length} characters from {analysis.page_count} pages "
+                  f"({analysis.extractor})")
+            return {"resume_text": analysis.text, "extraction_method": "native", "extractor": analysis.extractor,
+                    "timings": timings, "page_text_layers": analysis.page_text_layers}
+        if len(scanned_pages) < analysis.page_count:
+            print(f"[DEBUG] Mixed PDF: OCR of pages {scanned_pages} of {analysis.page_count}")
+            if defer_ocr:
+                return {"extraction_method": "hybrid", "extractor": hybrid_extractor_name(analysis.extractor),
+                        "timings": timings, "page_text_layers": analysis.page_text_layers,
+                        "pending_ocr_pages": scanned_pages, "analysis": analysis}
+            ocr_texts = extract_text_from_pages(pdf_path, scanned_pages, timings=timings, page_stats=page_stats,
+                                                adaptive_dpi=ocr_adaptive_dpi_options(), **ocr_rasterize_options())
+            return {"resume_text": analysis.merged_text(ocr_texts), "extraction_method": "hybrid",
+                    "extractor": hybrid_extractor_name(analysis.extractor), "timings": timings,
+                    "page_text_layers": analysis.page_text_layers, "ocr_pages": page_stats}
+
+    print(f"[DEBUG] Extracting OCR text from: {describe_pdf_source(pdf_path)}")
+    if defer_ocr and analysis is not None and analysis.page_count:
+        return {"extraction_method": "ocr", "extractor": OCR_EXTRACTOR_NAME, "timings": timings,
+                "page_text_layers": analysis.page_text_layers,
+                "pending_ocr_pages": list(range(1, analysis.page_count + 1)), "analysis": analysis}
+    resume_text = extract_text_easyocr_from_pdf(pdf_path, timings=timings, page_stats=page_stats,
+                                                adaptive_dpi=ocr_adaptive_dpi_options(), **ocr_rasterize_options())
+    return {"resume_text": resume_text, "extraction_method": "ocr", "extractor": OCR_EXTRACTOR_NAME,
+            "timings": timings, "page_text_layers": analysis.page_text_layers if analysis is not None else [],
+            "ocr_pages": page_stats}
+
+
+def extract_resume_text_on_pool(pdf_path: PdfSource, parallel_ocr: Optional[bool] = None) -> dict:
+    """
+    Run extract_resume_text on the CPU pool. With page-parallel OCR (ocr.parallel, or parallel_ocr),
+    the pages that need OCR are then rendered and OCR'd as separate tasks on the same pool, at most
+    max_pages_in_flight at a time, and merged in page order. The pool is shared by every document,
+    so concurrent documents take turns on its workers instead of starting more processes.
+    OCR stage timings are summed over pages, so they can exceed the wall-clock time.
+    """
+    options = ocr_parallel_options()
+    if parallel_ocr is not None:
+        options["enabled"] = parallel_ocr
+    extracted = executors.run_cpu(extract_resume_text, pdf_path, options["enabled"])
+    if "pending_ocr_pages" not in extracted:
+        return extracted
+
+    pages = extracted.pop("pending_ocr_pages")
+    analysis = extracted.pop("analysis")
+    print(f"[DEBUG] Page-parallel OCR of {len(pages)} pages: {describe_pdf_source(pdf_path)}")
+    rasterize_options = ocr_rasterize_options()
+    adaptive_dpi = ocr_adaptive_dpi_options()
+    results = executors.map_cpu(
+        ocr_pdf_page, [(pdf_path, page_number, 300, rasterize_options, adaptive_dpi) for page_number in pages],
+        max_in_flight=options["max_pages_in_flight"]
+    )
+
+    ocr_texts = {}
+    timings = extracted["timings"]
+    extracted["ocr_pages"] = []
+    for page_number, (text, page_timings, page_stats) in zip(pages, results):
+        if text is not None:
+            ocr_texts[page_number] = text
+        for stage, seconds in page_timings.items():
+            timings[stage] = timings.get(stage, 0.0) + seconds
+        extracted["ocr_pages"].extend(page_stats)
+    if extracted["extraction_method"] == "hybrid":
+        extracted["resume_text"] = analysis.merged_text(ocr_texts)
+    else:
+        extracted["resume_text"] = join_page_texts(ocr_texts)
+    return extracted
+
+
+def score_resume_text(resume_text: str, job_description: str, ocr: bool = False, cache_key: str = None,
+                      trace: ResumeTrace = None) -> dict:
+    """
+    Scoring stage: call the LLM and validate its response.
+    Always returns a result dict, falling back to a standardized failure response.
+    Validated results are stored in the result cache under cache_key, when given.
+    Every result records the job_description_id it was scored against.
+    LLM and validation time, and whether a fallback was used, are recorded on trace.
+    """
+    label = "OCR " if ocr else ""
+    job_description_id = get_job_description_id(job_description)
+    trace = trace or ResumeTrace()
+    provider, model = current_llm_identity()
 
-    print("[DEBUG] Calling Mistral LLM for OCR analysis...")
-    raw_result = call_mistral_resume_analyzer(resume_text, job_description, api_key)
+    print(f"[DEBUG] Calling Mistral LLM for {label}analysis...")
+    llm_outcome = "error"
+    try:
+        with trace.measure("llm"):
+            raw_result = call_mistral_resume_analyzer(resume_text, job_description, api_key)
+        llm_outcome = "success" if raw_result is not None else "empty"
+    finally:
+        LLM_REQUEST_DURATION.observe(trace.timings.get("llm", 0.0), provider=provider, model=model,
+                                     outcome=llm_outcome)
 
     if raw_result is None:
-        print("❌ AI OCR analysis returned None.")
-        fallback = response_validator.create_fallback_response(job_description, "AI OCR returned None")
-        save_result_to_json(fallback.dict(), resume_id)
-        return fallback.dict()
+        print(f"❌ AI {label}analysis returned None.")
+        trace.outcome = "fallback"
+        fallback = response_validator.create_fallback_response(job_description, f"AI {label}returned None")
+        return {**fallback.dict(), "job_description_id": job_description_id}
 
     # Validate and extract structured data using Pydantic AI
-    validation_result = validate_llm_response(raw_result, job_description)
+    with trace.measure("validate"):
+        validation_result = validate_llm_response(raw_result, job_description)
+    validated = bool(validation_result.is_valid and validation_result.validated_data)
+    VALIDATIONS.inc(provider=provider, model=model, outcome="valid" if validated else "fallback")
 
-    if validation_result.is_valid and validation_result.validated_data:
-        print("✅ LLM OCR response validation successful")
+    if validated:
+        print(f"✅ LLM {label}response validation successful")
+        trace.outcome = "success"
         result_dict = validation_result.validated_data.dict()
-        save_result_to_json(result_dict, resume_id)
+        result_dict["job_description_id"] = job_description_id
+        if cache_key:
+            result_cache.store(cache_key, result_dict)
         return result_dict
     else:
-        print(f"❌ LLM OCR response validation failed: {validation_result.errors}")
+        print(f"❌ LLM {label}response validation failed: {validation_result.errors}")
+        trace.outcome = "fallback"
         # Create fallback response with validation errors
         fallback = response_validator.create_fallback_response(
             job_description,
-            f"OCR validation failed: {', '.join(validation_result.errors)}"
+            f"{'OCR validation' if ocr else 'Validation'} failed: {', '.join(validation_result.errors)}"
         )
-        save_result_to_json(fallback.dict(), resume_id)
-        return fallback.dict()
+        return {**fallback.dict(), "job_description_id": job_description_id}
+
+
+def get_document_hash(pdf_path: PdfSource) -> str:
+    """SHA-256 of the PDF bytes; identifies a resume across uploads in both caches"""
+    return sha256_hex(read_pdf_bytes(pdf_path))
+
+
+def load_resume_text(pdf_path: Optional[PdfSource], document_hash: str,
+                     trace: ResumeTrace = None) -> Optional[dict]:
+    """
+    Extracted text for a PDF, from the text cache when possible.
+    On a miss the PDF is extracted on the CPU pool and the text is cached under document_hash.
+    Without a PDF (re-scoring a stored resume) a cache miss falls back to the text saved with the
+    resume's results; returns None when neither has it. Otherwise returns the same dict as extract_resume_text.
+    The extraction path and worker-side stage timings are recorded on trace.
+    """
+    extracted = text_cache.lookup(document_hash)
+    CACHE_LOOKUPS.inc(cache="text", result="hit" if extracted is not None else "miss")
+    if extracted is not None:
+        print(f"[CACHE] Reusing {extracted['extractor']} text for document {document_hash[:12]}")
+        if trace is not None:
+            trace.path = extracted["extraction_method"]
+        return extracted
+
+    if pdf_path is None:
+        stored = load_stored_text(document_hash)
+        if stored is not None:
+            print(f"[CACHE] Reusing stored text for document {document_hash[:12]}")
+            if trace is not None:
+                trace.path = stored["extraction_method"]
+        return stored
+
+    extracted = extract_resume_text_on_pool(pdf_path)
+    text_cache.store(document_hash, extracted)
+    if trace is not None:
+        trace.path = extracted["extraction_method"]
+        trace.add(extracted.get("timings"))
+        trace.ocr_pages = extracted.get("ocr_pages") or []
+    return extracted
+
+
+def lookup_cached_result(document_hash: str, job_description: str, resume_id: str, filename: str = None,
+                         trace: ResumeTrace = None):
+    """
+    Check the result cache for this document and job description.
+    Returns (result, cache_key): result is the finalized analysis saved under the new resume_id
+    on a hit, otherwise None; cache_key is None when caching is disabled.
+    """
+    if not result_cache.enabled:
+        return None, None
+
+    cache_key = result_cache.make_key(document_hash, job_description)
+    cached = result_cache.lookup(cache_key)
+    CACHE_LOOKUPS.inc(cache="result", result="hit" if cached is not None else "miss")
+    if cached is None:
+        return None, cache_key
+
+    print(f"[CACHE] Reusing cached analysis for {filename or document_hash[:12]}")
+    if trace is not None:
+        trace.path = "cached"
+        trace.outcome = "cache_hit"
+    cached["document_hash"] = document_hash
+    if filename:
+        cached["filename"] = filename
+    if trace is not None:
+        cached["stage_timings"] = trace.stage_timings()
+    save_result_to_json(cached, resume_id)
+    result = finalize_result(cached, job_description, resume_id, filename)
+    result["cache_hit"] = True
+    return result, cache_key
+
+
+def build_analysis_failed_result(job_description: str, resume_id: str, filename: str = None) -> dict:
+    """Standardized result when no analysis could be produced for a resume"""
+    return {
+        "success": False,
+        "error": "AI analysis failed",
+        "resume_id": resume_id,
+        "filename": filename,
+        "job_description": job_description,
+        "job_description_id": get_job_description_id(job_description),
+        "fit_score": 1,
+        "fit_score_reason": "AI analysis failed - cannot assess job requirements match using enhanced reasoning",
+        "eligibility_status": "Not Eligible",
+        "eligibility_reason": "Resume analysis could not be completed - unable to verify job relevance using intelligent matching",
+        "work_experience_raw": "Could not extract work experience"
+    }
+
+
+def build_processing_error_result(error_message: str, tb: str, job_description: str,
+                                  resume_id: str, filename: str = None) -> dict:
+    """Standardized result when processing a resume raised an exception"""
+    return {
+        "success": False,
+        "error": error_message,
+        "trace": tb,
+        "resume_id": resume_id,
+        "filename": filename,
+        "job_description": job_description,
+        "job_description_id": get_job_description_id(job_description),
+        "fit_score": 1,
+        "fit_score_reason": "Processing failed - cannot assess job relevance using intelligent matching criteria",
+        "eligibility_status": "Not Eligible",
+        "eligibility_reason": "Resume could not be processed - unable to verify job relevance using smart reasoning",
+        "work_experience_raw": "Could not extract work experience"
+    }
+
+
+def finalize_result(result: dict, job_description: str, resume_id: str, filename: str = None) -> dict:
+    """Ensure all results have required fields for consistency and mark them successful"""
+    if "resume_id" not in result:
+        result["resume_id"] = resume_id
+    if "filename" not in result and filename:
+        result["filename"] = filename
+    if "job_description" not in result:
+        result["job_description"] = job_description
+    if "job_description_id" not in result:
+        result["job_description_id"] = get_job_description_id(job_description)
+    if "fit_score" not in result:
+        result["fit_score"] = 1  # Default to lowest score if not provided
+    if "fit_score_reason" not in result:
+        result["fit_score_reason"] = "Resume analysis incomplete - cannot assess job requirements match"
+    if "eligibility_status" not in result:
+        # Determine eligibility based on fit_score using enhanced scoring system
+        fit_score = result.get("fit_score", 1)
+        result["eligibility_status"] = "Eligible" if fit_score >= 5 else "Not Eligible"
+    if "eligibility_reason" not in result:
+        fit_score = result.get("fit_score", 1)
+        if fit_score >= 8:
+            result["eligibility_reason"] = "Strong fit - candidate has highly relevant technical background and experience that aligns well with job requirements"
+        elif fit_score >= 5:
+            result["eligibility_reason"] = "Moderate fit - candidate has relevant experience with transferable skills for this role"
+        else:
+            result["eligibility_reason"] = f"Poor fit - candidate's background is not logically relevant to this job role (fit score: {fit_score}/10). Experience appears to be in a different field."
+    if "work_experience_raw" not in result:
+        result["work_experience_raw"] = "Work experience information not available"
+
+    result["success"] = True
+    return result
+
+
+def process_single_resume(file_path: PdfSource, job_description: str, resume_id: str, filename: str = None):
+    """
+    Process a single resume and return standardized result.
+    file_path may also be the uploaded PDF bytes, which avoids a temp file.
+    Blocking: call it from a worker thread, never directly on the event loop.
+    Per-stage timings are attached to the result as stage_timings.
+    """
+    trace = ResumeTrace()
+    try:
+        with trace.measure("hash"):
+            document_hash = get_document_hash(file_path)
+        cached, cache_key = lookup_cached_result(document_hash, job_description, resume_id, filename, trace)
+        if cached:
+            return attach_stage_timings(cached, trace)
+
+        # Text is cached per document, so only the first scoring of a PDF pays for extraction/OCR
+        extracted = load_resume_text(file_path, document_hash, trace)
+        if not extracted["resume_text"].strip():
+            print(f"❌ Extracted text is empty for {filename or describe_pdf_source(file_path)}!")
+            trace.outcome = "failed"
+            return attach_stage_timings(build_analysis_failed_result(job_description, resume_id, filename), trace)
+
+        result = executors.run_io(
+            score_resume_text, extracted["resume_text"], job_description,
+            extracted["extraction_method"] == "ocr", cache_key, trace
+        )
+        result["document_hash"] = document_hash
+        if filename:
+            result["filename"] = filename
+        with trace.measure("persist"):
+            set_stage_timings(result, trace)
+            save_result_to_json(result, resume_id)
+
+        return attach_stage_timings(finalize_result(result, job_description, resume_id, filename), trace)
+
+    except Exception as e:
+        import traceback
+        error_message = str(e)
+        tb = traceback.format_exc()
+        print(f"[ERROR] Exception in process_single_resume: {error_message}\n{tb}")
+
+        trace.outcome = "failed"
+        return attach_stage_timings(
+            build_processing_error_result(error_message, tb, job_description, resume_id, filename), trace
+        )
+
+
+def attach_stage_timings(result: dict, trace: ResumeTrace) -> dict:
+    """Record the resume's metrics and add its per-stage timings (seconds) to the result"""
+    if trace.outcome == "unknown":
+        trace.outcome = "success" if result.get("success", True) else "failed"
+    record_resume(trace)
+    set_stage_timings(result, trace)
+    return result
+
+
+def set_stage_timings(result: dict, trace: ResumeTrace):
+    """Add the per-stage timings (seconds) and, for OCR'd resumes, the DPI and confidence per page"""
+    result["stage_timings"] = trace.stage_timings()
+    if trace.ocr_pages:
+        result["ocr_pages"] = trace.ocr_pages
+
+
+def summarize_result(result: dict) -> dict:
+    """Keep only the fields needed to rank a result once its batch finishes"""
+    return {
+        key: result.get(key)
+        for key in ("resume_id", "filename", "fit_score", "fit_score_reason", "full_name")
+        if key in result
+    }
+
+
+def build_ranked_summary(results: list) -> list:
+    """Sort successful results by fit_score (highest first) and build the batch summary list"""
+    ranked_results = sorted(results, key=lambda x: x.get("fit_score", 0), reverse=True)
+    return [
+        {
+            "resume_id": r["resume_id"],
+            "filename": r.get("filename", "Unknown"),
+            "fit_score": r.get("fit_score", 0),
+            "fit_score_reason": r.get("fit_score_reason", "No reason provided"),
+            "candidate_name": r.get("full_name", "Unknown")
+        }
+        for r in ranked_results
+    ]
@@ -0,0 +1,316 @@
+"""
+Staged batch pipeline for RULE
+Runs extraction, LLM scoring and persistence as separate stages connected by bounded queues,
+so CPU-heavy extraction of one resume overlaps with the network-bound LLM call of another.
+Every stage queue is a weighted fair queue over priority classes and batches.
+"""
+
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from backend.modules.processing.config import processing_config
+from backend.modules.processing.models import Priority
+from backend.modules.processing.scheduling import FairQueue
+from backend.modules.metrics.timing import ResumeTrace
+from backend.modules.metrics.resume_metrics import record_resume
+from backend.pipelines.analyze_resume import (
+    get_document_hash,
+    load_resume_text,
+    lookup_cached_result,
+    score_resume_text,
+    save_result_to_json,
+    save_stored_text,
+    finalize_result,
+    build_analysis_failed_result,
+    build_processing_error_result,
+    attach_stage_timings,
+    set_stage_timings,
+)
+
+DEFAULT_PRIORITY_WEIGHTS = {
+    Priority.INTERACTIVE.value: 8,
+    Priority.BATCH.value: 3,
+    Priority.BACKGROUND.value: 1,
+}
+
+
+@dataclass
+class PipelineItem:
+    """One resume travelling through the pipeline"""
+    resume_id: str
+    filename: str
+    job_description: str
+    # The PDF is given either in memory or as a spooled file (neither when re-scoring by document_hash)
+    pdf_bytes: Optional[bytes] = None
+    pdf_path: Optional[str] = None
+    # Remove pdf_path once text has been extracted (spooled uploads)
+    delete_after_extract: bool = True
+    # Scheduling class, and the batch/request it belongs to for fairness between batches
+    priority: Priority = Priority.BATCH
+    flow: Optional[str] = None
+    # Called with (item, stage) when the item enters "extracting" or "scoring"
+    on_state: Optional[Callable[["PipelineItem", str], None]] = None
+    # Called once with the item when the pipeline is done with it, including when it was cancelled;
+    # unlike a callback on future it never runs while the item is still queued or being processed
+    on_done: Optional[Callable[["PipelineItem"], None]] = None
+    # Resolves to the final standardized result dict; never raises
+    future: Future = field(default_factory=Future)
+    # Items for the same PDF scored against other job descriptions; they reuse this item's
+    # extraction and go straight to the scoring stage
+    fan_out: List["PipelineItem"] = field(default_factory=list)
+    # Text and hash may be given up front to skip extraction (e.g. when re-scoring stored resumes)
+    resume_text: Optional[str] = None
+    document_hash: Optional[str] = None
+    cache_key: Optional[str] = None
+    extraction_method: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    # Stage timings and outcome, attached to the result as stage_timings
+    trace: ResumeTrace = field(default_factory=ResumeTrace)
+    enqueued_at: Optional[float] = None
+
+    @property
+    def pdf_source(self):
+        return self.pdf_bytes if self.pdf_bytes is not None else self.pdf_path
+
+    def release_pdf(self):
+        """Drop the PDF once it is no longer needed"""
+        self.pdf_bytes = None
+        if self.delete_after_extract and self.pdf_path and os.path.exists(self.pdf_path):
+            os.remove(self.pdf_path)
+
+
+class StagedPipeline:
+    """Extraction -> scoring -> persistence with per-stage concurrency limits"""
+
+    def __init__(self, extract_workers: int = 2, score_workers: int = 4,
+                 persist_workers: int = 1, queue_size: int = 8,
+                 priority_weights: Optional[Dict[str, float]] = None):
+        self.extract_workers = extract_workers
+        self.score_workers = score_workers
+        self.persist_workers = persist_workers
+        weights = priority_weights or DEFAULT_PRIORITY_WEIGHTS
+        # Intake is unbounded so submitting never blocks a request handler;
+        # the queues between stages are bounded so no stage races ahead of the next
+        self.extract_queue = FairQueue(weights)
+        self.score_queue = FairQueue(weights, maxsize_per_class=queue_size)
+        self.persist_queue = FairQueue(weights, maxsize_per_class=queue_size)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "StagedPipeline":
+        pipeline_config = config.get("pipeline", {})
+        return cls(
+            extract_workers=int(pipeline_config.get("extract_workers", 2)),
+            score_workers=int(pipeline_config.get("score_workers", 4)),
+            persist_workers=int(pipeline_config.get("persist_workers", 1)),
+            queue_size=int(pipeline_config.get("queue_size", 8)),
+            priority_weights=pipeline_config.get("priority_weights")
+        )
+
+    def start(self):
+        """Start the stage workers (idempotent)"""
+        with self._lock:
+            if self._threads:
+                return
+            stages = [
+                ("extract", self.extract_workers, self.extract_queue, self._extract),
+                ("score", self.score_workers, self.score_queue, self._score),
+                ("persist", self.persist_workers, self.persist_queue, self._persist),
+            ]
+            for name, workers, in_queue, handler in stages:
+                for i in range(max(1, workers)):
+                    thread = threading.Thread(
+                        target=self._run_stage, args=(in_queue, handler),
+                        name=f"pipeline-{name}-{i}", daemon=True
+                    )
+                    thread.start()
+                    self._threads.append(thread)
+
+    def submit(self, item: PipelineItem) -> Future:
+        """Queue a resume for processing and return a future for its result"""
+        self.start()
+        self._put(self.extract_queue, item)
+        return item.future
+
+    def submit_multi(self, items: List[PipelineItem]) -> List[Future]:
+        """
+        Queue one resume scored against several job descriptions.
+        The first item carries the PDF; it is extracted once and the text is shared by all items,
+        whose LLM calls then run concurrently on the scoring stage.
+        """
+        lead, *others = items
+        for other in others:
+            other.priority = lead.priority
+            other.flow = lead.flow or lead.resume_id
+        lead.fan_out = others
+        self.submit(lead)
+        return [item.future for item in items]
+
+    def queue_depths(self) -> Dict[str, int]:
+        return {
+            "extract": self.extract_queue.qsize(),
+            "score": self.score_queue.qsize(),
+            "persist": self.persist_queue.qsize(),
+        }
+
+    def queue_depths_by_priority(self) -> Dict[str, Dict[str, int]]:
+        return {
+            "extract": self.extract_queue.depths(),
+            "score": self.score_queue.depths(),
+            "persist": self.persist_queue.depths(),
+        }
+
+    def shutdown(self):
+        """Ask every stage worker to exit once its queue drains"""
+        with self._lock:
+            for queue_, workers in ((self.extract_queue, self.extract_workers),
+                                    (self.score_queue, self.score_workers),
+                                    (self.persist_queue, self.persist_workers)):
+                for _ in range(max(1, workers)):
+                    queue_.stop_one()
+            self._threads = []
+
+    def _put(self, queue_: FairQueue, item: PipelineItem):
+        item.enqueued_at = time.perf_counter()
+        queue_.put(item, Priority(item.priority).value, item.flow or item.resume_id)
+
+    def _run_stage(self, in_queue: FairQueue, handler: Callable[[PipelineItem], None]):
+        while True:
+            item = in_queue.get()
+            if item is None:
+                return
+            if item.enqueued_at is not None:
+                item.trace.add({"queue_wait": time.perf_counter() - item.enqueued_at})
+                item.enqueued_at = None
+            group = [item] + item.fan_out
+            if all(member.future.cancelled() for member in group):
+                # Caller went away (e.g. a closed stream); skip the remaining stages
+                for member in group:
+                    self._complete(member, None)
+                continue
+            try:
+                handler(item)
+            except Exception as e:
+                tb = traceback.format_exc()
+                print(f"[ERROR] Pipeline stage failed for {item.filename}: {e}\n{tb}")
+                for member in group:
+                    self._complete(member, build_processing_error_result(
+                        str(e), tb, member.job_description, member.resume_id, member.filename
+                    ))
+
+    def _notify(self, item: PipelineItem, stage: str):
+        if item.on_state:
+            try:
+                item.on_state(item, stage)
+            except Exception as e:
+                print(f"[WARNING] Pipeline state callback failed for {item.filename}: {e}")
+
+    def _complete(self, item: PipelineItem, result: Optional[Dict[str, Any]]):
+        item.release_pdf()
+        if result is None:
+            item.trace.outcome = "cancelled"
+            record_resume(item.trace)
+        else:
+            if not result.get("success", True):
+                item.trace.outcome = "failed"
+            attach_stage_timings(result, item.trace)
+        if not item.future.done():
+            item.future.set_result(result)
+        on_done, item.on_done = item.on_done, None
+        if on_done:
+            try:
+                on_done(item)
+            except Exception as e:
+                print(f"[WARNING] Pipeline completion callback failed for {item.filename}: {e}")
+
+    def _extract(self, item: PipelineItem):
+        if item.document_hash is None and item.resume_text is None:
+            with item.trace.measure("hash"):
+                item.document_hash = get_document_hash(item.pdf_source)
+
+        # The item and its fan-out share one PDF; each is checked against the result cache
+        # for its own job description, and only the misses need text
+        hits, pending = [], []
+        for member in [item] + item.fan_out:
+            member.document_hash = item.document_hash
+            cached = None
+            if member.document_hash is not None:
+                cached, member.cache_key = lookup_cached_result(
+                    member.document_hash, member.job_description, member.resume_id, member.filename,
+                    member.trace
+                )
+            if cached:
+                hits.append((member, cached))
+            else:
+                pending.append(member)
+        item.fan_out = []
+
+        if pending and item.resume_text is None:
+            if item.pdf_source is not None:
+                for member in pending:
+                    self._notify(member, "extracting")
+            try:
+                extracted = load_resume_text(item.pdf_source, item.document_hash, item.trace)
+            finally:
+                item.release_pdf()
+            if extracted is None:
+                # Re-scoring without the PDF, and neither the text cache nor the stored results have its text
+                for member in pending:
+                    self._complete(member, build_processing_error_result(
+                        "Stored text for this resume is no longer available; re-upload the PDF to re-score it",
+                        None, member.job_description, member.resume_id, member.filename
+                    ))
+                pending = []
+            else:
+                item.resume_text = extracted["resume_text"]
+                item.extraction_method = extracted["extraction_method"]
+
+        for member, cached in hits:
+            self._complete(member, cached)
+
+        for member in pending:
+            member.resume_text = item.resume_text
+            member.extraction_method = item.extraction_method
+            if member is not item:
+                # Fan-out members share the lead's extraction, so they report its timings too
+                member.trace.path = item.trace.path
+                member.trace.add({stage: seconds for stage, seconds in item.trace.timings.items()
+                                  if stage != "queue_wait"})
+            if not member.resume_text.strip():
+                print(f"❌ Extracted text is empty for {member.filename}!")
+                self._complete(member, build_analysis_failed_result(
+                    member.job_description, member.resume_id, member.filename
+                ))
+                continue
+            # Blocks while the scoring stage is saturated for this class, throttling extraction
+            self._put(self.score_queue, member)
+
+    def _score(self, item: PipelineItem):
+        self._notify(item, "scoring")
+        item.result = score_resume_text(
+            item.resume_text, item.job_description, item.extraction_method == "ocr", item.cache_key,
+            item.trace
+        )
+        self._put(self.persist_queue, item)
+
+    def _persist(self, item: PipelineItem):
+        # Recorded in outputs/ so the resume can later be re-scored without its PDF
+        if item.document_hash:
+            item.result["document_hash"] = item.document_hash
+        item.result["filename"] = item.filename
+        with item.trace.measure("persist"):
+            set_stage_timings(item.result, item.trace)
+            save_result_to_json(item.result, item.resume_id)
+            if item.document_hash:
+                save_stored_text(item.document_hash, item.resume_text, item.extraction_method)
+        self._complete(item, finalize_result(item.result, item.job_description, item.resume_id, item.filename))
+
+
+# Global pipeline instance; stage workers start on first submit
+staged_pipeline = StagedPipeline.from_config(processing_config)
@@ -0,0 +1,78 @@
+import pytest
+
+from backend.modules.processing.admission import AdmissionController, AdmissionRejected
+
+
+def test_release_is_idempotent():
+    controller = AdmissionController(max_in_flight_resumes=2, max_upload_bytes=1000)
+    first, second = controller.admit([100, 200])
+
+    controller.release(first)
+    controller.release(first)
+
+    stats = controller.stats()
+    assert stats["in_flight_resumes"] == 1
+    assert stats["upload_bytes"] == 200
+    # Releasing twice must not free room for a third resume
+    controller.admit([100])
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.admit([100])
+    assert rejected.value.status_code == 429
+
+    controller.release(second)
+    assert controller.stats()["in_flight_resumes"] == 1
+
+
+def test_classes_are_counted_separately():
+    controller = AdmissionController(max_in_flight_resumes=1, max_queued_resumes=3, max_upload_bytes=0)
+    controller.admit([1])
+    background = controller.admit([1, 1, 1], background=True)
+
+    with pytest.raises(AdmissionRejected):
+        controller.admit([1], background=True)
+    controller.release(background[0])
+    controller.admit([1], background=True)
+    assert controller.stats()["queued_resumes"] == 3
+
+
+def test_oversized_request_waits_for_an_idle_limit():
+    controller = AdmissionController(max_in_flight_resumes=2, max_upload_bytes=1000)
+    slot, = controller.admit([1])
+
+    for sizes in ([1, 1, 1], [2000]):
+        with pytest.raises(AdmissionRejected) as rejected:
+            controller.admit(sizes)
+        assert rejected.value.status_code == 429
+
+    controller.release(slot)
+    controller.admit([1, 1, 1])
+    assert controller.stats()["in_flight_resumes"] == 3
+    with pytest.raises(AdmissionRejected):
+        controller.admit([1])
+
+
+def test_per_request_limit_is_413():
+    controller = AdmissionController(max_in_flight_resumes=0, max_resumes_per_request=2)
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.admit([1, 1, 1])
+    assert rejected.value.status_code == 413
+    assert rejected.value.retry_after is None
+
+
+def test_forced_admission_skips_limits():
+    controller = AdmissionController(max_in_flight_resumes=2, max_upload_bytes=1000, max_resumes_per_request=1)
+
+    slots = controller.admit([600, 600, 600], force=True)
+
+    assert controller.stats()["in_flight_resumes"] == 3
+    assert not any(slot.timed for slot in slots)
+
+
+def test_retry_after_defaults_without_latency_samples():
+    controller = AdmissionController(max_in_flight_resumes=1, default_retry_after_seconds=7)
+    controller.admit([1])
+
+    with pytest.raises(AdmissionRejected) as rejected:
+        controller.admit([1])
+    assert rejected.value.retry_after == 7
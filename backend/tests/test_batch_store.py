@@ -0,0 +1,79 @@
+import json
+import os
+
+from backend.modules.processing.batch_store import BatchStore
+from backend.modules.processing.models import BatchFile, BatchJob, FileStatus
+from backend.modules.processing.uploads import UploadedPdf
+
+
+def make_job(file_ids):
+    return BatchJob(
+        batch_id="batch-1",
+        job_description="Python developer",
+        files=[BatchFile(file_id=file_id, filename=f"{file_id}.pdf") for file_id in file_ids]
+    )
+
+
+def stored_store(tmp_path, file_ids):
+    store = BatchStore(str(tmp_path))
+    job = make_job(file_ids)
+    store.create(job, [UploadedPdf(filename=f"{file_id}.pdf", size=8, data=b"%PDF-1.4") for file_id in file_ids])
+    return store, job
+
+
+def test_replay_restores_file_states(tmp_path):
+    store, job = stored_store(tmp_path, ["a", "b", "c"])
+    store.record(job.batch_id, "a", FileStatus.EXTRACTING)
+    store.record(job.batch_id, "a", FileStatus.DONE, fit_score=81.5, summary={"resume_id": "r-a"})
+    store.record(job.batch_id, "b", FileStatus.SCORING)
+    store.record(job.batch_id, "c", FileStatus.FAILED, error="Unreadable PDF")
+
+    [(loaded, summaries)] = store.load_all()
+    files = {f.file_id: f for f in loaded.files}
+
+    assert files["a"].status == FileStatus.DONE
+    assert files["a"].fit_score == 81.5
+    assert files["a"].started_at is not None
+    assert files["b"].status == FileStatus.SCORING
+    assert files["c"].status == FileStatus.FAILED
+    assert files["c"].error == "Unreadable PDF"
+    assert summaries == [{"resume_id": "r-a"}]
+
+
+def test_replay_skips_a_truncated_last_line(tmp_path):
+    store, job = stored_store(tmp_path, ["a", "b"])
+    store.record(job.batch_id, "a", FileStatus.DONE, fit_score=70.0, summary={"resume_id": "r-a"})
+    store.record(job.batch_id, "b", FileStatus.EXTRACTING)
+    # Crash in the middle of appending the next event
+    torn = json.dumps({"file_id": "b", "status": FileStatus.DONE.value, "at": "2024-01-01T00:00:00"})
+    with open(os.path.join(str(tmp_path), job.batch_id, "journal.jsonl"), "a", encoding="utf-8") as f:
+        f.write(torn[:len(torn) // 2])
+
+    [(loaded, summaries)] = store.load_all()
+    files = {f.file_id: f for f in loaded.files}
+
+    assert files["a"].status == FileStatus.DONE
+    assert files["b"].status == FileStatus.EXTRACTING
+    assert summaries == [{"resume_id": "r-a"}]
+
+    # Events recorded after the restart do not join the torn line
+    store.record(job.batch_id, "b", FileStatus.FAILED, error="Timed out")
+    [(reloaded, _)] = store.load_all()
+    files = {f.file_id: f for f in reloaded.files}
+    assert files["b"].status == FileStatus.FAILED
+    assert files["b"].error == "Timed out"
+
+
+def test_batch_without_manifest_is_ignored(tmp_path):
+    os.makedirs(os.path.join(str(tmp_path), "partial", "files"))
+    assert BatchStore(str(tmp_path)).load_all() == []
+
+
+def test_complete_drops_journal_and_files(tmp_path):
+    store, job = stored_store(tmp_path, ["a"])
+    store.record(job.batch_id, "a", FileStatus.DONE, fit_score=50.0)
+    batch_dir = os.path.join(str(tmp_path), job.batch_id)
+
+    store.complete(job)
+
+    assert sorted(os.listdir(batch_dir)) == ["manifest.json"]
@@ -0,0 +1,75 @@
+from contextlib import contextmanager
+
+from backend.modules.text_extract.native_backends import NativeTextBackend, text_quality
+from backend.modules.text_extract.pdf_analyzer import analyze_pdf
+
+CLEAN_TEXT = "Jane Doe\nSenior Python developer with 8 years of experience building APIs and data pipelines."
+
+
+class FakeBackend(NativeTextBackend):
+    """Serves fixed page texts and counts how often the PDF was opened"""
+
+    def __init__(self, name, pages):
+        self.name = name
+        self.pages = pages
+        self.opened = 0
+
+    @contextmanager
+    def open(self, pdf_source):
+        self.opened += 1
+        yield [lambda text=text: text for text in self.pages]
+
+
+def test_clean_text_scores_close_to_one():
+    assert text_quality(CLEAN_TEXT) > 0.9
+    assert text_quality("") == 1.0
+
+
+def test_garbled_text_scores_below_the_default_threshold():
+    undecodable = "(cid:12)(cid:34)(cid:56) " * 20
+    run_together = "SeniorPythondeveloperwith8yearsofexperiencebuildingAPIsanddatapipelines " * 3
+    letter_spaced = "S e n i o r P y t h o n d e v e l o p e r"
+    for text in (undecodable, run_together, letter_spaced):
+        assert text_quality(text) < 0.5
+
+
+def test_low_quality_text_is_extracted_again_with_the_fallback():
+    garbled = "S e n i o r P y t h o n d e v e l o p e r w i t h e x p e r i e n c e"
+    backend, fallback = FakeBackend("fast", [garbled]), FakeBackend("safe", [CLEAN_TEXT])
+
+    analysis = analyze_pdf(b"", backend=backend, fallback_backend=fallback, min_quality=0.5)
+
+    assert analysis.extractor == "safe"
+    assert analysis.text == CLEAN_TEXT
+    assert analysis.quality > 0.9
+    assert fallback.opened == 1
+
+
+def test_good_text_keeps_the_first_backend():
+    backend, fallback = FakeBackend("fast", [CLEAN_TEXT]), FakeBackend("safe", [CLEAN_TEXT])
+
+    analysis = analyze_pdf(b"", backend=backend, fallback_backend=fallback, min_quality=0.5)
+
+    assert analysis.extractor == "fast"
+    assert fallback.opened == 0
+
+
+def test_short_text_layer_means_ocr():
+    backend = FakeBackend("fast", ["1", "  Page 2  "])
+
+    analysis = analyze_pdf(b"", backend=backend, fallback_backend=FakeBackend("safe", [CLEAN_TEXT]),
+                           min_quality=0.5)
+
+    assert not analysis.text_based
+    assert analysis.quality is None
+    assert analysis.pages_without_text_layer() == [1, 2]
+
+
+def test_pages_below_the_page_threshold_are_flagged_for_ocr():
+    backend = FakeBackend("fast", [CLEAN_TEXT, "2", CLEAN_TEXT])
+
+    analysis = analyze_pdf(b"", backend=backend, min_page_text_length=20)
+
+    assert analysis.text_based
+    assert analysis.page_text_layers == [True, False, True]
+    assert analysis.merged_text({2: "Scanned certificate"}).split("\n")[2] == "Scanned certificate"
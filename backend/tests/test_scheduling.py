@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+
+from backend.modules.processing.scheduling import FairQueue
+
+
+def drain(queue):
+    items = []
+    while queue.qsize():
+        items.append(queue.get())
+    return items
+
+
+def test_classes_share_dequeues_by_weight():
+    queue = FairQueue({"interactive": 3, "batch": 1})
+    for i in range(8):
+        queue.put(f"b{i}", "batch", "job")
+        queue.put(f"i{i}", "interactive", "upload")
+
+    order = drain(queue)
+
+    # Three interactive items per batch item while both classes have work
+    assert order[:8] == ["i0", "b0", "i1", "i2", "i3", "b1", "i4", "i5"]
+    assert [item for item in order if item.startswith("b")] == [f"b{i}" for i in range(8)]
+
+
+def test_flows_within_a_class_are_round_robin():
+    queue = FairQueue({"batch": 1})
+    for i in range(3):
+        queue.put(f"a{i}", "batch", "a")
+    queue.put("b0", "batch", "b")
+
+    assert drain(queue) == ["a0", "b0", "a1", "a2"]
+
+
+def test_idle_class_does_not_bank_turns():
+    queue = FairQueue({"interactive": 1, "batch": 1})
+    for i in range(4):
+        queue.put(f"b{i}", "batch", "job")
+    assert [queue.get(), queue.get()] == ["b0", "b1"]
+
+    # Returning from idle, interactive starts at the current virtual time: batch is served again
+    # after one more interactive item instead of waiting until interactive caught up on its missed turns
+    for i in range(3):
+        queue.put(f"i{i}", "interactive", "upload")
+    assert drain(queue) == ["i0", "i1", "b2", "i2", "b3"]
+
+
+def test_full_class_blocks_only_its_own_puts():
+    queue = FairQueue({"interactive": 1, "batch": 1}, maxsize_per_class=1)
+    queue.put("b0", "batch", "job")
+
+    blocked_put = threading.Thread(target=queue.put, args=("b1", "batch", "job"), daemon=True)
+    blocked_put.start()
+    blocked_put.join(0.2)
+    assert blocked_put.is_alive()
+
+    # Another class still has room
+    queue.put("i0", "interactive", "upload")
+    assert queue.depths() == {"interactive": 1, "batch": 1}
+
+    assert queue.get() == "i0"
+    assert blocked_put.is_alive()
+    assert queue.get() == "b0"
+    blocked_put.join(2)
+    assert not blocked_put.is_alive()
+    assert queue.get() == "b1"
+
+
+def test_stop_one_after_drain():
+    queue = FairQueue({"batch": 1})
+    queue.put("b0", "batch", "job")
+    queue.stop_one()
+
+    assert queue.get() == "b0"
+    assert queue.get() is None
+
+
+def test_rejects_bad_weights_and_unknown_classes():
+    with pytest.raises(ValueError):
+        FairQueue({"batch": 0})
+    with pytest.raises(ValueError):
+        FairQueue({"batch": 1}).put("x", "interactive", "upload")